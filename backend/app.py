@@ -1,43 +1,61 @@
 # 🚀 완전한 OpenTelemetry 자동 계측 초기화
 import os
+import time
+
+# 기동 시간 측정용 - app 모듈 import 시작 시각 (IMPORT_SECONDS, /readyz)
+IMPORT_STARTED = time.perf_counter()
+IMPORT_SECONDS = None
+
+def init_tracer_provider():
+    """TracerProvider/OTLP Exporter 초기화 (프로세스마다 1회 - gunicorn은 워커 fork 이후 호출)"""
+    from opentelemetry import trace
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    
+    # opentelemetry-instrument가 이미 Provider를 설정했다면 그대로 사용 (BatchSpanProcessor는 fork 후 자체 재초기화)
+    if isinstance(trace.get_tracer_provider(), TracerProvider):
+        print(f"📡 기존 TracerProvider 사용: {trace.get_tracer_provider()}")
+        return
+    
+    # Resource 설정
+    resource = Resource.create({
+        "service.name": os.getenv('OTEL_SERVICE_NAME', 'hyunwoo'),
+        "service.version": "1.0.0",
+        "deployment.environment": "development"
+    })
+    
+    # TracerProvider 설정
+    provider = TracerProvider(resource=resource)
+    trace.set_tracer_provider(provider)
+    
+    # OTLP Exporter 설정
+    otlp_endpoint = os.getenv('OTEL_EXPORTER_OTLP_ENDPOINT', 'http://localhost:4318')
+    exporter = OTLPSpanExporter(endpoint=otlp_endpoint + '/v1/traces')
+    processor = BatchSpanProcessor(exporter)
+    provider.add_span_processor(processor)
+    
+    print(f"📡 서비스명: {os.getenv('OTEL_SERVICE_NAME', 'hyunwoo')} (pid {os.getpid()})")
+    print(f"📡 전송 엔드포인트: {otlp_endpoint}/v1/traces")
+    print(f"📡 TracerProvider: {trace.get_tracer_provider()}")
 
 def init_opentelemetry():
     """완전한 OpenTelemetry 자동 계측 초기화"""
     try:
         # 필요한 모듈들 import
-        from opentelemetry import trace
-        from opentelemetry.sdk.trace import TracerProvider
-        from opentelemetry.sdk.resources import Resource
-        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
-        from opentelemetry.sdk.trace.export import BatchSpanProcessor
         from opentelemetry.instrumentation.flask import FlaskInstrumentor
         from opentelemetry.instrumentation.requests import RequestsInstrumentor
         
-        # Resource 설정
-        resource = Resource.create({
-            "service.name": os.getenv('OTEL_SERVICE_NAME', 'hyunwoo'),
-            "service.version": "1.0.0",
-            "deployment.environment": "development"
-        })
-        
-        # TracerProvider 설정
-        provider = TracerProvider(resource=resource)
-        trace.set_tracer_provider(provider)
-        
-        # OTLP Exporter 설정
-        otlp_endpoint = os.getenv('OTEL_EXPORTER_OTLP_ENDPOINT', 'http://localhost:4318')
-        exporter = OTLPSpanExporter(endpoint=otlp_endpoint + '/v1/traces')
-        processor = BatchSpanProcessor(exporter)
-        provider.add_span_processor(processor)
-        
-        # 자동 계측 활성화
+        # 자동 계측 활성화 (Flask 앱 생성 전에 실행되어야 함)
         FlaskInstrumentor().instrument()
         RequestsInstrumentor().instrument()
         
+        # gunicorn(OTEL_PROVIDER_INIT=post_fork)은 exporter를 워커끼리 공유하지 않도록 post_fork에서 초기화
+        if os.getenv('OTEL_PROVIDER_INIT', 'import') == 'import':
+            init_tracer_provider()
+        
         print(f"✅ OpenTelemetry 완전 초기화 완료!")
-        print(f"📡 서비스명: {os.getenv('OTEL_SERVICE_NAME', 'hyunwoo')}")
-        print(f"📡 전송 엔드포인트: {otlp_endpoint}/v1/traces")
-        print(f"📡 TracerProvider: {trace.get_tracer_provider()}")
         return True
         
     except ImportError as e:
@@ -50,134 +68,292 @@ def init_opentelemetry():
 # 자동 계측 초기화 실행
 otel_enabled = init_opentelemetry()
 
-from flask import Flask, request, jsonify, session
+from flask import Flask, Response, request, jsonify, session, g, has_app_context, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
-import redis
-import mysql.connector
+from werkzeug.middleware.proxy_fix import ProxyFix
+from flask.sessions import SessionInterface, SecureCookieSession
+from itsdangerous import Signer, BadSignature
 import json
 from datetime import datetime
-import pytz
-from kafka import KafkaProducer, KafkaConsumer
-from functools import wraps
-from werkzeug.security import generate_password_hash, check_password_hash
-from threading import Thread
+from passwords import HasherBusyError
+from breaker import CircuitOpenError
+from concurrent.futures import TimeoutError as FutureTimeoutError
+import queue
+import math
+import uuid
+
+# 설정/풀/큐/세션 저장소/속도 제한/캐시/write-behind/SQL 헬퍼는 app_async.py와 공유 (core.py - Flask 앱을 만들지 않음)
+from core import (
+    TRUSTED_PROXY_HOPS, app_metrics, observe_dependency, REQUEST_METRICS_EXEMPT,
+    breakers, fallback_cache, db_pool, get_redis_connection,
+    app_log, log_event, kafka_log_queue, kafka_log_view, event_hub, EVENTS_HEARTBEAT, EVENTS_MAX_DURATION,
+    async_log_api_stats, RedisSessionMixin, session_store, session_required, rate_limit_subject,
+    rate_limiter, concurrency_limiter, RATE_LIMIT_EXEMPT, rate_limited, concurrency_limited, hasher_unavailable,
+    get_limit_arg, get_page_args, STREAM_FETCH_SIZE, STREAM_FORMATS, get_stream_args,
+    message_page_query, split_keyset_page, fetch_message_page, user_page_query, USER_STATS_SQL,
+    get_user_message_count, admin_user_info, message_cache, UPSERT_USER_STATS_SQL, migrate_schema, rebuild_user_stats,
+    message_writer, merge_pending_messages, SEARCH_MAX_OFFSET, search_query, search_message_page, run_search,
+    BULK_INSERT_CHUNK_SIZE, BULK_MAX_ITEMS, parse_bulk_messages, warmup, password_hasher, parse_log_time
+)
 
 app = Flask(__name__)
-CORS(app, supports_credentials=True)  # 세션을 위한 credentials 지원
+CORS(app, supports_credentials=True, expose_headers=['X-Next-Cursor', 'X-Next-Offset', 'Retry-After'])  # 세션을 위한 credentials 지원
 app.secret_key = os.getenv('FLASK_SECRET_KEY', 'your-secret-key-here')  # 세션을 위한 시크릿 키
+# 브라우저 요청은 ingress → frontend nginx(/api/)를 거쳐 들어오므로 remote_addr는 항상 nginx 파드 IP
+# X-Forwarded-For에서 프록시 TRUSTED_PROXY_HOPS개가 붙인 값만 믿고 그 앞의 클라이언트 IP를 remote_addr로 사용 (0이면 사용 안 함)
+if TRUSTED_PROXY_HOPS > 0:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=TRUSTED_PROXY_HOPS)
+
+# 요청 지연 시간 메트릭 (GET /metrics - Prometheus 형식, 메트릭 정의는 core.app_metrics)
+@app.before_request
+def start_request_metrics():
+    if request.path in REQUEST_METRICS_EXEMPT:
+        return
+    app_metrics.ensure_writer()
+    g._metrics_endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+    g._metrics_start = time.perf_counter()
+    app_metrics.add('backend_http_requests_in_flight', (('endpoint', g._metrics_endpoint),), 1)
+
+@app.after_request
+def record_request_metrics(response):
+    endpoint = g.get('_metrics_endpoint')
+    if endpoint is not None:
+        app_metrics.observe('backend_http_request_duration_seconds',
+                            (('endpoint', endpoint), ('method', request.method)),
+                            time.perf_counter() - g._metrics_start)
+        app_metrics.inc('backend_http_requests_total',
+                        (('endpoint', endpoint), ('method', request.method), ('status', str(response.status_code))))
+    return response
+
+@app.teardown_request
+def finish_request_metrics(exc):
+    endpoint = g.pop('_metrics_endpoint', None)
+    if endpoint is not None:
+        app_metrics.add('backend_http_requests_in_flight', (('endpoint', endpoint),), -1)
+
+# 응답 JSON 직렬화 시간 측정
+class TimedJSONProvider(DefaultJSONProvider):
+    def dumps(self, obj, **kwargs):
+        start = time.perf_counter()
+        try:
+            return super().dumps(obj, **kwargs)
+        finally:
+            observe_dependency('json', 'dumps', start)
+
+app.json = TimedJSONProvider(app)
 
-# # 스레드 풀 생성
-# thread_pool = ThreadPoolExecutor(max_workers=5)
+# 서킷 브레이커 (core.breakers) - 요청은 타임아웃을 기다리지 않고 503 + Retry-After 또는 캐시된 결과로 응답
+def note_circuit_open(error):
+    # 요청 처리 중 열린 브레이커를 만나면 기록해 두고 500 응답을 503으로 바꿈 (mark_dependency_unavailable)
+    if has_app_context():
+        g._circuit_open = max(g.get('_circuit_open', 0.0), error.retry_after)
 
-# MariaDB 연결 함수
+for breaker in breakers.values():
+    breaker.on_reject = note_circuit_open
+
+@app.errorhandler(CircuitOpenError)
+def dependency_unavailable(error):
+    response = jsonify({"status": "error", "message": str(error)})
+    response.headers['Retry-After'] = str(max(1, math.ceil(error.retry_after)))
+    return response, 503
+
+@app.after_request
+def mark_dependency_unavailable(response):
+    # 라우트가 예외를 잡아 500으로 응답해도 원인이 열린 브레이커면 503 + Retry-After
+    retry_after = g.get('_circuit_open')
+    if retry_after is not None and response.status_code == 500:
+        response.status_code = 503
+        response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+    return response
+
+# 장애 중 마지막 정상 결과(core.fallback_cache)로 응답
+def stale_response(value, age):
+    response = jsonify(value)
+    response.headers['Age'] = str(int(age))
+    response.headers['Warning'] = '110 - "Response is Stale"'
+    return response
+
+# MariaDB 연결 함수 (풀에서 커넥션 대여)
 def get_db_connection():
-    return mysql.connector.connect(
-        host=os.getenv('MYSQL_HOST', 'my-mariadb'),
-        user=os.getenv('MYSQL_USER', 'testuser'),
-        password=os.getenv('MYSQL_PASSWORD'),
-        database="testdb",
-        connect_timeout=30
-    )
-
-# Redis 연결 함수
-def get_redis_connection():
-    return redis.Redis(
-        host=os.getenv('REDIS_HOST', 'my-redis-master'),
-        port=6379,
-        password=os.getenv('REDIS_PASSWORD'),
-        decode_responses=True,
-        db=0
-    )
-
-# Kafka Producer 설정 (SASL_PLAINTEXT 인증)
-def get_kafka_producer():
-    return KafkaProducer(
-        bootstrap_servers=os.getenv('KAFKA_SERVERS', 'team-kafka.default.svc.cluster.local:9092'),
-        value_serializer=lambda v: json.dumps(v).encode('utf-8'),
-        security_protocol='SASL_PLAINTEXT',
-        sasl_mechanism='PLAIN',
-        sasl_plain_username=os.getenv('KAFKA_USERNAME', 'user1'),
-        sasl_plain_password=os.getenv('KAFKA_PASSWORD', 'password')
-    )
-
-# 한국 시간대 가져오기
-korea_tz = pytz.timezone('Asia/Seoul')
-
-# 로깅 함수
-def log_to_redis(action, details):
-    try:
-        redis_client = get_redis_connection()
-        log_entry = {
-            'timestamp': datetime.now(korea_tz).isoformat(),
-            'action': action,
-            'details': details
-        }
-        redis_client.lpush('api_logs', json.dumps(log_entry))
-        redis_client.ltrim('api_logs', 0, 99)  # 최근 100개 로그만 유지
-        redis_client.close()
-    except Exception as e:
-        print(f"Redis logging error: {str(e)}")
+    conn = db_pool.acquire()
+    # 예외 등으로 반납되지 않은 커넥션은 요청 종료 시 자동 반납
+    if has_app_context():
+        g.setdefault('_db_connections', []).append(conn)
+    return conn
+
+@app.teardown_appcontext
+def release_db_connections(exc):
+    for conn in g.pop('_db_connections', []):
+        conn.close()
+
+# Redis 세션 (저장소는 core.session_store)
+class RedisSession(RedisSessionMixin, SecureCookieSession):
+    pass
+
+# 쿠키에는 서명된 세션 ID만 저장하고 데이터는 Redis에 보관
+class RedisSessionInterface(SessionInterface):
+    def __init__(self, store):
+        self.store = store
 
-# API 통계 로깅을 비동기로 처리하는 함수 (Redis 백업 포함)
-def async_log_api_stats(endpoint, method, status, user_id):
-    def _log():
+    def _signer(self, app):
+        return Signer(app.secret_key, salt='redis-session')
+
+    def open_session(self, app, request):
+        token = request.cookies.get(self.get_cookie_name(app))
+        if not token:
+            return RedisSession()
+        try:
+            sid = self._signer(app).unsign(token).decode('ascii')
+        except BadSignature:
+            return RedisSession()
         try:
-            # Kafka 로깅 시도
-            producer = get_kafka_producer()
-            log_data = {
-                'developer_tag': os.getenv('DEVELOPER_TAG', 'hyunwoo'),  # 개발자 구분 태그
-                'timestamp': datetime.now(korea_tz).isoformat(),
-                'endpoint': endpoint,
-                'method': method,
-                'status': status,
-                'user_id': user_id,
-                'message': f"{user_id}가 {method} {endpoint} 호출 ({status})"
-            }
-            topic_name = f"api-logs-{os.getenv('DEVELOPER_TAG', 'hyunwoo')}"
-            producer.send(topic_name, log_data)
-            producer.flush()
+            data = self.store.load(sid)
         except Exception as e:
-            print(f"Kafka logging error: {str(e)}")
-            # Kafka 실패 시 Redis에 백업 저장
-            try:
-                redis_client = get_redis_connection()
-                backup_log = {
-                    'timestamp': datetime.now(korea_tz).isoformat(),
-                    'action': 'api_stats',
-                    'details': f"{user_id}가 {method} {endpoint} 호출 ({status})"
-                }
-                redis_client.lpush('api_logs', json.dumps(backup_log))
-                redis_client.ltrim('api_logs', 0, 99)  # 최근 100개 로그만 유지
-                redis_client.close()
-                print("API 통계를 Redis에 백업 저장했습니다.")
-            except Exception as redis_error:
-                print(f"Redis backup logging error: {str(redis_error)}")
-    
-    # 새로운 스레드에서 로깅 실행
-    Thread(target=_log).start()
-    
-    #  # 스레드 풀을 사용하여 작업 실행
-    # thread_pool.submit(_log)
-
-# 로그인 데코레이터
-def login_required(f):
-    @wraps(f)
-    def decorated_function(*args, **kwargs):
-        if 'user_id' not in session:
-            return jsonify({"status": "error", "message": "로그인이 필요합니다"}), 401
-        return f(*args, **kwargs)
-    return decorated_function
-
-# 관리자 권한 데코레이터
-def admin_required(f):
-    @wraps(f)
-    def decorated_function(*args, **kwargs):
-        if 'user_id' not in session:
-            return jsonify({"status": "error", "message": "로그인이 필요합니다"}), 401
-        if session['user_id'] != 'admin':
-            return jsonify({"status": "error", "message": "관리자 권한이 필요합니다"}), 403
-        return f(*args, **kwargs)
-    return decorated_function
+            print(f"Redis session load error: {str(e)}")
+            self.store.count('errors')
+            session_obj = RedisSession()
+            session_obj.store_error = True
+            return session_obj
+        if data is None:
+            return RedisSession()
+        return RedisSession(data, sid=sid)
+
+    def save_session(self, app, session_obj, response):
+        cookie_name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+        try:
+            # 로그아웃 등으로 비워진 세션은 Redis에서도 삭제
+            if not session_obj:
+                if session_obj.sid is not None and session_obj.modified:
+                    self.store.delete(session_obj.sid, session_obj.owner)
+                    response.delete_cookie(cookie_name, domain=domain, path=path)
+                return
+            if session_obj.modified or session_obj.sid is None:
+                if session_obj.sid is not None and session_obj.rotate:
+                    self.store.delete(session_obj.sid, session_obj.owner)
+                    session_obj.sid = None
+                if session_obj.sid is None:
+                    session_obj.sid = uuid.uuid4().hex
+                self.store.save(session_obj.sid, dict(session_obj))
+                token = self._signer(app).sign(session_obj.sid.encode('ascii')).decode('ascii')
+                response.set_cookie(
+                    cookie_name, token,
+                    max_age=self.store.ttl,
+                    domain=domain,
+                    path=path,
+                    httponly=self.get_cookie_httponly(app),
+                    secure=self.get_cookie_secure(app),
+                    samesite=self.get_cookie_samesite(app)
+                )
+            else:
+                self.store.touch(session_obj.sid, dict(session_obj))
+        except Exception as e:
+            print(f"Redis session save error: {str(e)}")
+            self.store.count('errors')
+
+app.session_interface = RedisSessionInterface(session_store)
+
+# 로그인/관리자 권한 데코레이터 (응답 형식은 core.session_required - app_async.py와 공유)
+login_required = session_required(session)
+admin_required = session_required(session, admin=True)
+
+@app.before_request
+def enforce_request_limits():
+    if request.url_rule is None or request.method == 'OPTIONS' or request.path in RATE_LIMIT_EXEMPT:
+        return
+    endpoint = request.url_rule.rule
+    allowed, retry_after = rate_limiter.acquire(endpoint, rate_limit_subject(session, request.remote_addr))
+    if not allowed:
+        return rate_limited(retry_after)
+    if not concurrency_limiter.try_acquire(endpoint):
+        return concurrency_limited()
+    g._concurrency_endpoint = endpoint
+
+# 스트리밍 응답은 전송이 끝난 뒤 슬롯 반납
+@app.teardown_request
+def release_concurrency_slot(exc):
+    endpoint = g.pop('_concurrency_endpoint', None)
+    if endpoint is not None and endpoint in concurrency_limiter.limits:
+        concurrency_limiter.release(endpoint)
+
+
+def stream_query(sql, params, fmt, head=None):
+    """unbuffered 커서에서 STREAM_FETCH_SIZE행씩 읽어 JSON 배열 또는 NDJSON 조각으로 전송.
+    결과 전체를 메모리에 올리지 않으므로 워커 메모리는 결과 크기와 무관하게 일정.
+    head(cursor)가 주어지면 같은 커넥션에서 먼저 실행해 반환한 행들을 앞에 붙임."""
+    db = get_db_connection()
+    try:
+        cursor = db.cursor(dictionary=True, buffered=False)
+        first_rows = head(cursor) if head else []
+        cursor.execute(sql, params)
+    except Exception:
+        db.close(discard=True)
+        raise
+    def encode(row):
+        return json.dumps(row, default=app.json.default, separators=(',', ':'))
+
+    def generate():
+        done = False
+        try:
+            if fmt == 'json':
+                yield '['
+            rows, separator = first_rows or cursor.fetchmany(STREAM_FETCH_SIZE), ''
+            while rows:
+                if fmt == 'json':
+                    yield separator + ','.join(encode(row) for row in rows)
+                    separator = ','
+                else:
+                    yield ''.join(encode(row) + '\n' for row in rows)
+                rows = cursor.fetchmany(STREAM_FETCH_SIZE)
+            if fmt == 'json':
+                yield ']'
+            done = True
+        finally:
+            # 클라이언트가 중간에 끊으면 읽지 않은 결과가 남으므로 커넥션을 풀에 돌려주지 않고 닫음
+            if done:
+                cursor.close()
+            db.close(discard=not done)
+
+    return Response(stream_with_context(generate()), mimetype=STREAM_FORMATS[fmt])
+
+
+# 메시지 페이지 조회 (캐시 우선, 없으면 DB 조회 후 캐시 저장)
+def get_message_page(user_id, limit, after):
+    page_key = f"{limit}:{request.args.get('cursor', '')}"
+    version, page = message_cache.get(user_id, page_key)
+    if page is not None:
+        return page['messages'], page['next_cursor']
+    db = get_db_connection()
+    cursor = db.cursor(dictionary=True)
+    messages, next_cursor = fetch_message_page(cursor, user_id, limit, after)
+    cursor.close()
+    db.close()
+    message_cache.set(user_id, version, page_key, {'messages': messages, 'next_cursor': next_cursor})
+    return messages, next_cursor
+
+
+# 사용법: flask --app app migrate-db
+@app.cli.command('migrate-db')
+def migrate_schema_command():
+    """기존 DB에 현재 코드가 쓰는 테이블/컬럼/인덱스를 추가합니다."""
+    applied = migrate_schema()
+    print(f"✅ 스키마 마이그레이션 완료: {', '.join(applied)}")
+
+
+# 사용법: flask --app app rebuild-user-stats
+@app.cli.command('rebuild-user-stats')
+def rebuild_user_stats_command():
+    """messages 테이블에서 user_stats를 다시 계산합니다."""
+    rebuilt = rebuild_user_stats()
+    print(f"✅ user_stats 재계산 완료: {rebuilt}명")
+
+
+@app.before_request
+def start_message_writer():
+    message_writer.ensure_worker()
+
 
 # MariaDB 엔드포인트
 @app.route('/db/message', methods=['POST'])
@@ -185,23 +361,98 @@ def admin_required(f):
 def save_to_db():
     try:
         user_id = session['user_id']
-        db = get_db_connection()
         data = request.json
+        
+        # write-behind 모드: Redis 스트림에 넣고 바로 응답 (DB 저장은 백그라운드 writer가 그룹 커밋)
+        if message_writer.enabled:
+            pending_id = message_writer.enqueue(user_id, data['message'], request.headers.get('Idempotency-Key'))
+            log_event('db_insert_pending', f"Message queued: {data['message'][:30]}...")
+            async_log_api_stats('/db/message', 'POST', 'success', user_id)
+            return jsonify({"status": "pending", "pending_id": pending_id}), 202
+        
+        db = get_db_connection()
         cursor = db.cursor()
         sql = "INSERT INTO messages (user_id, message, created_at) VALUES (%s, %s, %s)"
-        cursor.execute(sql, (user_id, data['message'], datetime.now()))
+        created_at = datetime.now()
+        cursor.execute(sql, (user_id, data['message'], created_at))
+        message_id = cursor.lastrowid
+        # 사용자 통계(user_stats)를 같은 트랜잭션에서 증분 갱신
+        cursor.execute(UPSERT_USER_STATS_SQL, (user_id, 1, created_at))
         db.commit()
         cursor.close()
         db.close()
+        message_cache.invalidate(user_id)
+        event_hub.publish('message', {'id': message_id, 'user_id': user_id, 'message': data['message'],
+                                      'created_at': created_at}, user_id=user_id)
         
         # 로깅
-        log_to_redis('db_insert', f"Message saved: {data['message'][:30]}...")
+        log_event('db_insert', f"Message saved: {data['message'][:30]}...")
         
         async_log_api_stats('/db/message', 'POST', 'success', user_id)
         return jsonify({"status": "success"})
     except Exception as e:
         async_log_api_stats('/db/message', 'POST', 'error', user_id)
-        log_to_redis('db_insert_error', str(e))
+        log_event('db_insert_error', str(e), level='error')
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+
+# 메시지 대량 입력 - 청크마다 multi-row INSERT + 트랜잭션 1회, 로그는 배치당 1건
+@app.route('/db/messages/bulk', methods=['POST'])
+@login_required
+def save_bulk_to_db():
+    user_id = session['user_id']
+    try:
+        try:
+            messages, errors = parse_bulk_messages(request.mimetype or '', request.get_data(as_text=True))
+        except ValueError as e:
+            return jsonify({"status": "error", "message": str(e)}), 400
+        if len(messages) > BULK_MAX_ITEMS:
+            return jsonify({"status": "error", "message": f"한 번에 최대 {BULK_MAX_ITEMS}개까지 입력할 수 있습니다"}), 413
+        
+        results = [{"index": index, "status": "error", "message": errors[index]} if index in errors
+                   else {"index": index, "status": "success"} for index in range(len(messages))]
+        valid = [index for index, message in enumerate(messages) if message is not None]
+        inserted = 0
+        
+        if valid:
+            db = get_db_connection()
+            cursor = db.cursor()
+            sql = "INSERT INTO messages (user_id, message, created_at) VALUES (%s, %s, %s)"
+            try:
+                for start in range(0, len(valid), BULK_INSERT_CHUNK_SIZE):
+                    chunk = valid[start:start + BULK_INSERT_CHUNK_SIZE]
+                    created_at = datetime.now()
+                    try:
+                        # mysql-connector는 INSERT executemany를 multi-row VALUES 한 문장으로 전송
+                        cursor.executemany(sql, [(user_id, messages[index], created_at) for index in chunk])
+                        cursor.execute(UPSERT_USER_STATS_SQL, (user_id, len(chunk), created_at))
+                        db.commit()
+                        inserted += len(chunk)
+                    except Exception as chunk_error:
+                        db.rollback()
+                        for index in chunk:
+                            results[index] = {"index": index, "status": "error", "message": str(chunk_error)}
+            finally:
+                cursor.close()
+                db.close()
+            if inserted:
+                message_cache.invalidate(user_id)
+                # 건수만 알림 - 클라이언트가 첫 페이지를 다시 조회
+                event_hub.publish('messages_bulk', {'count': inserted}, user_id=user_id)
+        
+        failed = len(messages) - inserted
+        status = 'success' if failed == 0 else ('partial' if inserted else 'error')
+        log_event('db_bulk_insert', f"Bulk insert: {inserted}/{len(messages)} messages saved")
+        async_log_api_stats('/db/messages/bulk', 'POST', status, user_id)
+        return jsonify({
+            "status": status,
+            "inserted": inserted,
+            "failed": failed,
+            "results": results
+        }), (200 if inserted or not messages else 400)
+    except Exception as e:
+        async_log_api_stats('/db/messages/bulk', 'POST', 'error', user_id)
+        log_event('db_bulk_insert_error', str(e), level='error')
         return jsonify({"status": "error", "message": str(e)}), 500
 
 @app.route('/db/messages', methods=['GET'])
@@ -209,33 +460,188 @@ def save_to_db():
 def get_from_db():
     try:
         user_id = session['user_id']
-        db = get_db_connection()
-        cursor = db.cursor(dictionary=True)
-        cursor.execute("SELECT * FROM messages WHERE user_id = %s ORDER BY created_at DESC", (user_id,))
-        messages = cursor.fetchall()
-        cursor.close()
-        db.close()
+        try:
+            stream, stream_limit = get_stream_args(request.args)
+            limit, after = get_page_args(request.args)
+        except ValueError as e:
+            return jsonify({"status": "error", "message": str(e)}), 400
+        if stream:
+            # 전체 목록 스트리밍 (캐시/write-behind 대기 메시지 병합 없이 DB에서 직접)
+            response = stream_query(*message_page_query(user_id, stream_limit, after, lookahead=0), stream)
+            async_log_api_stats('/db/messages', 'GET', 'success', user_id)
+            return response
+        messages, next_cursor = get_message_page(user_id, limit, after)
+        if message_writer.enabled and after is None:
+            messages = merge_pending_messages(user_id, messages)
         
         # 비동기 로깅으로 변경
         async_log_api_stats('/db/messages', 'GET', 'success', user_id)
         
-        return jsonify(messages)
+        # 응답 본문은 기존과 같은 배열, 다음 페이지 토큰은 헤더로 전달
+        response = jsonify(messages)
+        if next_cursor:
+            response.headers['X-Next-Cursor'] = next_cursor
+        return response
     except Exception as e:
         if 'user_id' in session:
             async_log_api_stats('/db/messages', 'GET', 'error', session['user_id'])
         return jsonify({"status": "error", "message": str(e)}), 500
 
+def warm_flask():
+    # URL 라우팅 테이블 빌드 등 첫 요청에서만 하는 작업을 미리 수행
+    return {'status': app.test_client().get('/healthz').status_code}
+
+# 공통 워밍업 단계(core.warmup)에 Flask 라우팅 워밍업 추가
+warmup.steps.append(('flask', warm_flask))
+
+if os.getenv('METRICS_OTEL_ENABLED', 'false').lower() == 'true' and otel_enabled:
+    app_metrics.enable_otel('backend')
+
+# Prometheus 스크레이프 엔드포인트 (gunicorn 워커 전체 합산)
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    app_metrics.ensure_writer()
+    return Response(app_metrics.render(), mimetype='text/plain; version=0.0.4')
+
+# MariaDB 커넥션 풀 상태 조회 (레플리카별 풀 크기 산정용)
+@app.route('/db/pool/stats', methods=['GET'])
+def get_db_pool_stats():
+    return jsonify(db_pool.stats())
+
+# 메시지 캐시 상태 조회
+@app.route('/db/cache/stats', methods=['GET'])
+def get_message_cache_stats():
+    return jsonify(message_cache.stats())
+
+# 세션 저장소 상태 조회
+@app.route('/session/stats', methods=['GET'])
+def get_session_stats():
+    return jsonify(session_store.stats())
+
+# write-behind 버퍼 상태 조회
+@app.route('/db/write-behind/stats', methods=['GET'])
+def get_write_behind_stats():
+    return jsonify(message_writer.stats())
+
+# 요청 속도 제한 / 동시 처리 제한 상태 조회
+@app.route('/ratelimit/stats', methods=['GET'])
+def get_rate_limit_stats():
+    stats = rate_limiter.stats()
+    stats['concurrency'] = concurrency_limiter.stats()
+    return jsonify(stats)
+
+# liveness - 프로세스가 요청을 처리할 수 있으면 200 (의존성을 호출하지 않음, 의존성 장애로 재시작되지 않도록)
+@app.route('/healthz', methods=['GET'])
+def healthz():
+    return jsonify({'status': 'ok'})
+
+# readiness - 이 워커의 기동 준비가 끝나면 200, 그 전에는 503 (의존성 장애는 브레이커로 처리하므로 준비 상태에 반영하지 않음)
+@app.route('/readyz', methods=['GET'])
+def readyz():
+    warmup.start()
+    stats = warmup.stats()
+    stats['dependencies'] = {name: breaker.state for name, breaker in breakers.items()}
+    if not stats['ready']:
+        response = jsonify(dict(stats, status='starting'))
+        response.headers['Retry-After'] = '1'
+        return response, 503
+    return jsonify(dict(stats, status='ready'))
+
+# 의존성 상태 조회 - 서킷 브레이커 상태 (의존성 호출 없이 메모리 값만 읽음)
+# 하나라도 closed가 아니면 status가 degraded (파드는 캐시/백업으로 계속 응답하므로 200)
+@app.route('/health/dependencies', methods=['GET'])
+def get_dependency_health():
+    dependencies = {name: breaker.stats() for name, breaker in breakers.items()}
+    dependencies['kafka']['log_view'] = kafka_log_view.stats()
+    return jsonify({
+        'status': 'ok' if all(stats['state'] == 'closed' for stats in dependencies.values()) else 'degraded',
+        'dependencies': dependencies,
+        'fallback': fallback_cache.stats()
+    })
+
+# 애플리케이션 로그 버퍼 상태 조회
+@app.route('/logs/app/stats', methods=['GET'])
+def get_app_log_stats():
+    return jsonify(app_log.stats())
+
+# Kafka 로깅 큐 / 로그 뷰 상태 조회
+@app.route('/logs/kafka/stats', methods=['GET'])
+def get_kafka_log_stats():
+    stats = kafka_log_queue.stats()
+    stats['view'] = kafka_log_view.stats()
+    return jsonify(stats)
+
+# 실시간 이벤트 스트림 (Server-Sent Events) - 이벤트: message, messages_bulk, app_logs, api_logs, resync
+# EVENTS_MAX_DURATION마다 연결을 끊어 브라우저 EventSource가 다시 연결하도록 함 (세션 재확인, 스레드 반납)
+@app.route('/events', methods=['GET'])
+@login_required
+def stream_events():
+    if not event_hub.enabled:
+        return jsonify({"status": "error", "message": "실시간 이벤트가 비활성화되어 있습니다"}), 404
+    user_id = session['user_id']
+    client = event_hub.subscribe(user_id, user_id == 'admin')
+    if client is None:
+        return concurrency_limited()
+    events = client[0]
+
+    def generate():
+        try:
+            yield 'retry: 3000\n\n'
+            deadline = time.monotonic() + EVENTS_MAX_DURATION
+            while time.monotonic() < deadline:
+                try:
+                    event = events.get(timeout=EVENTS_HEARTBEAT)
+                except queue.Empty:
+                    yield ': keepalive\n\n'  # 프록시 유휴 타임아웃 방지
+                    continue
+                yield f"event: {event['type']}\ndata: {json.dumps(event['data'])}\n\n"
+        finally:
+            event_hub.unsubscribe(client)
+
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # nginx 응답 버퍼링 끔
+    return response
+
+# 실시간 이벤트 상태 조회
+@app.route('/events/stats', methods=['GET'])
+def get_event_stats():
+    return jsonify(event_hub.stats())
+
 # Redis 로그 조회
 @app.route('/logs/redis', methods=['GET'])
 def get_redis_logs():
     try:
         redis_client = get_redis_connection()
-        logs = redis_client.lrange('api_logs', 0, -1)
-        redis_client.close()
-        return jsonify([json.loads(log) for log in logs])
+        logs = [json.loads(log) for log in redis_client.lrange('api_logs', 0, -1)]
+        fallback_cache.set('redis_logs', logs)
+        return jsonify(logs)
     except Exception as e:
+        # Redis 장애 중에는 마지막으로 조회한 로그 스냅샷으로 응답
+        cached = fallback_cache.get('redis_logs')
+        if cached is not None:
+            return stale_response(*cached)
         return jsonify({"status": "error", "message": str(e)}), 500
 
+
+# 로그인 성공 시 해시 비용이 현재 설정과 다르면 새 해시로 교체 (실패해도 로그인은 계속)
+def upgrade_password_hash(username, old_hash, new_hash):
+    try:
+        db = get_db_connection()
+        cursor = db.cursor()
+        cursor.execute("UPDATE users SET password = %s WHERE username = %s AND password = %s",
+                       (new_hash, username, old_hash))
+        db.commit()
+        cursor.close()
+        db.close()
+    except Exception as e:
+        print(f"Password rehash error: {str(e)}")
+
+# 비밀번호 해시 풀 상태 조회
+@app.route('/auth/hasher/stats', methods=['GET'])
+def get_hasher_stats():
+    return jsonify(password_hasher.stats())
+
 # 회원가입 엔드포인트
 @app.route('/register', methods=['POST'])
 def register():
@@ -247,8 +653,11 @@ def register():
         if not username or not password:
             return jsonify({"status": "error", "message": "사용자명과 비밀번호는 필수입니다"}), 400
             
-        # 비밀번호 해시화
-        hashed_password = generate_password_hash(password)
+        # 비밀번호 해시화 (프로세스 풀)
+        try:
+            hashed_password = password_hasher.hash(password)
+        except (HasherBusyError, FutureTimeoutError):
+            return hasher_unavailable()
         
         db = get_db_connection()
         cursor = db.cursor()
@@ -256,6 +665,8 @@ def register():
         # 사용자명 중복 체크
         cursor.execute("SELECT username FROM users WHERE username = %s", (username,))
         if cursor.fetchone():
+            cursor.close()
+            db.close()
             return jsonify({"status": "error", "message": "이미 존재하는 사용자명입니다"}), 400
         
         # 사용자 정보 저장
@@ -269,6 +680,15 @@ def register():
     except Exception as e:
         return jsonify({"status": "error", "message": str(e)}), 500
 
+# 로그인 세션 시작 (Redis 세션 저장소에 기록, 세션 ID 재발급)
+def start_session(user_id, is_admin=False):
+    session.clear()
+    session['user_id'] = user_id
+    if is_admin:
+        session['is_admin'] = True
+    session['login_time'] = datetime.now().isoformat()
+    session.rotate = True
+
 # 로그인 엔드포인트
 @app.route('/login', methods=['POST'])
 def login():
@@ -284,23 +704,7 @@ def login():
         admin_username = os.getenv('ADMIN_USERNAME', 'admin')
         admin_password = os.getenv('ADMIN_PASSWORD', 'admin')
         if username == admin_username and password == admin_password:
-            session['user_id'] = 'admin'
-            session['is_admin'] = True
-            
-            # Redis 세션 저장 (선택적)
-            try:
-                redis_client = get_redis_connection()
-                session_data = {
-                    'user_id': 'admin',
-                    'is_admin': True,
-                    'login_time': datetime.now().isoformat()
-                }
-                redis_client.set(f"session:admin", json.dumps(session_data))
-                redis_client.expire(f"session:admin", 3600)
-            except Exception as redis_error:
-                print(f"Redis session error: {str(redis_error)}")
-                # Redis 오류는 무시하고 계속 진행
-            
+            start_session('admin', is_admin=True)
             return jsonify({
                 "status": "success", 
                 "message": "관리자 로그인 성공",
@@ -316,22 +720,18 @@ def login():
         cursor.close()
         db.close()
         
-        if user and check_password_hash(user['password'], password):
-            session['user_id'] = username  # 세션에 사용자 정보 저장
-            
-            # Redis 세션 저장 (선택적)
-            try:
-                redis_client = get_redis_connection()
-                session_data = {
-                    'user_id': username,
-                    'login_time': datetime.now().isoformat()
-                }
-                redis_client.set(f"session:{username}", json.dumps(session_data))
-                redis_client.expire(f"session:{username}", 3600)
-            except Exception as redis_error:
-                print(f"Redis session error: {str(redis_error)}")
-                # Redis 오류는 무시하고 계속 진행
-            
+        if not user:
+            return jsonify({"status": "error", "message": "잘못된 인증 정보"}), 401
+        
+        try:
+            valid, new_hash = password_hasher.verify(user['password'], password)
+        except (HasherBusyError, FutureTimeoutError):
+            return hasher_unavailable()
+        
+        if valid:
+            if new_hash:
+                upgrade_password_hash(username, user['password'], new_hash)
+            start_session(username)  # 세션에 사용자 정보 저장
             return jsonify({
                 "status": "success", 
                 "message": "로그인 성공",
@@ -349,203 +749,156 @@ def login():
 @app.route('/logout', methods=['POST'])
 def logout():
     try:
+        # 세션을 비우면 응답 시 Redis 세션과 쿠키가 함께 삭제됨
         if 'user_id' in session:
-            username = session['user_id']
-            # Redis 세션 삭제 시도 (실패해도 계속 진행)
-            try:
-                redis_client = get_redis_connection()
-                redis_client.delete(f"session:{username}")
-            except Exception as redis_error:
-                print(f"Redis 세션 삭제 실패 (무시): {redis_error}")
-            
-            # Flask 세션 정리
-            session.pop('user_id', None)
-            session.pop('is_admin', None)
+            session.clear()
             
         return jsonify({"status": "success", "message": "로그아웃 성공"})
     except Exception as e:
         print(f"로그아웃 오류: {e}")
         return jsonify({"status": "error", "message": str(e)}), 500
 
-# 메시지 검색 (DB에서 검색)
+# 메시지 검색 (FULLTEXT 인덱스 관련도 검색, 짧은 검색어는 LIKE 검색)
 @app.route('/db/messages/search', methods=['GET'])
 @login_required
 def search_messages():
     try:
-        query = request.args.get('q', '')
+        query = request.args.get('q', '').strip()
         user_id = session['user_id']
+        try:
+            stream, stream_limit = get_stream_args(request.args)
+            limit = get_limit_arg(request.args)
+            offset = int(request.args.get('offset', 0))
+        except ValueError as e:
+            return jsonify({"status": "error", "message": str(e)}), 400
+        if offset < 0 or offset > SEARCH_MAX_OFFSET:
+            return jsonify({"status": "error", "message": f"offset은 0~{SEARCH_MAX_OFFSET} 범위여야 합니다"}), 400
+        if stream:
+            response = run_search(lambda fulltext: stream_query(
+                *search_query(user_id, query, stream_limit, offset, lookahead=0, fulltext=fulltext), stream))
+            async_log_api_stats('/db/messages/search', 'GET', 'success', user_id)
+            return response
         
         # DB에서 검색
         db = get_db_connection()
         cursor = db.cursor(dictionary=True)
-        sql = "SELECT * FROM messages WHERE user_id = %s AND message LIKE %s ORDER BY created_at DESC"
-        cursor.execute(sql, (user_id, f"%{query}%"))
-        results = cursor.fetchall()
+        results, next_offset = run_search(
+            lambda fulltext: search_message_page(cursor, user_id, query, limit, offset, fulltext))
         cursor.close()
         db.close()
         
         # 검색 이력을 Kafka에 저장
         async_log_api_stats('/db/messages/search', 'GET', 'success', user_id)
         
-        return jsonify(results)
+        response = jsonify(results)
+        if next_offset is not None:
+            response.headers['X-Next-Offset'] = str(next_offset)
+        return response
     except Exception as e:
         if 'user_id' in session:
             async_log_api_stats('/db/messages/search', 'GET', 'error', session['user_id'])
         return jsonify({"status": "error", "message": str(e)}), 500
 
-# Kafka 로그 조회 엔드포인트 (Redis 백업 포함)
+# Redis 백업 로그(api_stats)를 Kafka 로그 형식으로 변환
+def get_redis_backup_api_stats():
+    redis_logs = get_redis_connection().lrange('api_logs', 0, -1)
+    api_stats_logs = []
+    for log_str in redis_logs:
+        try:
+            log_data = json.loads(log_str)
+        except ValueError:
+            continue
+        if log_data.get('action') == 'api_stats':
+            api_stats_logs.append({
+                'developer_tag': os.getenv('DEVELOPER_TAG', 'hyunwoo'),
+                'timestamp': log_data.get('timestamp'),
+                'endpoint': 'unknown',
+                'method': 'unknown',
+                'status': 'success',
+                'user_id': 'unknown',
+                'message': log_data.get('details', '')
+            })
+    # 시간 역순으로 정렬
+    api_stats_logs.sort(key=lambda x: x['timestamp'], reverse=True)
+    return api_stats_logs
+
+
+# Kafka 로그 조회 엔드포인트 (파드별 로그 뷰에서 조회, 비어 있으면 Redis 백업)
 @app.route('/logs/kafka', methods=['GET'])
 @login_required
 def get_kafka_logs():
     try:
-        # Kafka에서 로그 조회 시도
-        topic_name = f"api-logs-{os.getenv('DEVELOPER_TAG', 'hyunwoo')}"
-        consumer = KafkaConsumer(
-            topic_name,
-            bootstrap_servers=os.getenv('KAFKA_SERVERS', 'team-kafka.default.svc.cluster.local:9092'),
-            value_deserializer=lambda m: json.loads(m.decode('utf-8')),
-            group_id='api-logs-viewer',
-            auto_offset_reset='earliest',
-            consumer_timeout_ms=5000,
-            security_protocol='SASL_PLAINTEXT',
-            sasl_mechanism='PLAIN',
-            sasl_plain_username=os.getenv('KAFKA_USERNAME', 'user1'),
-            sasl_plain_password=os.getenv('KAFKA_PASSWORD', 'password')
-        )
-        
-        logs = []
-        my_developer_tag = os.getenv('DEVELOPER_TAG', 'hyunwoo')  # 내 개발자 태그
-        
         try:
-            for message in consumer:
-                # 내 개발자 태그 로그만 필터링
-                if message.value.get('developer_tag') == my_developer_tag:
-                    logs.append({
-                        'developer_tag': message.value['developer_tag'],
-                        'timestamp': message.value['timestamp'],
-                        'endpoint': message.value['endpoint'],
-                        'method': message.value['method'],
-                        'status': message.value['status'],
-                        'user_id': message.value['user_id'],
-                        'message': message.value['message']
-                    })
-                    if len(logs) >= 100:
-                        break
-        finally:
-            consumer.close()
-        
-        # Kafka에서 로그를 가져왔다면 반환
-        if logs:
-            logs.sort(key=lambda x: x['timestamp'], reverse=True)
+            limit = max(1, min(int(request.args.get('limit', 100)), kafka_log_view.size))
+            since = parse_log_time(request.args['since']) if request.args.get('since') else None
+            until = parse_log_time(request.args['until']) if request.args.get('until') else None
+        except ValueError as e:
+            return jsonify({"status": "error", "message": str(e)}), 400
+        
+        logs = kafka_log_view.query(
+            endpoint=request.args.get('endpoint'),
+            user_id=request.args.get('user_id'),
+            status=request.args.get('status'),
+            since=since,
+            until=until,
+            limit=limit
+        )
+        if logs or not kafka_log_view.is_empty():
             return jsonify(logs)
         
-        # Kafka에서 로그가 없으면 Redis 백업에서 API 통계 로그 찾기
-        print("Kafka에서 로그를 찾을 수 없어 Redis 백업을 확인합니다.")
-        redis_client = get_redis_connection()
-        redis_logs = redis_client.lrange('api_logs', 0, -1)
-        redis_client.close()
-        
-        # Redis에서 API 통계 로그만 필터링
-        api_stats_logs = []
-        for log_str in redis_logs:
-            try:
-                log_data = json.loads(log_str)
-                if log_data.get('action') == 'api_stats':
-                    # Redis 백업 로그를 Kafka 형식으로 변환
-                    details = log_data.get('details', '')
-                    api_stats_logs.append({
-                        'developer_tag': my_developer_tag,
-                        'timestamp': log_data.get('timestamp'),
-                        'endpoint': 'unknown',
-                        'method': 'unknown',
-                        'status': 'success',
-                        'user_id': 'unknown',
-                        'message': details
-                    })
-            except:
-                continue
-        
-        # 시간 역순으로 정렬
-        api_stats_logs.sort(key=lambda x: x['timestamp'], reverse=True)
-        return jsonify(api_stats_logs)
+        # 로그 뷰가 아직 비어 있으면 (Kafka 장애/기동 직후) Redis 백업에서 API 통계 로그 찾기
+        print("Kafka 로그 뷰가 비어 있어 Redis 백업을 확인합니다.")
+        return jsonify(get_redis_backup_api_stats()[:limit])
         
     except Exception as e:
         print(f"Kafka log retrieval error: {str(e)}")
-        # Kafka 오류 시에도 Redis 백업 시도
-        try:
-            redis_client = get_redis_connection()
-            redis_logs = redis_client.lrange('api_logs', 0, -1)
-            redis_client.close()
-            
-            api_stats_logs = []
-            for log_str in redis_logs:
-                try:
-                    log_data = json.loads(log_str)
-                    if log_data.get('action') == 'api_stats':
-                        details = log_data.get('details', '')
-                        api_stats_logs.append({
-                            'developer_tag': os.getenv('DEVELOPER_TAG', 'hyunwoo'),
-                            'timestamp': log_data.get('timestamp'),
-                            'endpoint': 'unknown',
-                            'method': 'unknown',
-                            'status': 'success',
-                            'user_id': 'unknown',
-                            'message': details
-                        })
-                except:
-                    continue
-            
-            api_stats_logs.sort(key=lambda x: x['timestamp'], reverse=True)
-            return jsonify(api_stats_logs)
-        except Exception as redis_error:
-            print(f"Redis backup retrieval error: {str(redis_error)}")
-            return jsonify({"status": "error", "message": "Kafka와 Redis 모두에서 로그를 가져올 수 없습니다."}), 500
+        return jsonify({"status": "error", "message": "Kafka와 Redis 모두에서 로그를 가져올 수 없습니다."}), 500
 
-# 관리자 전용 - 전체 사용자 목록 조회
+# 관리자 전용 - 사용자 목록 조회 (페이지 단위)
 @app.route('/admin/users', methods=['GET'])
 @admin_required
 def get_all_users():
     try:
+        try:
+            stream, stream_limit = get_stream_args(request.args)
+            limit, after = get_page_args(request.args)
+        except ValueError as e:
+            return jsonify({"status": "error", "message": str(e)}), 400
+        if stream:
+            # 사용자 배열만 전송 (첫 요청이면 관리자를 맨 앞에)
+            def admin_row(cursor):
+                cursor.execute(USER_STATS_SQL, ('admin',))
+                admin_stats = cursor.fetchone()
+                cursor.fetchall()
+                return [admin_user_info(admin_stats)]
+            response = stream_query(*user_page_query(stream_limit, after, lookahead=0), stream,
+                                    head=admin_row if after is None else None)
+            async_log_api_stats('/admin/users', 'GET', 'success', 'admin')
+            return response
         db = get_db_connection()
         cursor = db.cursor(dictionary=True)
         
-        # 사용자 기본 정보와 통계 조회
-        cursor.execute("""
-            SELECT 
-                u.id,
-                u.username,
-                u.created_at,
-                COUNT(m.id) as message_count,
-                MAX(m.created_at) as last_message_at
-            FROM users u
-            LEFT JOIN messages m ON u.username = m.user_id
-            GROUP BY u.id, u.username, u.created_at
-            ORDER BY u.created_at DESC
-        """)
-        users = cursor.fetchall()
+        # 사용자 기본 정보와 통계 조회 (user_stats 요약 테이블, (created_at, id) 키셋 페이지네이션)
+        cursor.execute(*user_page_query(limit, after))
+        users, next_cursor = split_keyset_page(cursor.fetchall(), limit)
+        
+        all_users = users
+        if after is None:
+            # 관리자를 맨 위에 추가 (첫 페이지에만)
+            cursor.execute(USER_STATS_SQL, ('admin',))
+            all_users = [admin_user_info(cursor.fetchone())] + users
         
         cursor.close()
         db.close()
         
-        # 관리자 계정 정보 추가 (하드코딩)
-        admin_info = {
-            'id': 0,
-            'username': 'admin',
-            'created_at': '2025-01-01 00:00:00',  # 고정 날짜
-            'message_count': 0,
-            'last_message_at': None
-        }
-        
-        # 관리자를 맨 위에 추가
-        all_users = [admin_info] + users
-        
         # API 통계 로깅
         async_log_api_stats('/admin/users', 'GET', 'success', 'admin')
         
         return jsonify({
             "status": "success",
             "users": all_users,
-            "total_count": len(all_users)
+            "total_count": len(all_users),
+            "next_cursor": next_cursor
         })
         
     except Exception as e:
@@ -553,21 +906,34 @@ def get_all_users():
         print(f"Admin users list error: {str(e)}")
         return jsonify({"status": "error", "message": str(e)}), 500
 
-# 관리자 전용 - 특정 사용자의 모든 메시지 조회
+# 관리자 전용 - 특정 사용자의 모든 세션 강제 종료 (전체 레플리카에서 최대 SESSION_LOCAL_CACHE_TTL 이내 반영)
+@app.route('/admin/users/<username>/sessions', methods=['DELETE'])
+@admin_required
+def revoke_user_sessions(username):
+    try:
+        revoked = session_store.revoke_user(username)
+        async_log_api_stats(f'/admin/users/{username}/sessions', 'DELETE', 'success', 'admin')
+        return jsonify({"status": "success", "username": username, "revoked": revoked})
+    except Exception as e:
+        async_log_api_stats(f'/admin/users/{username}/sessions', 'DELETE', 'error', 'admin')
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+# 관리자 전용 - 특정 사용자의 메시지 조회 (키셋 페이지네이션)
 @app.route('/admin/users/<username>/messages', methods=['GET'])
 @admin_required
 def get_user_messages(username):
     try:
-        db = get_db_connection()
-        cursor = db.cursor(dictionary=True)
-        cursor.execute("""
-            SELECT * FROM messages 
-            WHERE user_id = %s 
-            ORDER BY created_at DESC
-        """, (username,))
-        messages = cursor.fetchall()
-        cursor.close()
-        db.close()
+        try:
+            stream, stream_limit = get_stream_args(request.args)
+            limit, after = get_page_args(request.args)
+        except ValueError as e:
+            return jsonify({"status": "error", "message": str(e)}), 400
+        if stream:
+            # 메시지 배열만 전송
+            response = stream_query(*message_page_query(username, stream_limit, after, lookahead=0), stream)
+            async_log_api_stats(f'/admin/users/{username}/messages', 'GET', 'success', 'admin')
+            return response
+        messages, next_cursor = get_message_page(username, limit, after)
         
         # API 통계 로깅
         async_log_api_stats(f'/admin/users/{username}/messages', 'GET', 'success', 'admin')
@@ -576,12 +942,19 @@ def get_user_messages(username):
             "status": "success",
             "username": username,
             "messages": messages,
-            "message_count": len(messages)
+            "message_count": get_user_message_count(username),  # 페이지가 아닌 전체 메시지 수
+            "next_cursor": next_cursor
         })
         
     except Exception as e:
         async_log_api_stats(f'/admin/users/{username}/messages', 'GET', 'error', 'admin')
         return jsonify({"status": "error", "message": str(e)}), 500
 
+# 모듈 import(라우트/컴포넌트 생성 포함)에 걸린 시간 - gunicorn preload에서는 마스터에서 1회 측정
+IMPORT_SECONDS = time.perf_counter() - IMPORT_STARTED
+warmup.import_seconds = IMPORT_SECONDS
+
+# 개발용 서버 (운영은 gunicorn -c gunicorn.conf.py app:app, 디버그 모드는 FLASK_DEBUG=true일 때만)
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000, debug=True) 
\ No newline at end of file
+    warmup.run()
+    app.run(host='0.0.0.0', port=5000, debug=os.getenv('FLASK_DEBUG', 'false').lower() == 'true')
@@ -0,0 +1,1280 @@
+# ⚡ asyncio 기반 백엔드 (app.py와 같은 라우트/JSON 형식)
+# MariaDB(aiomysql), Redis(redis.asyncio), Kafka(aiokafka)를 모두 논블로킹으로 사용해
+# 적은 스레드로 수천 개의 동시 요청을 처리합니다.
+# 실행: hypercorn app_async:app --bind 0.0.0.0:5000 (의존성: requirements-async.txt)
+import os
+import re
+import json
+import time
+import math
+import asyncio
+import uuid
+from datetime import datetime
+
+from quart import Quart, Response, request, jsonify, session, g, has_app_context
+from quart.sessions import SessionInterface, SecureCookieSession
+from itsdangerous import Signer, BadSignature
+from quart_cors import cors
+from hypercorn.middleware import ProxyFixMiddleware
+import aiomysql
+import redis.asyncio as aioredis
+from redis.asyncio.retry import Retry
+from redis.backoff import NoBackoff
+from aiokafka import AIOKafkaProducer
+from passwords import HasherBusyError
+from metrics import MetricsRegistry
+
+# SQL/페이지네이션/캐시/세션/응답 규칙은 동기 앱과 공유 (core.py - Flask 앱을 만들지 않음)
+from core import (
+    json_default, korea_tz, MessageCache, UPSERT_USER_STATS_SQL, USER_STATS_SQL, KafkaLogQueue,
+    get_page_args, get_limit_arg, message_page_query, user_page_query, split_keyset_page,
+    search_query, split_offset_page, admin_user_info, SEARCH_MAX_OFFSET, kafka_log_view, parse_log_time,
+    RedisSessionMixin, session_store, session_required, password_hasher, log_event, app_log,
+    RateLimiter, rate_limiter, concurrency_limiter, RATE_LIMIT_EXEMPT, rate_limit_subject,
+    rate_limited, concurrency_limited, hasher_unavailable,
+    event_hub, EVENTS_HEARTBEAT, EVENTS_MAX_DURATION, REQUEST_METRICS_EXEMPT,
+    api_stats_codec, api_stats_message, KAFKA_COMPRESSION,
+    breakers, db_breaker, redis_breaker, kafka_breaker, REDIS_FAILURES, CircuitOpenError, fallback_cache,
+    warmup, WARMUP_DB_CONNECTIONS, TRUSTED_PROXY_HOPS, message_writer, merge_pending_rows,
+    is_fulltext_index_missing, get_stream_args, STREAM_FORMATS, STREAM_FETCH_SIZE, parse_bulk_messages, BULK_INSERT_CHUNK_SIZE, BULK_MAX_ITEMS
+)
+
+app = Quart(__name__)
+# app.py의 flask-cors(supports_credentials=True)처럼 요청 Origin을 그대로 허용
+app = cors(app, allow_credentials=True, allow_origin=re.compile(r'.*'),
+           expose_headers=['X-Next-Cursor', 'X-Next-Offset', 'Retry-After'])
+app.secret_key = os.getenv('FLASK_SECRET_KEY', 'your-secret-key-here')  # app.py와 같은 키 - 세션 쿠키 호환
+# app.py의 ProxyFix와 같은 규칙 - X-Forwarded-For의 오른쪽에서 TRUSTED_PROXY_HOPS번째 값을 클라이언트 IP로 사용
+if TRUSTED_PROXY_HOPS > 0:
+    app.asgi_app = ProxyFixMiddleware(app.asgi_app, mode='legacy', trusted_hops=TRUSTED_PROXY_HOPS)
+
+# 요청 지연 시간 메트릭 (app.py와 같은 이름 - 단일 프로세스라 스냅샷 디렉터리 없음)
+app_metrics = MetricsRegistry()
+app_metrics.histogram('backend_http_request_duration_seconds', 'HTTP 요청 처리 시간 (endpoint, method)')
+app_metrics.counter('backend_http_requests_total', 'HTTP 요청 수 (endpoint, method, status)')
+app_metrics.gauge('backend_http_requests_in_flight', '처리 중인 HTTP 요청 수 (endpoint)')
+
+@app.before_request
+async def start_request_metrics():
+    if request.path in REQUEST_METRICS_EXEMPT:
+        return
+    g._metrics_endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+    g._metrics_start = time.perf_counter()
+    app_metrics.add('backend_http_requests_in_flight', (('endpoint', g._metrics_endpoint),), 1)
+
+@app.after_request
+async def record_request_metrics(response):
+    endpoint = g.get('_metrics_endpoint')
+    if endpoint is not None:
+        app_metrics.observe('backend_http_request_duration_seconds',
+                            (('endpoint', endpoint), ('method', request.method)),
+                            time.perf_counter() - g._metrics_start)
+        app_metrics.inc('backend_http_requests_total',
+                        (('endpoint', endpoint), ('method', request.method), ('status', str(response.status_code))))
+    return response
+
+@app.teardown_request
+async def finish_request_metrics(exc):
+    endpoint = g.pop('_metrics_endpoint', None)
+    if endpoint is not None:
+        app_metrics.add('backend_http_requests_in_flight', (('endpoint', endpoint),), -1)
+
+# 서킷 브레이커는 core.breakers를 공유 - 열린 브레이커 때문에 실패한 요청은 500 대신 503 + Retry-After
+def note_circuit_open(error):
+    if has_app_context():
+        g._circuit_open = max(g.get('_circuit_open', 0.0), error.retry_after)
+
+for breaker in breakers.values():
+    breaker.on_reject = note_circuit_open
+
+@app.errorhandler(CircuitOpenError)
+async def dependency_unavailable(error):
+    response = jsonify({"status": "error", "message": str(error)})
+    response.headers['Retry-After'] = str(max(1, math.ceil(error.retry_after)))
+    return response, 503
+
+@app.after_request
+async def mark_dependency_unavailable(response):
+    retry_after = g.get('_circuit_open')
+    if retry_after is not None and response.status_code == 500:
+        response.status_code = 503
+        response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+    return response
+
+# Redis 명령마다 브레이커 확인 (파이프라인/pub-sub은 소켓 타임아웃만 적용)
+class GuardedRedis(aioredis.Redis):
+    async def execute_command(self, *args, **options):
+        try:
+            redis_breaker.check()
+        except CircuitOpenError as e:
+            note_circuit_open(e)
+            raise
+        try:
+            result = await super().execute_command(*args, **options)
+        except REDIS_FAILURES as e:
+            redis_breaker.record_failure(e)
+            raise
+        except Exception:
+            redis_breaker.record_success()
+            raise
+        redis_breaker.record_success()
+        return result
+
+DEVELOPER_TAG = os.getenv('DEVELOPER_TAG', 'hyunwoo')
+KAFKA_TOPIC = f"api-logs-{DEVELOPER_TAG}"
+
+# Kafka SASL_PLAINTEXT 공통 설정
+def kafka_client_config():
+    return {
+        'bootstrap_servers': os.getenv('KAFKA_SERVERS', 'team-kafka.default.svc.cluster.local:9092'),
+        'security_protocol': 'SASL_PLAINTEXT',
+        'sasl_mechanism': 'PLAIN',
+        'sasl_plain_username': os.getenv('KAFKA_USERNAME', 'user1'),
+        'sasl_plain_password': os.getenv('KAFKA_PASSWORD', 'password')
+    }
+
+# 서버 수명 동안 공유하는 클라이언트 (before_serving에서 생성)
+db_pool = None
+redis_client = None
+kafka_producer = None
+kafka_log_queue = None
+kafka_log_worker = None
+message_cache_lookup = None
+db_checkout = {'checkouts': 0, 'timeouts': 0, 'total': 0.0, 'max': 0.0}
+message_cache = MessageCache(
+    enabled=os.getenv('MESSAGE_CACHE_ENABLED', 'true').lower() == 'true',
+    ttl=int(os.getenv('MESSAGE_CACHE_TTL', '60'))
+)
+log_counters = {'enqueued': 0, 'sent': 0, 'failed': 0, 'dropped': 0, 'spilled': 0}
+log_backpressure = os.getenv('KAFKA_LOG_BACKPRESSURE', 'spill')
+if log_backpressure not in KafkaLogQueue.BACKPRESSURE_POLICIES:
+    log_backpressure = 'drop'
+
+@app.before_serving
+async def startup():
+    global db_pool, redis_client, kafka_log_queue, kafka_log_worker
+    db_pool = await aiomysql.create_pool(
+        host=os.getenv('MYSQL_HOST', 'my-mariadb'),
+        user=os.getenv('MYSQL_USER', 'testuser'),
+        password=os.getenv('MYSQL_PASSWORD') or '',
+        db="testdb",
+        minsize=0,
+        maxsize=int(os.getenv('DB_POOL_SIZE', '10')),
+        pool_recycle=int(float(os.getenv('DB_POOL_MAX_IDLE', '300'))),
+        connect_timeout=int(os.getenv('DB_CONNECT_TIMEOUT', '5')),
+        charset='utf8mb4'
+    )
+    redis_client = GuardedRedis(
+        host=os.getenv('REDIS_HOST', 'my-redis-master'),
+        port=6379,
+        password=os.getenv('REDIS_PASSWORD'),
+        decode_responses=True,
+        db=0,
+        max_connections=int(os.getenv('REDIS_POOL_SIZE', '20')),
+        socket_connect_timeout=float(os.getenv('REDIS_CONNECT_TIMEOUT', '1')),
+        socket_timeout=float(os.getenv('REDIS_SOCKET_TIMEOUT', '2')),
+        # core.redis_retry와 같은 정책 (asyncio 클라이언트는 asyncio용 Retry 필요)
+        retry=Retry(NoBackoff(), int(os.getenv('REDIS_RETRIES', '1')), supported_errors=(aioredis.ConnectionError,))
+    )
+    kafka_log_queue = asyncio.Queue(maxsize=int(os.getenv('KAFKA_LOG_QUEUE_SIZE', '10000')))
+    kafka_log_worker = asyncio.ensure_future(run_kafka_log_worker())
+    await run_warmup()
+
+# 기동 준비 - core.warmup과 같은 단계를 코루틴으로 병렬 실행 (결과는 warmup.record로 같은 형식에 기록)
+# before_serving 안에서 실행하므로 끝나기 전에는 요청을 받지 않음
+warmup_seconds = None
+
+async def warm_mariadb():
+    conns = []
+    try:
+        for _ in range(min(WARMUP_DB_CONNECTIONS, db_pool.maxsize)):
+            conns.append(await acquire_db())
+    finally:
+        for conn in conns:
+            db_pool.release(conn)
+    return {'connections': len(conns)}
+
+async def warm_redis():
+    global message_cache_lookup, rate_limit_script
+    async with redis_client.pipeline(transaction=False) as pipe:
+        pipe.script_load(RateLimiter.TOKEN_BUCKET_SCRIPT)
+        pipe.script_load(MessageCache.LOOKUP_SCRIPT)
+        await pipe.execute()
+    if rate_limit_script is None:
+        rate_limit_script = redis_client.register_script(RateLimiter.TOKEN_BUCKET_SCRIPT)
+    if message_cache_lookup is None:
+        message_cache_lookup = redis_client.register_script(MessageCache.LOOKUP_SCRIPT)
+    # 재시작 전에 남은 write-behind 항목도 첫 요청을 기다리지 않고 저장
+    message_writer.ensure_worker()
+    return {'ping': await redis_client.ping()}
+
+async def warm_kafka():
+    kafka_log_view.warm()
+    if not kafka_breaker.allow():
+        raise CircuitOpenError('kafka', kafka_breaker.retry_after())
+    try:
+        producer = await get_kafka_producer()
+        partitions = await producer.partitions_for(KAFKA_TOPIC)
+    except Exception as e:
+        kafka_breaker.record_failure(e)
+        raise
+    kafka_breaker.record_success()
+    return {'topic': KAFKA_TOPIC, 'partitions': len(partitions or ())}
+
+async def warm_password_hasher():
+    return {'workers': await asyncio.get_running_loop().run_in_executor(None, password_hasher.warm)}
+
+async def run_warmup_step(name, step):
+    start = time.perf_counter()
+    try:
+        result = await step()
+    except Exception as e:
+        warmup.record(name, time.perf_counter() - start, error=e)
+        return
+    warmup.record(name, time.perf_counter() - start, result=result)
+
+async def run_warmup():
+    global warmup_seconds
+    start = time.perf_counter()
+    if warmup.enabled:
+        steps = {asyncio.ensure_future(run_warmup_step(name, step)): name for name, step in (
+            ('mariadb', warm_mariadb), ('redis', warm_redis), ('kafka', warm_kafka), ('password_hasher', warm_password_hasher))}
+        _, pending = await asyncio.wait(steps, timeout=warmup.timeout)
+        for step in pending:
+            step.cancel()
+        warmup.record_timeouts([steps[step] for step in pending])
+    warmup_seconds = time.perf_counter() - start
+    print(f"🔥 기동 준비 완료 ({warmup_seconds:.3f}s)")
+
+@app.after_serving
+async def shutdown():
+    # 큐에 남은 로그 전송 후 클라이언트 정리
+    if kafka_log_queue is not None:
+        try:
+            await asyncio.wait_for(kafka_log_queue.join(), timeout=10)
+        except asyncio.TimeoutError:
+            print("⚠️ Kafka 로깅 큐를 모두 비우지 못하고 종료합니다")
+    if kafka_log_worker is not None:
+        kafka_log_worker.cancel()
+    if event_listener is not None:
+        event_listener.cancel()
+    if kafka_producer is not None:
+        await kafka_producer.stop()
+    if redis_client is not None:
+        await redis_client.aclose()
+    if db_pool is not None:
+        db_pool.close()
+        await db_pool.wait_closed()
+    message_writer.shutdown(timeout=5)
+    password_hasher.shutdown()
+    app_log.shutdown(timeout=2)
+
+# MariaDB 조회/실행 헬퍼 (풀에서 커넥션 대여, 대여 지연 시간 기록)
+# 브레이커는 커넥션 대여(새 연결 포함)에만 적용 - 열려 있으면 연결 타임아웃을 기다리지 않고 바로 실패
+async def acquire_db():
+    try:
+        db_breaker.check()
+    except CircuitOpenError as e:
+        note_circuit_open(e)
+        raise
+    start = time.monotonic()
+    try:
+        conn = await asyncio.wait_for(db_pool.acquire(), timeout=float(os.getenv('DB_POOL_TIMEOUT', '5')))
+    except asyncio.TimeoutError:
+        db_checkout['timeouts'] += 1
+        raise
+    except Exception as e:
+        db_breaker.record_failure(e)
+        raise
+    db_breaker.record_success()
+    elapsed = time.monotonic() - start
+    db_checkout['checkouts'] += 1
+    db_checkout['total'] += elapsed
+    db_checkout['max'] = max(db_checkout['max'], elapsed)
+    return conn
+
+async def db_fetchall(sql, params=()):
+    conn = await acquire_db()
+    try:
+        async with conn.cursor(aiomysql.DictCursor) as cursor:
+            await cursor.execute(sql, params)
+            rows = await cursor.fetchall()
+        await conn.rollback()  # 읽기 트랜잭션 종료 (다음 조회가 최신 데이터를 보도록)
+        return list(rows)
+    finally:
+        db_pool.release(conn)
+
+async def db_fetchone(sql, params=()):
+    rows = await db_fetchall(sql, params)
+    return rows[0] if rows else None
+
+# 스트리밍 응답 (?stream=json|ndjson) - app.py의 stream_query와 같은 형식
+# unbuffered 커서(SSDictCursor)에서 STREAM_FETCH_SIZE행씩 읽어 전송하므로 메모리 사용량은 결과 크기와 무관
+async def stream_query(sql, params, fmt, head=None):
+    """head(cursor)가 주어지면 같은 커넥션에서 먼저 실행해 반환한 행들을 앞에 붙임"""
+    conn = await acquire_db()
+    try:
+        cursor = await conn.cursor(aiomysql.SSDictCursor)
+        first_rows = await head(cursor) if head else []
+        await cursor.execute(sql, params)
+    except Exception:
+        conn.close()
+        db_pool.release(conn)
+        raise
+
+    def encode(row):
+        return json.dumps(row, default=json_default, separators=(',', ':'))
+
+    async def generate():
+        done = False
+        try:
+            if fmt == 'json':
+                yield '['
+            rows, separator = first_rows or await cursor.fetchmany(STREAM_FETCH_SIZE), ''
+            while rows:
+                if fmt == 'json':
+                    yield separator + ','.join(encode(row) for row in rows)
+                    separator = ','
+                else:
+                    yield ''.join(encode(row) + '\n' for row in rows)
+                rows = await cursor.fetchmany(STREAM_FETCH_SIZE)
+            if fmt == 'json':
+                yield ']'
+            done = True
+        finally:
+            # 클라이언트가 중간에 끊으면 읽지 않은 결과가 남으므로 커넥션을 풀에 돌려주지 않고 닫음
+            if done:
+                await cursor.close()
+                await conn.rollback()
+            else:
+                conn.close()
+            db_pool.release(conn)
+
+    return Response(generate(), mimetype=STREAM_FORMATS[fmt])
+
+# api_logs 리스트에 로그 추가 + 최근 100개만 유지 (파이프라인으로 1회 왕복)
+async def push_api_log(log_entry):
+    async with redis_client.pipeline() as pipe:
+        pipe.lpush('api_logs', json.dumps(log_entry))
+        pipe.ltrim('api_logs', 0, 99)
+        event_hub.publish('app_logs', [log_entry], pipe=pipe)
+        await pipe.execute()
+
+# Kafka 대신 Redis api_logs에 백업 저장
+async def spill_api_stats(event):
+    try:
+        await push_api_log({'timestamp': event['timestamp'], 'action': 'api_stats', 'details': event['message']})
+        log_counters['spilled'] += 1
+    except Exception as redis_error:
+        print(f"Redis backup logging error: {str(redis_error)}")
+        log_counters['dropped'] += 1
+
+# API 통계 로깅 (요청은 큐에 넣기만 하고, 워커 태스크가 Producer로 전송)
+def async_log_api_stats(endpoint, method, status, user_id):
+    event = {
+        'developer_tag': DEVELOPER_TAG,
+        'timestamp': datetime.now(korea_tz).isoformat(),
+        'endpoint': endpoint,
+        'method': method,
+        'status': status,
+        'user_id': user_id,
+        'message': api_stats_message(user_id, method, endpoint, status)
+    }
+    try:
+        kafka_log_queue.put_nowait(event)
+        log_counters['enqueued'] += 1
+    except asyncio.QueueFull:
+        if log_backpressure == 'drop':
+            log_counters['dropped'] += 1
+        else:
+            # 이벤트 루프는 블로킹할 수 없으므로 block 정책도 Redis 백업으로 처리
+            asyncio.ensure_future(spill_api_stats(event))
+
+async def get_kafka_producer():
+    global kafka_producer
+    if kafka_producer is None:
+        producer = AIOKafkaProducer(
+            compression_type=KAFKA_COMPRESSION,
+            linger_ms=int(os.getenv('KAFKA_LINGER_MS', '50')),
+            max_batch_size=int(os.getenv('KAFKA_BATCH_SIZE', '16384')),
+            request_timeout_ms=int(os.getenv('KAFKA_REQUEST_TIMEOUT_MS', '5000')),
+            **kafka_client_config()
+        )
+        try:
+            await producer.start()
+        except Exception:
+            await producer.stop()
+            raise
+        kafka_producer = producer
+    return kafka_producer
+
+def _on_delivery(event):
+    def callback(future):
+        if future.cancelled() or future.exception() is not None:
+            kafka_breaker.record_failure(None if future.cancelled() else future.exception())
+            log_counters['failed'] += 1
+            asyncio.ensure_future(spill_api_stats(event))
+        else:
+            kafka_breaker.record_success()
+            log_counters['sent'] += 1
+    return callback
+
+async def run_kafka_log_worker():
+    global kafka_producer
+    while True:
+        event = await kafka_log_queue.get()
+        try:
+            if not kafka_breaker.allow():
+                # 브레이커가 열려 있으면 Producer 연결을 기다리지 않고 바로 Redis 백업
+                await spill_api_stats(event)
+                continue
+            producer = await get_kafka_producer()
+            delivery = await producer.send(KAFKA_TOPIC, api_stats_codec.encode(event), key=api_stats_codec.key(event),
+                                           headers=api_stats_codec.headers)
+            delivery.add_done_callback(_on_delivery(event))
+            await publish_event('api_logs', [event])
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Kafka logging error: {str(e)}")
+            kafka_breaker.record_failure(e)
+            log_counters['failed'] += 1
+            if kafka_producer is not None:
+                producer, kafka_producer = kafka_producer, None
+                try:
+                    await producer.stop()
+                except Exception:
+                    pass
+            await spill_api_stats(event)
+        finally:
+            kafka_log_queue.task_done()
+
+# 메시지 페이지 조회 (캐시 우선, 없으면 DB 조회 후 캐시 저장)
+async def get_message_page(user_id, limit, after, token):
+    global message_cache_lookup
+    page_key = f"{limit}:{token or ''}"
+    version = None
+    if message_cache.enabled:
+        try:
+            if message_cache_lookup is None:
+                message_cache_lookup = redis_client.register_script(MessageCache.LOOKUP_SCRIPT)
+            keys, args = message_cache.lookup_args(user_id, page_key)
+            version, payload = await message_cache_lookup(keys=keys, args=args)
+            page = message_cache.found(payload)
+            if page is not None:
+                return page['messages'], page['next_cursor']
+        except Exception as e:
+            message_cache.failed('read', e)
+    messages, next_cursor = split_keyset_page(await db_fetchall(*message_page_query(user_id, limit, after)), limit)
+    if version is not None:
+        try:
+            await redis_client.set(message_cache.page_cache_key(user_id, version, page_key),
+                                   message_cache.encode({'messages': messages, 'next_cursor': next_cursor}),
+                                   ex=message_cache.ttl)
+        except Exception as e:
+            message_cache.failed('write', e)
+    return messages, next_cursor
+
+async def invalidate_message_cache(user_id):
+    if not message_cache.enabled:
+        return
+    try:
+        async with redis_client.pipeline() as pipe:
+            message_cache.add_invalidate(pipe, user_id)
+            await pipe.execute()
+        message_cache.invalidated()
+    except Exception as e:
+        message_cache.failed('invalidation', e)
+
+# Redis 세션 (저장소는 core.session_store - 쿠키/키 구조와 로컬 캐시를 app.py와 공유)
+class RedisSession(RedisSessionMixin, SecureCookieSession):
+    pass
+
+# 로컬 TTL 캐시와 카운터는 session_store의 것을 그대로 사용하고 Redis 호출만 비동기로 수행
+class AsyncRedisSessionInterface(SessionInterface):
+    def __init__(self, store):
+        self.store = store
+
+    def _signer(self, app):
+        return Signer(app.secret_key, salt='redis-session')
+
+    async def _load(self, sid):
+        data, refreshed_at = self.store.cached(sid)
+        if data is not None:
+            return data
+        return self.store.loaded(sid, await redis_client.get(self.store.session_key(sid)), refreshed_at)
+
+    async def _delete(self, sid, user_id):
+        async with redis_client.pipeline() as pipe:
+            self.store.add_delete(pipe, sid, user_id)
+            await pipe.execute()
+        self.store.forget([sid])
+
+    async def _save(self, sid, data):
+        async with redis_client.pipeline() as pipe:
+            self.store.add_save(pipe, sid, data)
+            await pipe.execute()
+        self.store.saved(sid, data)
+
+    async def _touch(self, sid, data):
+        if not self.store.needs_refresh(sid):
+            return
+        async with redis_client.pipeline() as pipe:
+            self.store.add_refresh(pipe, sid, data)
+            await pipe.execute()
+        self.store.refreshed(sid, data)
+
+    async def open_session(self, app, request):
+        token = request.cookies.get(self.get_cookie_name(app))
+        if not token:
+            return RedisSession()
+        try:
+            sid = self._signer(app).unsign(token).decode('ascii')
+        except BadSignature:
+            return RedisSession()
+        try:
+            data = await self._load(sid)
+        except Exception as e:
+            print(f"Redis session load error: {str(e)}")
+            self.store.count('errors')
+            session_obj = RedisSession()
+            session_obj.store_error = True
+            return session_obj
+        if data is None:
+            return RedisSession()
+        return RedisSession(data, sid=sid)
+
+    async def save_session(self, app, session_obj, response):
+        if response is None:
+            return
+        cookie_name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+        try:
+            if not session_obj:
+                if session_obj.sid is not None and session_obj.modified:
+                    await self._delete(session_obj.sid, session_obj.owner)
+                    response.delete_cookie(cookie_name, domain=domain, path=path)
+                return
+            if session_obj.modified or session_obj.sid is None:
+                if session_obj.sid is not None and session_obj.rotate:
+                    await self._delete(session_obj.sid, session_obj.owner)
+                    session_obj.sid = None
+                if session_obj.sid is None:
+                    session_obj.sid = uuid.uuid4().hex
+                await self._save(session_obj.sid, dict(session_obj))
+                token = self._signer(app).sign(session_obj.sid.encode('ascii')).decode('ascii')
+                response.set_cookie(
+                    cookie_name, token,
+                    max_age=self.store.ttl,
+                    domain=domain,
+                    path=path,
+                    httponly=self.get_cookie_httponly(app),
+                    secure=self.get_cookie_secure(app),
+                    samesite=self.get_cookie_samesite(app)
+                )
+            else:
+                await self._touch(session_obj.sid, dict(session_obj))
+        except Exception as e:
+            print(f"Redis session save error: {str(e)}")
+            self.store.count('errors')
+
+app.session_interface = AsyncRedisSessionInterface(session_store)
+
+# 로그인/관리자 권한 데코레이터 (응답 형식은 core.session_required - app.py와 공유)
+login_required = session_required(session)
+admin_required = session_required(session, admin=True)
+
+# 요청 속도 제한 (app.py와 같은 Redis 버킷/로컬 캐시, 스크립트만 비동기 클라이언트로 실행)
+rate_limit_script = None
+
+async def acquire_rate_limit(endpoint, subject):
+    global rate_limit_script
+    rule = rate_limiter.rule_for(endpoint)
+    if not rate_limiter.enabled or rule is None:
+        return True, 0
+    key = rate_limiter.bucket_key(endpoint, subject)
+    local = rate_limiter.check_local(key)
+    if local is not None:
+        return local
+    args = rate_limiter.script_args(key, rule)
+    try:
+        if rate_limit_script is None:
+            rate_limit_script = redis_client.register_script(RateLimiter.TOKEN_BUCKET_SCRIPT)
+        granted, retry_ms = await rate_limit_script(keys=[key], args=args)
+    except Exception as e:
+        return rate_limiter.fail_open(e)
+    return rate_limiter.apply(key, int(granted), int(retry_ms), refunded=args[3])
+
+@app.before_request
+async def enforce_request_limits():
+    if request.url_rule is None or request.method == 'OPTIONS' or request.path in RATE_LIMIT_EXEMPT:
+        return
+    endpoint = request.url_rule.rule
+    allowed, retry_after = await acquire_rate_limit(endpoint, rate_limit_subject(session, request.remote_addr))
+    if not allowed:
+        return rate_limited(retry_after)
+    if not concurrency_limiter.try_acquire(endpoint):
+        return concurrency_limited()
+    g._concurrency_endpoint = endpoint
+
+@app.teardown_request
+async def release_concurrency_slot(exc):
+    endpoint = g.pop('_concurrency_endpoint', None)
+    if endpoint is not None and endpoint in concurrency_limiter.limits:
+        concurrency_limiter.release(endpoint)
+
+@app.route('/ratelimit/stats', methods=['GET'])
+async def get_rate_limit_stats():
+    stats = rate_limiter.stats()
+    stats['concurrency'] = concurrency_limiter.stats()
+    return jsonify(stats)
+
+# write-behind 모드 (WRITE_BEHIND_ENABLED) - core.message_writer와 같은 스트림/대기 목록/재시도 키를 redis.asyncio로 기록
+# DB 저장은 core.message_writer의 writer 스레드가 그룹 커밋 (app_log flusher처럼 동기 클라이언트 사용)
+async def enqueue_pending_message(user_id, message, idempotency_key):
+    pending_id = message_writer.pending_id_for(user_id, idempotency_key)
+    if idempotency_key and await redis_client.exists(message_writer.idempotency_key(pending_id)):
+        return pending_id
+    async with redis_client.pipeline() as pipe:
+        row = message_writer.add_to_pipeline(pipe, user_id, message, pending_id, idempotent=bool(idempotency_key))
+        event_hub.publish('message', message_writer.pending_event(row), user_id=user_id, pipe=pipe)
+        await pipe.execute()
+    message_writer.enqueued()
+    return pending_id
+
+async def merge_pending_messages(user_id, messages):
+    pending = message_writer.parse_pending(await redis_client.hvals(message_writer.pending_key(user_id)))
+    return merge_pending_rows(pending, messages)
+
+# MariaDB 엔드포인트
+@app.route('/db/message', methods=['POST'])
+@login_required
+async def save_to_db():
+    user_id = session['user_id']
+    try:
+        data = await request.get_json()
+        # write-behind 모드: Redis 스트림에 넣고 바로 응답
+        if message_writer.enabled:
+            pending_id = await enqueue_pending_message(user_id, data['message'], request.headers.get('Idempotency-Key'))
+            log_event('db_insert_pending', f"Message queued: {data['message'][:30]}...")
+            async_log_api_stats('/db/message', 'POST', 'success', user_id)
+            return jsonify({"status": "pending", "pending_id": pending_id}), 202
+        created_at = datetime.now()
+        conn = await acquire_db()
+        try:
+            async with conn.cursor() as cursor:
+                await cursor.execute("INSERT INTO messages (user_id, message, created_at) VALUES (%s, %s, %s)",
+                                     (user_id, data['message'], created_at))
+                message_id = cursor.lastrowid
+                await cursor.execute(UPSERT_USER_STATS_SQL, (user_id, 1, created_at))
+            await conn.commit()
+        except Exception:
+            await conn.rollback()
+            raise
+        finally:
+            db_pool.release(conn)
+
+        await invalidate_message_cache(user_id)
+        await publish_event('message', {'id': message_id, 'user_id': user_id, 'message': data['message'],
+                                        'created_at': created_at}, user_id=user_id)
+        log_event('db_insert', f"Message saved: {data['message'][:30]}...")
+        async_log_api_stats('/db/message', 'POST', 'success', user_id)
+        return jsonify({"status": "success"})
+    except Exception as e:
+        async_log_api_stats('/db/message', 'POST', 'error', user_id)
+        log_event('db_insert_error', str(e), level='error')
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+# 메시지 대량 입력 - 청크마다 multi-row INSERT + 트랜잭션 1회 (app.py와 같은 요청/응답 형식)
+@app.route('/db/messages/bulk', methods=['POST'])
+@login_required
+async def save_bulk_to_db():
+    user_id = session['user_id']
+    try:
+        try:
+            messages, errors = parse_bulk_messages(request.mimetype or '', await request.get_data(as_text=True))
+        except ValueError as e:
+            return jsonify({"status": "error", "message": str(e)}), 400
+        if len(messages) > BULK_MAX_ITEMS:
+            return jsonify({"status": "error", "message": f"한 번에 최대 {BULK_MAX_ITEMS}개까지 입력할 수 있습니다"}), 413
+
+        results = [{"index": index, "status": "error", "message": errors[index]} if index in errors
+                   else {"index": index, "status": "success"} for index in range(len(messages))]
+        valid = [index for index, message in enumerate(messages) if message is not None]
+        inserted = 0
+
+        if valid:
+            sql = "INSERT INTO messages (user_id, message, created_at) VALUES (%s, %s, %s)"
+            conn = await acquire_db()
+            try:
+                async with conn.cursor() as cursor:
+                    for start in range(0, len(valid), BULK_INSERT_CHUNK_SIZE):
+                        chunk = valid[start:start + BULK_INSERT_CHUNK_SIZE]
+                        created_at = datetime.now()
+                        try:
+                            # aiomysql도 INSERT executemany를 multi-row VALUES 한 문장으로 전송
+                            await cursor.executemany(sql, [(user_id, messages[index], created_at) for index in chunk])
+                            await cursor.execute(UPSERT_USER_STATS_SQL, (user_id, len(chunk), created_at))
+                            await conn.commit()
+                            inserted += len(chunk)
+                        except Exception as chunk_error:
+                            await conn.rollback()
+                            for index in chunk:
+                                results[index] = {"index": index, "status": "error", "message": str(chunk_error)}
+            finally:
+                db_pool.release(conn)
+            if inserted:
+                await invalidate_message_cache(user_id)
+                # 건수만 알림 - 클라이언트가 첫 페이지를 다시 조회
+                await publish_event('messages_bulk', {'count': inserted}, user_id=user_id)
+
+        failed = len(messages) - inserted
+        status = 'success' if failed == 0 else ('partial' if inserted else 'error')
+        log_event('db_bulk_insert', f"Bulk insert: {inserted}/{len(messages)} messages saved")
+        async_log_api_stats('/db/messages/bulk', 'POST', status, user_id)
+        return jsonify({
+            "status": status,
+            "inserted": inserted,
+            "failed": failed,
+            "results": results
+        }), (200 if inserted or not messages else 400)
+    except Exception as e:
+        async_log_api_stats('/db/messages/bulk', 'POST', 'error', user_id)
+        log_event('db_bulk_insert_error', str(e), level='error')
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+@app.route('/db/messages', methods=['GET'])
+@login_required
+async def get_from_db():
+    user_id = session['user_id']
+    try:
+        try:
+            stream, stream_limit = get_stream_args(request.args)
+            limit, after = get_page_args(request.args)
+        except ValueError as e:
+            return jsonify({"status": "error", "message": str(e)}), 400
+        if stream:
+            # 전체 목록 스트리밍 (캐시/write-behind 대기 메시지 병합 없이 DB에서 직접)
+            response = await stream_query(*message_page_query(user_id, stream_limit, after, lookahead=0), stream)
+            async_log_api_stats('/db/messages', 'GET', 'success', user_id)
+            return response
+        messages, next_cursor = await get_message_page(user_id, limit, after, request.args.get('cursor'))
+        if message_writer.enabled and after is None:
+            messages = await merge_pending_messages(user_id, messages)
+        async_log_api_stats('/db/messages', 'GET', 'success', user_id)
+
+        response = jsonify(messages)
+        if next_cursor:
+            response.headers['X-Next-Cursor'] = next_cursor
+        return response
+    except Exception as e:
+        async_log_api_stats('/db/messages', 'GET', 'error', user_id)
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+# MariaDB 커넥션 풀 상태 조회
+@app.route('/db/pool/stats', methods=['GET'])
+async def get_db_pool_stats():
+    checkouts = db_checkout['checkouts']
+    return jsonify({
+        'size': db_pool.maxsize,
+        'created': db_pool.size,
+        'idle': db_pool.freesize,
+        'in_use': db_pool.size - db_pool.freesize,
+        'checkouts': checkouts,
+        'timeouts': db_checkout['timeouts'],
+        'checkout_latency_avg_ms': round(db_checkout['total'] / checkouts * 1000, 3) if checkouts else 0.0,
+        'checkout_latency_max_ms': round(db_checkout['max'] * 1000, 3)
+    })
+
+# 메시지 캐시 상태 조회
+@app.route('/db/cache/stats', methods=['GET'])
+async def get_message_cache_stats():
+    return jsonify(message_cache.stats())
+
+# write-behind 상태 조회 (스트림 길이는 redis.asyncio로 조회)
+@app.route('/db/write-behind/stats', methods=['GET'])
+async def get_write_behind_stats():
+    stats = message_writer.stats(stream_length=False)
+    try:
+        stats['stream_length'] = await redis_client.xlen(message_writer.STREAM)
+    except Exception:
+        stats['stream_length'] = None
+    return jsonify(stats)
+
+# 애플리케이션 로그 버퍼 상태 조회 (core.app_log를 그대로 사용 - flusher는 별도 스레드)
+@app.route('/logs/app/stats', methods=['GET'])
+async def get_app_log_stats():
+    return jsonify(app_log.stats())
+
+# Prometheus 스크레이프 엔드포인트
+@app.route('/metrics', methods=['GET'])
+async def get_metrics():
+    return Response(app_metrics.render(), mimetype='text/plain; version=0.0.4')
+
+# 비밀번호 해시 풀 상태 조회
+@app.route('/auth/hasher/stats', methods=['GET'])
+async def get_hasher_stats():
+    return jsonify(password_hasher.stats())
+
+# 세션 저장소 상태 조회
+@app.route('/session/stats', methods=['GET'])
+async def get_session_stats():
+    return jsonify(session_store.stats())
+
+# Kafka 로깅 큐 상태 조회
+@app.route('/logs/kafka/stats', methods=['GET'])
+async def get_kafka_log_stats():
+    stats = dict(log_counters)
+    stats['queue_depth'] = kafka_log_queue.qsize()
+    stats['queue_capacity'] = kafka_log_queue.maxsize
+    stats['backpressure'] = log_backpressure
+    stats['view'] = kafka_log_view.stats()
+    return jsonify(stats)
+
+# liveness / readiness (app.py와 같은 형식)
+@app.route('/healthz', methods=['GET'])
+async def healthz():
+    return jsonify({'status': 'ok'})
+
+@app.route('/readyz', methods=['GET'])
+async def readyz():
+    stats = warmup.stats()
+    stats['ready'] = warmup_seconds is not None
+    stats['seconds'] = round(warmup_seconds, 4) if warmup_seconds is not None else None
+    stats['dependencies'] = {name: breaker.state for name, breaker in breakers.items()}
+    if not stats['ready']:
+        response = jsonify(dict(stats, status='starting'))
+        response.headers['Retry-After'] = '1'
+        return response, 503
+    return jsonify(dict(stats, status='ready'))
+
+# 의존성 상태 조회 (app.py와 같은 형식)
+@app.route('/health/dependencies', methods=['GET'])
+async def get_dependency_health():
+    dependencies = {name: breaker.stats() for name, breaker in breakers.items()}
+    dependencies['kafka']['log_view'] = kafka_log_view.stats()
+    return jsonify({
+        'status': 'ok' if all(stats['state'] == 'closed' for stats in dependencies.values()) else 'degraded',
+        'dependencies': dependencies,
+        'fallback': fallback_cache.stats()
+    })
+
+# 실시간 이벤트 (app.py와 같은 Redis 채널/이벤트 형식) - 프로세스당 구독 태스크 1개가 연결별 asyncio 큐로 분배
+event_clients = set()  # (이벤트 큐, user_id, 관리자 여부)
+event_listener = None
+EVENTS_MAX_CLIENTS_ASYNC = int(os.getenv('EVENTS_MAX_CLIENTS_ASYNC', '1000'))
+
+async def publish_event(event_type, data, user_id=None):
+    if not event_hub.enabled:
+        return
+    try:
+        await redis_client.publish(event_hub.channel, event_hub.encode(event_type, data, user_id))
+        event_hub.count('published')
+    except Exception as e:
+        print(f"Event publish error: {str(e)}")
+        event_hub.count('errors')
+
+# 받을 클라이언트 선택/느린 클라이언트 resync 규칙은 event_hub.deliver와 공유
+def dispatch_event(event):
+    event_hub.deliver(event, list(event_clients))
+
+async def run_event_listener():
+    backoff = 1
+    while True:
+        pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(event_hub.channel)
+            backoff = 1
+            while True:
+                # listen()은 REDIS_SOCKET_TIMEOUT에 걸리므로 1초씩 대기하며 폴링
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                if message is not None and message['type'] == 'message':
+                    dispatch_event(json.loads(message['data']))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Event listener error: {str(e)}")
+            event_hub.count('errors')
+        finally:
+            try:
+                await pubsub.aclose()
+            except Exception:
+                pass
+        dispatch_event({'type': 'resync', 'data': None})
+        await asyncio.sleep(backoff)
+        backoff = min(backoff * 2, 30)
+
+@app.route('/events', methods=['GET'])
+@login_required
+async def stream_events():
+    global event_listener
+    if not event_hub.enabled:
+        return jsonify({"status": "error", "message": "실시간 이벤트가 비활성화되어 있습니다"}), 404
+    if len(event_clients) >= EVENTS_MAX_CLIENTS_ASYNC:
+        event_hub.count('rejected')
+        return concurrency_limited()
+    user_id = session['user_id']
+    client = (asyncio.Queue(maxsize=event_hub.queue_size), user_id, user_id == 'admin')
+    event_clients.add(client)
+    if event_listener is None or event_listener.done():
+        event_listener = asyncio.ensure_future(run_event_listener())
+
+    async def generate():
+        try:
+            yield 'retry: 3000\n\n'
+            deadline = time.monotonic() + EVENTS_MAX_DURATION
+            while time.monotonic() < deadline:
+                try:
+                    event = await asyncio.wait_for(client[0].get(), timeout=EVENTS_HEARTBEAT)
+                except asyncio.TimeoutError:
+                    yield ': keepalive\n\n'
+                    continue
+                yield f"event: {event['type']}\ndata: {json.dumps(event['data'])}\n\n"
+        finally:
+            event_clients.discard(client)
+
+    response = Response(generate(), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    response.timeout = None  # Quart 기본 응답 타임아웃 해제
+    return response
+
+@app.route('/events/stats', methods=['GET'])
+async def get_event_stats():
+    stats = event_hub.stats()
+    stats['clients'] = len(event_clients)
+    stats['max_clients'] = EVENTS_MAX_CLIENTS_ASYNC
+    return jsonify(stats)
+
+# Redis 로그 조회
+@app.route('/logs/redis', methods=['GET'])
+async def get_redis_logs():
+    try:
+        logs = [json.loads(log) for log in await redis_client.lrange('api_logs', 0, -1)]
+        fallback_cache.set('redis_logs', logs)
+        return jsonify(logs)
+    except Exception as e:
+        # Redis 장애 중에는 마지막으로 조회한 로그 스냅샷으로 응답
+        cached = fallback_cache.get('redis_logs')
+        if cached is not None:
+            logs, age = cached
+            response = jsonify(logs)
+            response.headers['Age'] = str(int(age))
+            response.headers['Warning'] = '110 - "Response is Stale"'
+            return response
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+# 회원가입 엔드포인트
+@app.route('/register', methods=['POST'])
+async def register():
+    try:
+        data = await request.get_json()
+        username = data.get('username')
+        password = data.get('password')
+
+        if not username or not password:
+            return jsonify({"status": "error", "message": "사용자명과 비밀번호는 필수입니다"}), 400
+
+        # 중복 체크와 비밀번호 해시화(CPU 작업 - 프로세스 풀)를 동시에 수행
+        try:
+            hash_future = asyncio.wrap_future(password_hasher.submit_hash(password))
+        except HasherBusyError:
+            return hasher_unavailable()
+        try:
+            existing, hashed_password = await asyncio.gather(
+                db_fetchone("SELECT username FROM users WHERE username = %s", (username,)),
+                asyncio.wait_for(hash_future, password_hasher.timeout)
+            )
+        except asyncio.TimeoutError:
+            return hasher_unavailable()
+        if existing:
+            return jsonify({"status": "error", "message": "이미 존재하는 사용자명입니다"}), 400
+
+        conn = await acquire_db()
+        try:
+            async with conn.cursor() as cursor:
+                await cursor.execute("INSERT INTO users (username, password) VALUES (%s, %s)", (username, hashed_password))
+            await conn.commit()
+        finally:
+            db_pool.release(conn)
+
+        return jsonify({"status": "success", "message": "회원가입이 완료되었습니다"})
+    except Exception as e:
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+# 로그인 성공 시 해시 비용이 현재 설정과 다르면 새 해시로 교체 (실패해도 로그인은 계속)
+async def upgrade_password_hash(username, old_hash, new_hash):
+    try:
+        conn = await acquire_db()
+        try:
+            async with conn.cursor() as cursor:
+                await cursor.execute("UPDATE users SET password = %s WHERE username = %s AND password = %s",
+                                     (new_hash, username, old_hash))
+            await conn.commit()
+        finally:
+            db_pool.release(conn)
+    except Exception as e:
+        print(f"Password rehash error: {str(e)}")
+
+# 로그인 세션 시작 (Redis 세션 저장소에 기록, 세션 ID 재발급)
+def start_session(user_id, is_admin=False):
+    session.clear()
+    session['user_id'] = user_id
+    if is_admin:
+        session['is_admin'] = True
+    session['login_time'] = datetime.now().isoformat()
+    session.rotate = True
+
+# 로그인 엔드포인트
+@app.route('/login', methods=['POST'])
+async def login():
+    try:
+        data = await request.get_json()
+        username = data.get('username')
+        password = data.get('password')
+
+        if not username or not password:
+            return jsonify({"status": "error", "message": "사용자명과 비밀번호는 필수입니다"}), 400
+
+        # 관리자 계정 확인 (환경변수 사용)
+        admin_username = os.getenv('ADMIN_USERNAME', 'admin')
+        admin_password = os.getenv('ADMIN_PASSWORD', 'admin')
+        if username == admin_username and password == admin_password:
+            start_session('admin', is_admin=True)
+            return jsonify({
+                "status": "success",
+                "message": "관리자 로그인 성공",
+                "username": "admin",
+                "is_admin": True
+            })
+
+        # 일반 사용자 로그인
+        user = await db_fetchone("SELECT * FROM users WHERE username = %s", (username,))
+        if not user:
+            return jsonify({"status": "error", "message": "잘못된 인증 정보"}), 401
+        try:
+            valid, new_hash = await asyncio.wait_for(
+                asyncio.wrap_future(password_hasher.submit_verify(user['password'], password)),
+                password_hasher.timeout
+            )
+        except (HasherBusyError, asyncio.TimeoutError):
+            return hasher_unavailable()
+        if valid:
+            if new_hash:
+                await upgrade_password_hash(username, user['password'], new_hash)
+            start_session(username)
+            return jsonify({
+                "status": "success",
+                "message": "로그인 성공",
+                "username": username,
+                "is_admin": False
+            })
+
+        return jsonify({"status": "error", "message": "잘못된 인증 정보"}), 401
+
+    except Exception as e:
+        print(f"Login error: {str(e)}")
+        return jsonify({"status": "error", "message": "로그인 처리 중 오류가 발생했습니다"}), 500
+
+# 로그아웃 엔드포인트
+@app.route('/logout', methods=['POST'])
+async def logout():
+    try:
+        # 세션을 비우면 응답 시 Redis 세션과 쿠키가 함께 삭제됨
+        if 'user_id' in session:
+            session.clear()
+        return jsonify({"status": "success", "message": "로그아웃 성공"})
+    except Exception as e:
+        print(f"로그아웃 오류: {e}")
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+# core.run_search와 같음 - FULLTEXT 인덱스가 없을 때만 LIKE 검색으로 다시 실행
+async def run_search(search):
+    try:
+        return await search(True)
+    except Exception as e:
+        if not is_fulltext_index_missing(e):
+            raise
+        print("⚠️ ft_message FULLTEXT 인덱스가 없어 LIKE 검색으로 대체합니다 (flask --app app migrate-db)")
+        return await search(False)
+
+# 메시지 검색 (FULLTEXT 인덱스 관련도 검색, 짧은 검색어는 LIKE 검색)
+@app.route('/db/messages/search', methods=['GET'])
+@login_required
+async def search_messages():
+    user_id = session['user_id']
+    try:
+        query = request.args.get('q', '').strip()
+        try:
+            stream, stream_limit = get_stream_args(request.args)
+            limit = get_limit_arg(request.args)
+            offset = int(request.args.get('offset', 0))
+        except ValueError as e:
+            return jsonify({"status": "error", "message": str(e)}), 400
+        if offset < 0 or offset > SEARCH_MAX_OFFSET:
+            return jsonify({"status": "error", "message": f"offset은 0~{SEARCH_MAX_OFFSET} 범위여야 합니다"}), 400
+        if stream:
+            response = await run_search(lambda fulltext: stream_query(
+                *search_query(user_id, query, stream_limit, offset, lookahead=0, fulltext=fulltext), stream))
+            async_log_api_stats('/db/messages/search', 'GET', 'success', user_id)
+            return response
+
+        rows = await run_search(lambda fulltext: db_fetchall(*search_query(user_id, query, limit, offset, fulltext=fulltext)))
+        results, next_offset = split_offset_page(rows, limit, offset)
+        async_log_api_stats('/db/messages/search', 'GET', 'success', user_id)
+
+        response = jsonify(results)
+        if next_offset is not None:
+            response.headers['X-Next-Offset'] = str(next_offset)
+        return response
+    except Exception as e:
+        async_log_api_stats('/db/messages/search', 'GET', 'error', user_id)
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+# Redis 백업 로그(api_stats)를 Kafka 로그 형식으로 변환
+async def redis_backup_api_stats():
+    api_stats_logs = []
+    for log_str in await redis_client.lrange('api_logs', 0, -1):
+        try:
+            log_data = json.loads(log_str)
+        except ValueError:
+            continue
+        if log_data.get('action') == 'api_stats':
+            api_stats_logs.append({
+                'developer_tag': DEVELOPER_TAG,
+                'timestamp': log_data.get('timestamp'),
+                'endpoint': 'unknown',
+                'method': 'unknown',
+                'status': 'success',
+                'user_id': 'unknown',
+                'message': log_data.get('details', '')
+            })
+    api_stats_logs.sort(key=lambda x: x['timestamp'], reverse=True)
+    return api_stats_logs
+
+# Kafka 로그 조회 엔드포인트 (app.py와 같은 파드별 로그 뷰에서 조회, 비어 있으면 Redis 백업)
+@app.route('/logs/kafka', methods=['GET'])
+@login_required
+async def get_kafka_logs():
+    try:
+        try:
+            limit = max(1, min(int(request.args.get('limit', 100)), kafka_log_view.size))
+            since = parse_log_time(request.args['since']) if request.args.get('since') else None
+            until = parse_log_time(request.args['until']) if request.args.get('until') else None
+        except ValueError as e:
+            return jsonify({"status": "error", "message": str(e)}), 400
+
+        logs = kafka_log_view.query(
+            endpoint=request.args.get('endpoint'),
+            user_id=request.args.get('user_id'),
+            status=request.args.get('status'),
+            since=since,
+            until=until,
+            limit=limit
+        )
+        if logs or not kafka_log_view.is_empty():
+            return jsonify(logs)
+
+        print("Kafka 로그 뷰가 비어 있어 Redis 백업을 확인합니다.")
+        return jsonify((await redis_backup_api_stats())[:limit])
+    except Exception as e:
+        print(f"Kafka log retrieval error: {str(e)}")
+        return jsonify({"status": "error", "message": "Kafka와 Redis 모두에서 로그를 가져올 수 없습니다."}), 500
+
+# 관리자 전용 - 사용자 목록 조회 (페이지 단위)
+@app.route('/admin/users', methods=['GET'])
+@admin_required
+async def get_all_users():
+    try:
+        try:
+            stream, stream_limit = get_stream_args(request.args)
+            limit, after = get_page_args(request.args)
+        except ValueError as e:
+            return jsonify({"status": "error", "message": str(e)}), 400
+        if stream:
+            # 사용자 배열만 전송 (첫 요청이면 관리자를 맨 앞에)
+            async def admin_row(cursor):
+                await cursor.execute(USER_STATS_SQL, ('admin',))
+                admin_stats = await cursor.fetchone()
+                await cursor.fetchall()
+                return [admin_user_info(admin_stats)]
+            response = await stream_query(*user_page_query(stream_limit, after, lookahead=0), stream,
+                                          head=admin_row if after is None else None)
+            async_log_api_stats('/admin/users', 'GET', 'success', 'admin')
+            return response
+
+        # 사용자 페이지와 관리자 통계를 동시에 조회
+        if after is None:
+            rows, admin_stats = await asyncio.gather(
+                db_fetchall(*user_page_query(limit, after)),
+                db_fetchone(USER_STATS_SQL, ('admin',))
+            )
+        else:
+            rows, admin_stats = await db_fetchall(*user_page_query(limit, after)), None
+        users, next_cursor = split_keyset_page(rows, limit)
+        all_users = [admin_user_info(admin_stats)] + users if after is None else users
+
+        async_log_api_stats('/admin/users', 'GET', 'success', 'admin')
+        return jsonify({
+            "status": "success",
+            "users": all_users,
+            "total_count": len(all_users),
+            "next_cursor": next_cursor
+        })
+    except Exception as e:
+        async_log_api_stats('/admin/users', 'GET', 'error', 'admin')
+        print(f"Admin users list error: {str(e)}")
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+# 관리자 전용 - 특정 사용자의 모든 세션 강제 종료
+@app.route('/admin/users/<username>/sessions', methods=['DELETE'])
+@admin_required
+async def revoke_user_sessions(username):
+    try:
+        sids = list(await redis_client.smembers(session_store.user_key(username)))
+        async with redis_client.pipeline() as pipe:
+            session_store.add_revoke(pipe, username, sids)
+            await pipe.execute()
+        revoked = session_store.revoked(sids)
+        async_log_api_stats(f'/admin/users/{username}/sessions', 'DELETE', 'success', 'admin')
+        return jsonify({"status": "success", "username": username, "revoked": revoked})
+    except Exception as e:
+        async_log_api_stats(f'/admin/users/{username}/sessions', 'DELETE', 'error', 'admin')
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+# 관리자 전용 - 특정 사용자의 메시지 조회 (키셋 페이지네이션)
+@app.route('/admin/users/<username>/messages', methods=['GET'])
+@admin_required
+async def get_user_messages(username):
+    try:
+        try:
+            stream, stream_limit = get_stream_args(request.args)
+            limit, after = get_page_args(request.args)
+        except ValueError as e:
+            return jsonify({"status": "error", "message": str(e)}), 400
+        if stream:
+            # 메시지 배열만 전송
+            response = await stream_query(*message_page_query(username, stream_limit, after, lookahead=0), stream)
+            async_log_api_stats(f'/admin/users/{username}/messages', 'GET', 'success', 'admin')
+            return response
+        # 메시지 페이지와 전체 메시지 수(user_stats)를 동시에 조회
+        (messages, next_cursor), stats = await asyncio.gather(
+            get_message_page(username, limit, after, request.args.get('cursor')),
+            db_fetchone(USER_STATS_SQL, (username,))
+        )
+        async_log_api_stats(f'/admin/users/{username}/messages', 'GET', 'success', 'admin')
+        return jsonify({
+            "status": "success",
+            "username": username,
+            "messages": messages,
+            "message_count": stats['message_count'] if stats else 0,  # 페이지가 아닌 전체 메시지 수
+            "next_cursor": next_cursor
+        })
+    except Exception as e:
+        async_log_api_stats(f'/admin/users/{username}/messages', 'GET', 'error', 'admin')
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+# 개발용 실행 (운영은 hypercorn app_async:app --bind 0.0.0.0:5000 --workers N)
+if __name__ == '__main__':
+    app.run(host='0.0.0.0', port=5000, debug=os.getenv('FLASK_DEBUG', 'false').lower() == 'true')
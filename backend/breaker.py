@@ -0,0 +1,153 @@
+# 의존성별 서킷 브레이커
+# 연속 실패가 failure_threshold번이면 open - reset_timeout 동안은 호출하지 않고 바로 CircuitOpenError
+# 이후 half_open 상태에서 probe 요청 half_open_max개만 통과시켜 성공하면 closed, 실패하면 다시 open
+# (probe가 reset_timeout 안에 결과를 기록하지 않으면 다른 요청에 probe 자리를 다시 줌)
+import threading
+import time
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+class CircuitOpenError(Exception):
+    """브레이커가 열려 있어 호출하지 않은 경우 (호출 측에서 503 + Retry-After)"""
+    def __init__(self, name, retry_after):
+        super().__init__(f"{name} 일시적으로 사용할 수 없습니다 ({retry_after:.1f}초 후 재시도)")
+        self.name = name
+        self.retry_after = retry_after
+
+class CircuitBreaker:
+    def __init__(self, name, failure_threshold, reset_timeout, half_open_max=1, on_reject=None):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max = half_open_max
+        self.on_reject = on_reject  # check()가 CircuitOpenError를 던지기 전에 호출
+        self._state = CLOSED
+        self._failures = 0  # 연속 실패 수
+        self._opened_at = 0.0
+        self._probes = 0  # half_open 상태에서 진행 중인 probe 수
+        self._probe_started = 0.0
+        self._last_error = None
+        self._lock = threading.Lock()
+        self._counters = {'successes': 0, 'failures': 0, 'rejected': 0, 'opened': 0}
+
+    def allow(self):
+        """호출해도 되면 True (half_open이면 probe 자리를 차지)"""
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            now = time.monotonic()
+            if self._state == OPEN:
+                if now - self._opened_at < self.reset_timeout:
+                    self._counters['rejected'] += 1
+                    return False
+                self._state = HALF_OPEN
+                self._probes = 0
+            if self._probes >= self.half_open_max and now - self._probe_started > self.reset_timeout:
+                self._probes = 0
+            if self._probes < self.half_open_max:
+                self._probes += 1
+                self._probe_started = now
+                return True
+            self._counters['rejected'] += 1
+            return False
+
+    def check(self):
+        """allow()가 False면 CircuitOpenError"""
+        if not self.allow():
+            error = CircuitOpenError(self.name, self.retry_after())
+            if self.on_reject is not None:
+                self.on_reject(error)
+            raise error
+
+    def call(self, failures, fn, *args, **kwargs):
+        """check() 후 fn 호출 - failures 예외만 장애로 기록 (그 외 예외는 의존성이 응답한 것이므로 성공)"""
+        self.check()
+        try:
+            result = fn(*args, **kwargs)
+        except failures as e:
+            self.record_failure(e)
+            raise
+        except Exception:
+            self.record_success()
+            raise
+        self.record_success()
+        return result
+
+    def retry_after(self):
+        """open이면 half_open까지 남은 초, half_open이면 probe 결과를 기다리는 동안 1초"""
+        with self._lock:
+            if self._state == CLOSED:
+                return 0.0
+            if self._state == HALF_OPEN:
+                return 1.0
+            return max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+
+    def record_success(self):
+        with self._lock:
+            self._counters['successes'] += 1
+            self._failures = 0
+            if self._state == HALF_OPEN:
+                self._state = CLOSED
+
+    def record_failure(self, error=None):
+        with self._lock:
+            self._counters['failures'] += 1
+            self._failures += 1
+            if error is not None:
+                self._last_error = str(error)
+            if self._state == HALF_OPEN or (self._state == CLOSED and self._failures >= self.failure_threshold):
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+                self._counters['opened'] += 1
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+            stats['state'] = self._state
+            stats['consecutive_failures'] = self._failures
+            stats['last_error'] = self._last_error
+            if self._state == OPEN:
+                stats['retry_after'] = round(max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at)), 3)
+        return stats
+
+class FallbackCache:
+    """키별 마지막 정상 결과 - 의존성 장애 중에는 max_age초 이내의 결과를 대신 반환"""
+    def __init__(self, max_age):
+        self.max_age = max_age
+        self._values = {}  # key -> (저장 시각, 값)
+        self._lock = threading.Lock()
+        self._counters = {'stored': 0, 'served': 0, 'misses': 0}
+
+    def _count(self, key, n=1):
+        with self._lock:
+            self._counters[key] += n
+
+    def set(self, key, value):
+        with self._lock:
+            self._values[key] = (time.monotonic(), value)
+            self._counters['stored'] += 1
+
+    def get(self, key):
+        """(값, 경과 초) 또는 None"""
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None or time.monotonic() - entry[0] > self.max_age:
+                self._counters['misses'] += 1
+                return None
+            self._counters['served'] += 1
+            return entry[1], time.monotonic() - entry[0]
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+            now = time.monotonic()
+            stats['keys'] = {key: round(now - stored_at, 3) for key, (stored_at, _) in self._values.items()}
+        stats['max_age'] = self.max_age
+        return stats
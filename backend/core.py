@@ -0,0 +1,2295 @@
+# app.py(Flask, gunicorn)와 app_async.py(Quart, hypercorn)가 공유하는 컴포넌트
+# 설정, 메트릭, 서킷 브레이커, MariaDB/Redis 풀, 로그 큐, 실시간 이벤트, 세션 저장소, 속도 제한, 캐시, write-behind, SQL 헬퍼
+# Flask 앱을 만들지 않으므로 hypercorn 프로세스에서 import해도 Flask 앱/라우트/OpenTelemetry 계측이 초기화되지 않음
+import os
+import time
+import redis
+from redis.backoff import NoBackoff
+from redis.retry import Retry
+import mysql.connector
+import json
+from datetime import datetime
+import pytz
+import inspect
+from functools import wraps
+from flask.json.provider import DefaultJSONProvider
+from passwords import PasswordHasher
+from metrics import MetricsRegistry
+from logcodec import ApiStatsCodec, api_stats_message
+from breaker import CircuitBreaker, CircuitOpenError, FallbackCache
+from threading import Thread
+import threading
+import queue
+import asyncio
+import atexit
+import base64
+import random
+import math
+from collections import deque
+import hashlib
+import socket
+import uuid
+
+# 응답 JSON과 같은 규칙으로 직렬화 (datetime은 HTTP 날짜 형식) - 실시간 이벤트/캐시 페이로드용
+json_default = DefaultJSONProvider.default
+
+# 브라우저 요청은 ingress → frontend nginx(/api/)를 거쳐 들어오므로 remote_addr는 항상 nginx 파드 IP
+# X-Forwarded-For에서 프록시 TRUSTED_PROXY_HOPS개가 붙인 값만 믿고 그 앞의 클라이언트 IP를 remote_addr로 사용 (0이면 사용 안 함)
+TRUSTED_PROXY_HOPS = int(os.getenv('TRUSTED_PROXY_HOPS', '2'))
+
+# 요청/의존성별 지연 시간 메트릭 (GET /metrics - Prometheus 형식)
+app_metrics = MetricsRegistry(
+    snapshot_dir=os.getenv('METRICS_DIR') or None,
+    snapshot_interval=float(os.getenv('METRICS_SNAPSHOT_INTERVAL', '5'))
+)
+app_metrics.histogram('backend_http_request_duration_seconds', 'HTTP 요청 처리 시간 (endpoint, method)')
+app_metrics.counter('backend_http_requests_total', 'HTTP 요청 수 (endpoint, method, status)')
+app_metrics.gauge('backend_http_requests_in_flight', '처리 중인 HTTP 요청 수 (endpoint)')
+app_metrics.histogram('backend_dependency_duration_seconds', '의존성 호출 시간 (dependency, operation)')
+app_metrics.counter('backend_dependency_errors_total', '의존성 호출 오류 수 (dependency, operation)')
+
+def observe_dependency(dependency, operation, start, error=False):
+    labels = (('dependency', dependency), ('operation', operation))
+    app_metrics.observe('backend_dependency_duration_seconds', labels, time.perf_counter() - start)
+    if error:
+        app_metrics.inc('backend_dependency_errors_total', labels)
+
+# SSE(/events)는 연결이 오래 유지되므로 지연 시간/처리 중 요청 수에서 제외 (HPA 지표 왜곡 방지), 헬스 프로브도 제외
+REQUEST_METRICS_EXEMPT = {'/metrics', '/events', '/healthz', '/readyz'}
+
+# 의존성별 서킷 브레이커 - 연속 BREAKER_FAILURE_THRESHOLD번 연결 장애가 나면 BREAKER_RESET_TIMEOUT초 동안
+# 호출하지 않고 바로 CircuitOpenError (요청은 타임아웃을 기다리지 않고 503 + Retry-After 또는 캐시된 결과로 응답)
+# 요청 처리 중 열린 브레이커를 만났을 때 기록하는 on_reject는 각 앱이 설정 (app.py의 note_circuit_open)
+breakers = {
+    name: CircuitBreaker(
+        name,
+        failure_threshold=int(os.getenv('BREAKER_FAILURE_THRESHOLD', '5')),
+        reset_timeout=float(os.getenv('BREAKER_RESET_TIMEOUT', '10'))
+    )
+    for name in ('mariadb', 'redis', 'kafka')
+}
+db_breaker = breakers['mariadb']
+redis_breaker = breakers['redis']
+kafka_breaker = breakers['kafka']
+
+# 연결 장애로 보는 예외 (SQL 오류/Redis 명령 오류는 의존성이 응답한 것이므로 제외)
+DB_FAILURES = (mysql.connector.errors.OperationalError, mysql.connector.errors.InterfaceError, OSError)
+REDIS_FAILURES = (redis.ConnectionError, redis.TimeoutError)
+
+# 장애 중 응답용 마지막 정상 결과 (예: Redis 로그 스냅샷) - FALLBACK_MAX_AGE초보다 오래된 결과는 쓰지 않음
+fallback_cache = FallbackCache(max_age=float(os.getenv('FALLBACK_MAX_AGE', '600')))
+
+# MariaDB 커넥션 풀 대기 시간 초과 예외
+class PoolTimeoutError(Exception):
+    pass
+
+# 쿼리 시간 측정용 커서 래퍼 (operation은 SQL 첫 단어 - select/insert/update/delete)
+class TimedCursor:
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def _timed(self, operation, fn, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            result = db_breaker.call(DB_FAILURES, fn, *args, **kwargs)
+        except CircuitOpenError:
+            raise
+        except Exception:
+            observe_dependency('mariadb', operation, start, error=True)
+            raise
+        observe_dependency('mariadb', operation, start)
+        return result
+
+    def execute(self, sql, *args, **kwargs):
+        return self._timed(sql.split(None, 1)[0].lower(), self._cursor.execute, sql, *args, **kwargs)
+
+    def executemany(self, sql, *args, **kwargs):
+        return self._timed(sql.split(None, 1)[0].lower(), self._cursor.executemany, sql, *args, **kwargs)
+
+    def fetchone(self):
+        return self._timed('fetch', self._cursor.fetchone)
+
+    def fetchall(self):
+        return self._timed('fetch', self._cursor.fetchall)
+
+    def fetchmany(self, *args, **kwargs):
+        return self._timed('fetch', self._cursor.fetchmany, *args, **kwargs)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+# 풀에서 빌려준 커넥션 래퍼 (close() 호출 시 실제로 닫지 않고 풀에 반납)
+class PooledDBConnection:
+    def __init__(self, pool, conn):
+        self._pool = pool
+        self._conn = conn
+
+    def cursor(self, *args, **kwargs):
+        return TimedCursor(self._conn.cursor(*args, **kwargs))
+
+    def commit(self):
+        start = time.perf_counter()
+        try:
+            db_breaker.call(DB_FAILURES, self._conn.commit)
+        except CircuitOpenError:
+            raise
+        except Exception:
+            observe_dependency('mariadb', 'commit', start, error=True)
+            raise
+        observe_dependency('mariadb', 'commit', start)
+
+    def close(self, discard=False):
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            self._pool.release(conn, discard)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+# MariaDB 커넥션 풀 (크기 제한, 체크아웃 시 헬스체크, 최대 유휴 시간, 대기 타임아웃)
+class DBConnectionPool:
+    def __init__(self, size, timeout, max_idle, ping_interval, **connect_kwargs):
+        self.size = size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.ping_interval = ping_interval
+        self._connect_kwargs = connect_kwargs
+        self._cond = threading.Condition()
+        self._idle = []  # (connection, 마지막 반납 시각) - LIFO로 최근 커넥션 재사용
+        self._created = 0
+        self._in_use = 0
+        self._waiting = 0
+        self._checkouts = 0
+        self._timeouts = 0
+        self._discarded = 0
+        self._checkout_time_total = 0.0
+        self._checkout_time_max = 0.0
+
+    def _connect(self):
+        # 새 연결 실패는 종류와 관계없이 장애로 기록 (브레이커가 열려 있으면 연결을 시도하지 않음)
+        return db_breaker.call(Exception, mysql.connector.connect, **self._connect_kwargs)
+
+    def _close_quietly(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def acquire(self):
+        start = time.monotonic()
+        deadline = start + self.timeout
+        conn, last_used = None, None
+        with self._cond:
+            while True:
+                if self._idle:
+                    conn, last_used = self._idle.pop()
+                    break
+                if self._created < self.size:
+                    self._created += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeoutError(f"DB 커넥션 풀 대기 시간 초과 ({self.timeout}s, size={self.size})")
+                self._waiting += 1
+                try:
+                    self._cond.wait(remaining)
+                finally:
+                    self._waiting -= 1
+            self._in_use += 1
+
+        # 네트워크 작업(헬스체크/연결)은 락 밖에서 수행 - 버린 커넥션 수는 락을 잡을 때 함께 반영
+        discarded = 0
+        try:
+            if conn is not None:
+                idle_for = time.monotonic() - last_used
+                if idle_for > self.max_idle:
+                    self._close_quietly(conn)
+                    conn = None
+                    discarded = 1
+                elif idle_for > self.ping_interval:
+                    try:
+                        conn.ping(reconnect=True, attempts=1, delay=0)
+                    except Exception:
+                        self._close_quietly(conn)
+                        conn = None
+                        discarded = 1
+            if conn is None:
+                conn = self._connect()
+        except Exception:
+            with self._cond:
+                self._in_use -= 1
+                self._created -= 1
+                self._discarded += discarded
+                self._cond.notify()
+            raise
+
+        elapsed = time.monotonic() - start
+        app_metrics.observe('backend_dependency_duration_seconds', (('dependency', 'mariadb'), ('operation', 'checkout')), elapsed)
+        with self._cond:
+            self._checkouts += 1
+            self._discarded += discarded
+            self._checkout_time_total += elapsed
+            self._checkout_time_max = max(self._checkout_time_max, elapsed)
+        return PooledDBConnection(self, conn)
+
+    def prefill(self, count):
+        """커넥션을 최대 count개(풀 크기 이하)까지 미리 연결해 유휴 목록에 넣고 연결 수 반환 (기동 준비 단계용)"""
+        conns = []
+        try:
+            for _ in range(min(count, self.size)):
+                conns.append(self.acquire())
+        finally:
+            for conn in conns:
+                conn.close()
+        return len(conns)
+
+    def release(self, conn, discard=False):
+        try:
+            # 커밋되지 않은 트랜잭션은 롤백 후 반납 (discard면 재사용하지 않고 닫음)
+            if not discard and conn.in_transaction:
+                conn.rollback()
+        except Exception:
+            discard = True
+        with self._cond:
+            self._in_use -= 1
+            if discard:
+                self._created -= 1
+                self._discarded += 1
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+        if discard:
+            self._close_quietly(conn)
+
+    def stats(self):
+        with self._cond:
+            return {
+                'size': self.size,
+                'created': self._created,
+                'idle': len(self._idle),
+                'in_use': self._in_use,
+                'waiting': self._waiting,
+                'checkouts': self._checkouts,
+                'timeouts': self._timeouts,
+                'discarded': self._discarded,
+                'checkout_latency_avg_ms': round(self._checkout_time_total / self._checkouts * 1000, 3) if self._checkouts else 0.0,
+                'checkout_latency_max_ms': round(self._checkout_time_max * 1000, 3)
+            }
+
+# 프로세스 전역 MariaDB 커넥션 풀 (첫 요청 시점에 연결 생성)
+# 이 모듈의 헬퍼는 db_pool.acquire()로 직접 빌리고 finally에서 반납 (app.py의 get_db_connection은 요청 종료 시 자동 반납을 추가)
+db_pool = DBConnectionPool(
+    size=int(os.getenv('DB_POOL_SIZE', '10')),
+    timeout=float(os.getenv('DB_POOL_TIMEOUT', '5')),
+    max_idle=float(os.getenv('DB_POOL_MAX_IDLE', '300')),
+    ping_interval=float(os.getenv('DB_POOL_PING_INTERVAL', '30')),
+    host=os.getenv('MYSQL_HOST', 'my-mariadb'),
+    user=os.getenv('MYSQL_USER', 'testuser'),
+    password=os.getenv('MYSQL_PASSWORD'),
+    database="testdb",
+    # 연결 타임아웃 - mysql-connector는 이 값을 연결 후 소켓 읽기/쓰기 타임아웃으로도 사용
+    connect_timeout=int(os.getenv('DB_CONNECT_TIMEOUT', '5'))
+)
+
+# redis-py 기본 재시도(지수 백오프 3회, 장애 시 명령당 수 초)를 대신해 끊긴 연결만 바로 REDIS_RETRIES번 재시도
+# 타임아웃은 재시도하지 않음 - 장애 중에는 REDIS_SOCKET_TIMEOUT 안에 실패하고 서킷 브레이커가 열림
+def redis_retry():
+    return Retry(NoBackoff(), int(os.getenv('REDIS_RETRIES', '1')), supported_errors=(redis.ConnectionError,))
+
+# 프로세스 전역 Redis 커넥션 풀 (소켓 재사용, 최대 연결 수 제한)
+redis_pool = redis.ConnectionPool(
+    host=os.getenv('REDIS_HOST', 'my-redis-master'),
+    port=6379,
+    password=os.getenv('REDIS_PASSWORD'),
+    decode_responses=True,
+    db=0,
+    max_connections=int(os.getenv('REDIS_POOL_SIZE', '20')),
+    # 짧은 연결/읽기 타임아웃 - 읽기 타임아웃은 write-behind XREADGROUP 대기(1초)보다 길어야 함
+    socket_connect_timeout=float(os.getenv('REDIS_CONNECT_TIMEOUT', '1')),
+    socket_timeout=float(os.getenv('REDIS_SOCKET_TIMEOUT', '2')),
+    retry=redis_retry()
+)
+# Redis 명령/파이프라인 시간 측정 + 서킷 브레이커
+class TimedRedis(redis.Redis):
+    def execute_command(self, *args, **options):
+        start = time.perf_counter()
+        try:
+            result = redis_breaker.call(REDIS_FAILURES, super().execute_command, *args, **options)
+        except CircuitOpenError:
+            raise
+        except Exception:
+            observe_dependency('redis', str(args[0]).lower(), start, error=True)
+            raise
+        observe_dependency('redis', str(args[0]).lower(), start)
+        return result
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        return TimedPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
+
+class TimedPipeline(redis.client.Pipeline):
+    def execute(self, raise_on_error=True):
+        start = time.perf_counter()
+        try:
+            result = redis_breaker.call(REDIS_FAILURES, super().execute, raise_on_error)
+        except CircuitOpenError:
+            raise
+        except Exception:
+            observe_dependency('redis', 'pipeline', start, error=True)
+            raise
+        observe_dependency('redis', 'pipeline', start)
+        return result
+
+redis_client_shared = TimedRedis(connection_pool=redis_pool)
+
+# Redis 연결 함수 (공유 클라이언트 반환 - 호출 측에서 close() 하지 않음)
+def get_redis_connection():
+    return redis_client_shared
+
+# api_logs 리스트에 로그 추가 + 최근 100개만 유지 (여러 개도 파이프라인으로 1회 왕복)
+def push_api_log(redis_client, *log_entries):
+    pipe = redis_client.pipeline()
+    pipe.lpush('api_logs', *[json.dumps(log_entry) for log_entry in log_entries])
+    pipe.ltrim('api_logs', 0, 99)  # 최근 100개 로그만 유지
+    event_hub.publish('app_logs', list(log_entries), pipe=pipe)
+    pipe.execute()
+
+# Kafka Producer 설정 (SASL_PLAINTEXT 인증) - 값은 KafkaLogQueue가 직렬화한 bytes, 배치 단위 압축
+def get_kafka_producer():
+    # kafka-python은 import가 무거우므로 (수십~100ms) 백그라운드 워커/기동 준비 단계에서 처음 쓸 때 import
+    from kafka import KafkaProducer
+    return KafkaProducer(
+        bootstrap_servers=os.getenv('KAFKA_SERVERS', 'team-kafka.default.svc.cluster.local:9092'),
+        compression_type=KAFKA_COMPRESSION,
+        security_protocol='SASL_PLAINTEXT',
+        sasl_mechanism='PLAIN',
+        sasl_plain_username=os.getenv('KAFKA_USERNAME', 'user1'),
+        sasl_plain_password=os.getenv('KAFKA_PASSWORD', 'password'),
+        linger_ms=int(os.getenv('KAFKA_LINGER_MS', '50')),
+        batch_size=int(os.getenv('KAFKA_BATCH_SIZE', '16384')),
+        # 브로커 장애 시 send()가 메타데이터를 기다리며 막히는 시간과 요청 타임아웃 (기본 60초/30초)
+        max_block_ms=int(os.getenv('KAFKA_MAX_BLOCK_MS', '3000')),
+        request_timeout_ms=int(os.getenv('KAFKA_REQUEST_TIMEOUT_MS', '5000'))
+    )
+
+# 한국 시간대 가져오기
+korea_tz = pytz.timezone('Asia/Seoul')
+
+# Producer 압축 (gzip은 추가 라이브러리 없이 사용 가능, lz4/snappy/zstd는 해당 라이브러리 필요, none이면 압축 안 함)
+KAFKA_COMPRESSION = None if os.getenv('KAFKA_COMPRESSION', 'gzip') == 'none' else os.getenv('KAFKA_COMPRESSION', 'gzip')
+
+# API 통계 이벤트 직렬화 (user_id 키, developer_tag/schema 헤더, json 또는 msgpack)
+api_stats_codec = ApiStatsCodec(
+    encoding=os.getenv('KAFKA_LOG_ENCODING', 'json'),
+    developer_tag=os.getenv('DEVELOPER_TAG', 'hyunwoo'),
+    tz=korea_tz
+)
+
+# 애플리케이션 로그 버퍼 - 요청 스레드는 (시각, 레벨, 액션, 내용) 튜플만 큐에 넣고
+# 백그라운드 flusher가 모아서 Redis api_logs(파이프라인 1회) 또는 Kafka로 전송. 큐가 가득 차면 버리고 카운트
+class AppLogBuffer:
+    SINKS = ('redis', 'kafka')
+
+    def __init__(self, sink, maxsize, flush_interval, batch_size, sample_rates, topic):
+        if sink not in self.SINKS:
+            print(f"⚠️ 알 수 없는 APP_LOG_SINK '{sink}', 'redis'로 대체합니다")
+            sink = 'redis'
+        self.sink = sink
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.sample_rates = sample_rates  # 액션 또는 레벨 -> 기록 비율 (0~1)
+        self.topic = topic
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._lock = threading.Lock()
+        self._worker = None
+        self._stopping = False
+        self._counters = {'enqueued': 0, 'sampled_out': 0, 'dropped': 0, 'flushed': 0, 'batches': 0, 'errors': 0}
+
+    @staticmethod
+    def parse_sample_rates(spec):
+        """'db_insert=0.1,info=0.5' 형식 - 액션 이름이 레벨보다 우선"""
+        rates = {}
+        for item in spec.split(','):
+            key, _, value = item.partition('=')
+            if key.strip() and value.strip():
+                rates[key.strip()] = min(1.0, max(0.0, float(value)))
+        return rates
+
+    def _count(self, key, n=1):
+        with self._lock:
+            self._counters[key] += n
+
+    def _ensure_worker(self):
+        # fork 이후에도 안전하도록 첫 사용 시점에 flusher 시작
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = Thread(target=self._run, name='app-log-flusher', daemon=True)
+                self._worker.start()
+
+    def log(self, action, details, level='info'):
+        rate = self.sample_rates.get(action, self.sample_rates.get(level, 1.0))
+        if rate < 1.0 and random.random() >= rate:
+            self._count('sampled_out')
+            return
+        if self._stopping:
+            self._count('dropped')
+            return
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait((time.time(), level, action, details))
+            self._count('enqueued')
+        except queue.Full:
+            self._count('dropped')
+
+    def _entry(self, record):
+        ts, level, action, details = record
+        return {
+            'timestamp': datetime.fromtimestamp(ts, korea_tz).isoformat(),
+            'level': level,
+            'action': action,
+            'details': details
+        }
+
+    def _flush(self, batch):
+        try:
+            if self.sink == 'kafka':
+                developer_tag = os.getenv('DEVELOPER_TAG', 'hyunwoo')
+                for record in batch:
+                    entry = self._entry(record)
+                    entry['developer_tag'] = developer_tag
+                    entry['message'] = entry.pop('details')
+                    kafka_log_queue.put(self.topic, entry)
+            else:
+                # 오래된 것부터 lpush 하므로 최신 로그가 리스트 맨 앞
+                entries = [self._entry(record) for record in batch]
+                pipe = get_redis_connection().pipeline()
+                pipe.lpush('api_logs', *[json.dumps(entry) for entry in entries])
+                pipe.ltrim('api_logs', 0, 99)  # 최근 100개 로그만 유지
+                event_hub.publish('app_logs', entries, pipe=pipe)
+                pipe.execute()
+            self._count('flushed', len(batch))
+            self._count('batches')
+        except Exception as e:
+            print(f"App log flush error: {str(e)}")
+            self._count('errors')
+            self._count('dropped', len(batch))
+
+    def _run(self):
+        while True:
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                if self._stopping:
+                    return
+                continue
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._flush(batch)
+
+    # 종료 시 남은 로그 전송 (여러 번 호출해도 안전)
+    def shutdown(self, timeout=5):
+        self._stopping = True
+        worker = self._worker
+        if worker is not None and worker.is_alive():
+            worker.join(timeout)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+        stats['queue_depth'] = self._queue.qsize()
+        stats['queue_capacity'] = self._queue.maxsize
+        stats['sink'] = self.sink
+        stats['sample_rates'] = self.sample_rates
+        return stats
+
+app_log = AppLogBuffer(
+    sink=os.getenv('APP_LOG_SINK', 'redis'),
+    maxsize=int(os.getenv('APP_LOG_QUEUE_SIZE', '10000')),
+    flush_interval=int(os.getenv('APP_LOG_FLUSH_MS', '200')) / 1000,
+    batch_size=int(os.getenv('APP_LOG_BATCH_SIZE', '200')),
+    sample_rates=AppLogBuffer.parse_sample_rates(os.getenv('APP_LOG_SAMPLE_RATES', '')),
+    topic=f"app-logs-{os.getenv('DEVELOPER_TAG', 'hyunwoo')}"
+)
+
+# 로깅 함수 (요청 경로에서는 큐에 넣기만 함)
+def log_event(action, details, level='info'):
+    app_log.log(action, details, level)
+
+# API 통계 로깅 큐 - 프로세스당 Producer 1개 + 고정 워커 1개가 배치 전송 (Redis 백업 포함)
+class KafkaLogQueue:
+    BACKPRESSURE_POLICIES = ('drop', 'block', 'spill')
+
+    def __init__(self, maxsize, policy, block_timeout, drain_batch, stats_topic=None):
+        if policy not in self.BACKPRESSURE_POLICIES:
+            print(f"⚠️ 알 수 없는 KAFKA_LOG_BACKPRESSURE '{policy}', 'drop'으로 대체합니다")
+            policy = 'drop'
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.drain_batch = drain_batch
+        # API 통계 토픽 - api_stats_codec으로 키/헤더와 함께 직렬화하고, 전송 후 배치 단위로 SSE 클라이언트에도 전달
+        self.stats_topic = stats_topic
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._lock = threading.Lock()
+        self._worker = None
+        self._producer = None
+        self._stopping = False
+        # 전송 실패 이벤트 - errback(Producer I/O 스레드)은 여기에 넣기만 하고, 워커 스레드가 모아서 Redis에 백업
+        self._failed = []
+        self._counters = {'enqueued': 0, 'sent': 0, 'failed': 0, 'dropped': 0, 'spilled': 0, 'bytes': 0}
+
+    def _count(self, key, n=1):
+        with self._lock:
+            self._counters[key] += n
+
+    def _ensure_worker(self):
+        # fork 이후에도 안전하도록 첫 사용 시점에 워커 시작
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = Thread(target=self._run, name='kafka-log-worker', daemon=True)
+                self._worker.start()
+
+    def put(self, topic, event):
+        if self._stopping:
+            self._spill(event)
+            return
+        self._ensure_worker()
+        try:
+            if self.policy == 'block':
+                self._queue.put((topic, event), timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait((topic, event))
+            self._count('enqueued')
+        except queue.Full:
+            if self.policy == 'spill':
+                self._spill(event)
+            else:
+                self._count('dropped')
+
+    # Kafka 대신 Redis api_logs에 백업 저장 (배치는 파이프라인 1회)
+    def _spill(self, *events):
+        try:
+            backup_logs = [{
+                'timestamp': event['timestamp'],
+                'action': event.get('action', 'api_stats'),
+                'details': event['message']
+            } for event in events]
+            push_api_log(get_redis_connection(), *backup_logs)
+            self._count('spilled', len(events))
+        except Exception as redis_error:
+            print(f"Redis backup logging error: {str(redis_error)}")
+            self._count('dropped', len(events))
+
+    def _get_producer(self):
+        if self._producer is None:
+            self._producer = get_kafka_producer()
+        return self._producer
+
+    def warm(self):
+        """기동 준비 - Producer 생성 + 통계 토픽 메타데이터 조회(첫 send()가 기다리지 않도록), 워커 시작. 파티션 수 반환"""
+        def resolve_metadata():
+            return self._get_producer().partitions_for(self.stats_topic)
+        partitions = kafka_breaker.call(Exception, resolve_metadata)
+        self._ensure_worker()
+        return len(partitions or ())
+
+    def _reset_producer(self):
+        producer, self._producer = self._producer, None
+        if producer is not None:
+            try:
+                producer.close(timeout=1)
+            except Exception:
+                pass
+
+    def _on_sent(self, record_metadata):
+        kafka_breaker.record_success()
+        self._count('sent')
+
+    def _on_error(self, event, exc):
+        # Producer의 네트워크 스레드에서 호출되므로 Redis를 호출하지 않음
+        print(f"Kafka logging error: {str(exc)}")
+        kafka_breaker.record_failure(exc)
+        app_metrics.inc('backend_dependency_errors_total', (('dependency', 'kafka'), ('operation', 'deliver')))
+        with self._lock:
+            self._counters['failed'] += 1
+            self._failed.append(event)
+
+    def _spill_failed(self):
+        """errback이 모아 둔 전송 실패 이벤트를 파이프라인 1회로 백업"""
+        with self._lock:
+            failed, self._failed = self._failed, []
+        if failed:
+            self._spill(*failed)
+
+    def _send_batch(self, batch):
+        # 브레이커가 열려 있으면 Producer를 만들거나 send()에서 막히지 않고 배치를 바로 Redis에 백업
+        if not kafka_breaker.allow():
+            self._spill(*[event for _, event in batch])
+            return
+        sent = 0
+        start = time.perf_counter()
+        try:
+            producer = self._get_producer()
+            size = 0
+            for topic, event in batch:
+                if topic == self.stats_topic:
+                    value = api_stats_codec.encode(event)
+                    future = producer.send(topic, value, key=api_stats_codec.key(event), headers=api_stats_codec.headers)
+                else:
+                    value = json.dumps(event).encode('utf-8')
+                    future = producer.send(topic, value)
+                future.add_callback(self._on_sent)
+                future.add_errback(self._on_error, event)
+                size += len(value)
+                sent += 1
+            self._count('bytes', size)
+        except Exception as e:
+            print(f"Kafka logging error: {str(e)}")
+            observe_dependency('kafka', 'send_batch', start, error=True)
+            kafka_breaker.record_failure(e)
+            self._reset_producer()
+            self._count('failed', len(batch) - sent)
+            self._spill(*[event for _, event in batch[sent:]])
+            return
+        observe_dependency('kafka', 'send_batch', start)
+        pushed = [event for topic, event in batch if topic == self.stats_topic]
+        if pushed:
+            event_hub.publish('api_logs', pushed)
+
+    def _run(self):
+        while True:
+            self._spill_failed()
+            try:
+                item = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                if self._stopping:
+                    return
+                continue
+            batch = [item]
+            while len(batch) < self.drain_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._send_batch(batch)
+
+    # 종료 시 큐에 남은 이벤트 전송 후 Producer flush/close (여러 번 호출해도 안전)
+    def shutdown(self, timeout=10):
+        self._stopping = True
+        worker = self._worker
+        if worker is not None and worker.is_alive():
+            worker.join(timeout)
+        if self._producer is not None:
+            try:
+                self._producer.flush(timeout=timeout)
+            except Exception as e:
+                print(f"Kafka flush error: {str(e)}")
+            self._reset_producer()
+        # flush 중 실패한 이벤트까지 백업 (워커는 이미 종료)
+        self._spill_failed()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+        stats['queue_depth'] = self._queue.qsize()
+        stats['queue_capacity'] = self._queue.maxsize
+        stats['backpressure'] = self.policy
+        stats['encoding'] = api_stats_codec.encoding
+        stats['compression'] = KAFKA_COMPRESSION or 'none'
+        return stats
+
+kafka_log_queue = KafkaLogQueue(
+    maxsize=int(os.getenv('KAFKA_LOG_QUEUE_SIZE', '10000')),
+    policy=os.getenv('KAFKA_LOG_BACKPRESSURE', 'spill'),
+    block_timeout=float(os.getenv('KAFKA_LOG_BLOCK_TIMEOUT', '0.1')),
+    drain_batch=int(os.getenv('KAFKA_LOG_DRAIN_BATCH', '500')),
+    stats_topic=f"api-logs-{os.getenv('DEVELOPER_TAG', 'hyunwoo')}"
+)
+atexit.register(kafka_log_queue.shutdown)
+# atexit는 역순 실행 - 앱 로그를 먼저 비운 뒤(Kafka 싱크면 kafka_log_queue로 넘김) Kafka 큐 종료
+atexit.register(app_log.shutdown)
+
+# API 통계 로그 뷰 - 파드당 컨슈머 1개가 토픽을 계속 따라가며 최근 로그를 링 버퍼에 보관
+# (요청마다 컨슈머를 만들고 그룹 리밸런싱을 기다리지 않고 메모리에서 바로 응답)
+class KafkaLogView:
+    FIELDS = ('developer_tag', 'timestamp', 'endpoint', 'method', 'status', 'user_id', 'message')
+
+    def __init__(self, topic, developer_tag, size):
+        self.topic = topic
+        self.developer_tag = developer_tag
+        self.size = size
+        self._records = deque(maxlen=size)  # (epoch 초, 로그) - 오래된 로그는 자동 삭제
+        self._lock = threading.Lock()
+        self._worker = None
+        self._consumed = 0
+        self._skipped = 0
+        self._decode_errors = 0
+        self._errors = 0
+        self._last_error = None
+
+    def _ensure_worker(self):
+        # fork 이후에도 안전하도록 첫 사용 시점에 컨슈머 스레드 시작
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = Thread(target=self._run, name='kafka-log-view', daemon=True)
+                self._worker.start()
+
+    def warm(self):
+        """기동 준비 - 컨슈머 스레드를 첫 조회 전에 시작"""
+        self._ensure_worker()
+
+    def _create_consumer(self):
+        # 그룹 없이 파티션을 직접 할당 - 여러 파드/요청이 서로 리밸런싱하지 않음
+        from kafka import KafkaConsumer, TopicPartition
+        consumer = KafkaConsumer(
+            bootstrap_servers=os.getenv('KAFKA_SERVERS', 'team-kafka.default.svc.cluster.local:9092'),
+            group_id=None,
+            enable_auto_commit=False,
+            security_protocol='SASL_PLAINTEXT',
+            sasl_mechanism='PLAIN',
+            sasl_plain_username=os.getenv('KAFKA_USERNAME', 'user1'),
+            sasl_plain_password=os.getenv('KAFKA_PASSWORD', 'password')
+        )
+        partitions = [TopicPartition(self.topic, p) for p in (consumer.partitions_for_topic(self.topic) or [])]
+        if not partitions:
+            consumer.close()
+            raise RuntimeError(f"토픽 {self.topic}의 파티션 정보를 가져올 수 없습니다")
+        consumer.assign(partitions)
+        # 파티션마다 최근 size개부터 읽어 링 버퍼를 채움
+        beginnings = consumer.beginning_offsets(partitions)
+        for tp, end_offset in consumer.end_offsets(partitions).items():
+            consumer.seek(tp, max(beginnings[tp], end_offset - self.size))
+        return consumer
+
+    def _consume(self, record):
+        # 다른 개발자 태그의 레코드는 헤더만 보고 역직렬화 없이 건너뜀
+        if not api_stats_codec.matches(record.headers):
+            with self._lock:
+                self._skipped += 1
+            return
+        try:
+            value = api_stats_codec.decode(record.value, record.headers)
+        except (ValueError, TypeError) as e:
+            with self._lock:
+                self._decode_errors += 1
+                self._last_error = str(e)
+            return
+        self._append(value)
+
+    def _append(self, value):
+        if not isinstance(value, dict) or value.get('developer_tag') != self.developer_tag:
+            return
+        try:
+            ts = datetime.fromisoformat(value['timestamp']).timestamp()
+        except (KeyError, TypeError, ValueError):
+            return
+        log = {field: value.get(field) for field in self.FIELDS}
+        with self._lock:
+            self._records.append((ts, log))
+            self._consumed += 1
+
+    def _run(self):
+        backoff = 1
+        while True:
+            consumer = None
+            try:
+                consumer = self._create_consumer()
+                backoff = 1
+                while True:
+                    for records in consumer.poll(timeout_ms=1000, max_records=500).values():
+                        for record in records:
+                            self._consume(record)
+            except Exception as e:
+                print(f"Kafka log view error: {str(e)}")
+                with self._lock:
+                    self._errors += 1
+                    self._last_error = str(e)
+            finally:
+                if consumer is not None:
+                    try:
+                        consumer.close()
+                    except Exception:
+                        pass
+            time.sleep(backoff)
+            backoff = min(backoff * 2, 30)
+
+    def is_empty(self):
+        with self._lock:
+            return not self._records
+
+    def query(self, endpoint=None, user_id=None, status=None, since=None, until=None, limit=100):
+        """필터에 맞는 최근 로그를 시간 역순으로 최대 limit개 반환"""
+        self._ensure_worker()
+        with self._lock:
+            records = list(self._records)
+        records.sort(key=lambda record: record[0], reverse=True)
+        logs = []
+        for ts, log in records:
+            if since is not None and ts < since:
+                continue
+            if until is not None and ts > until:
+                continue
+            if endpoint and log['endpoint'] != endpoint:
+                continue
+            if user_id and log['user_id'] != user_id:
+                continue
+            if status and log['status'] != status:
+                continue
+            logs.append(log)
+            if len(logs) >= limit:
+                break
+        return logs
+
+    def stats(self):
+        with self._lock:
+            return {
+                'buffered': len(self._records),
+                'capacity': self.size,
+                'consumed': self._consumed,
+                'skipped': self._skipped,
+                'decode_errors': self._decode_errors,
+                'errors': self._errors,
+                'last_error': self._last_error,
+                'running': self._worker is not None and self._worker.is_alive()
+            }
+
+kafka_log_view = KafkaLogView(
+    topic=f"api-logs-{os.getenv('DEVELOPER_TAG', 'hyunwoo')}",
+    developer_tag=os.getenv('DEVELOPER_TAG', 'hyunwoo'),
+    size=int(os.getenv('KAFKA_LOG_VIEW_SIZE', '1000'))
+)
+
+# 실시간 이벤트 (SSE) - 새 메시지/로그를 Redis pub/sub 채널 하나로 모든 레플리카에 전달하고
+# 워커 프로세스마다 구독 스레드 1개가 연결된 클라이언트별 큐로 나눠줌 (클라이언트는 목록을 다시 조회하지 않음)
+class EventHub:
+    def __init__(self, enabled, channel, max_clients, queue_size):
+        self.enabled = enabled
+        self.channel = channel
+        self.max_clients = max_clients
+        self.queue_size = queue_size
+        self._clients = set()  # (이벤트 큐, user_id, 관리자 여부)
+        self._lock = threading.Lock()
+        self._listener = None
+        self._counters = {'published': 0, 'received': 0, 'delivered': 0, 'resyncs': 0, 'rejected': 0, 'errors': 0}
+
+    def count(self, key, n=1):
+        """카운터 증가 - app_async.py처럼 구독/발행을 직접 처리하는 쪽도 같은 stats()에 기록"""
+        with self._lock:
+            self._counters[key] += n
+
+    def encode(self, event_type, data, user_id=None):
+        return json.dumps({'type': event_type, 'user_id': user_id, 'data': data}, default=json_default)
+
+    def publish(self, event_type, data, user_id=None, pipe=None):
+        """user_id가 있으면 그 사용자와 관리자에게만 전달. pipe가 주어지면 파이프라인에 PUBLISH만 추가 (추가 왕복 없음)"""
+        if not self.enabled:
+            return
+        payload = self.encode(event_type, data, user_id)
+        if pipe is not None:
+            pipe.publish(self.channel, payload)
+            self.count('published')
+            return
+        try:
+            get_redis_connection().publish(self.channel, payload)
+            self.count('published')
+        except Exception as e:
+            print(f"Event publish error: {str(e)}")
+            self.count('errors')
+
+    def subscribe(self, user_id, is_admin):
+        """클라이언트 큐 반환 (워커당 최대 연결 수를 넘으면 None)"""
+        with self._lock:
+            if len(self._clients) >= self.max_clients:
+                self._counters['rejected'] += 1
+                return None
+            client = (queue.Queue(maxsize=self.queue_size), user_id, is_admin)
+            self._clients.add(client)
+        self._ensure_listener()
+        return client
+
+    def unsubscribe(self, client):
+        with self._lock:
+            self._clients.discard(client)
+
+    def _ensure_listener(self):
+        # fork 이후에도 안전하도록 첫 구독 시점에 구독 스레드 시작
+        if self._listener is not None and self._listener.is_alive():
+            return
+        with self._lock:
+            if self._listener is None or not self._listener.is_alive():
+                self._listener = Thread(target=self._run, name='event-listener', daemon=True)
+                self._listener.start()
+
+    def deliver(self, event, clients):
+        """(이벤트 큐, user_id, 관리자 여부) 목록 중 받을 클라이언트의 큐에 이벤트를 넣음
+        큐는 queue.Queue(구독 스레드) 또는 asyncio.Queue(app_async.py의 이벤트 루프)"""
+        owner = event.get('user_id')
+        delivered = resyncs = 0
+        for events, user_id, is_admin in clients:
+            if owner is not None and owner != user_id and not is_admin:
+                continue
+            try:
+                events.put_nowait(event)
+                delivered += 1
+            except (queue.Full, asyncio.QueueFull):
+                # 느린 클라이언트 - 밀린 이벤트를 버리고 목록을 다시 조회하도록 알림
+                while True:
+                    try:
+                        events.get_nowait()
+                    except (queue.Empty, asyncio.QueueEmpty):
+                        break
+                events.put_nowait({'type': 'resync', 'data': None})
+                resyncs += 1
+        with self._lock:
+            self._counters['received'] += 1
+            self._counters['delivered'] += delivered
+            self._counters['resyncs'] += resyncs
+
+    def _dispatch(self, event):
+        with self._lock:
+            clients = list(self._clients)
+        self.deliver(event, clients)
+
+    def _run(self):
+        backoff = 1
+        while True:
+            pubsub = None
+            try:
+                pubsub = get_redis_connection().pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                backoff = 1
+                while True:
+                    # listen()은 redis_pool의 읽기 타임아웃에 걸리므로 1초씩 대기하며 폴링
+                    message = pubsub.get_message(timeout=1.0)
+                    if message is not None and message['type'] == 'message':
+                        self._dispatch(json.loads(message['data']))
+            except Exception as e:
+                print(f"Event listener error: {str(e)}")
+                self.count('errors')
+            finally:
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+            # 끊긴 동안 놓친 이벤트가 있을 수 있으므로 연결된 클라이언트는 다시 조회
+            self._dispatch({'type': 'resync', 'data': None})
+            time.sleep(backoff)
+            backoff = min(backoff * 2, 30)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+            stats['clients'] = len(self._clients)
+        stats['enabled'] = self.enabled
+        stats['max_clients'] = self.max_clients
+        return stats
+
+# gthread 워커에서는 SSE 연결 하나가 스레드 하나를 최대 EVENTS_MAX_DURATION초 동안 점유
+# 일반 요청용으로 EVENTS_RESERVED_THREADS개(기본 GUNICORN_THREADS의 절반)를 남기고 나머지만 SSE에 사용 - 초과하면 503
+# (k8s에서는 nginx가 /api/events를 backend-events(app_async.py)로 보내므로 gunicorn 워커는 SSE를 받지 않음)
+def events_max_clients():
+    threads = int(os.getenv('GUNICORN_THREADS', '8'))
+    reserved = int(os.getenv('EVENTS_RESERVED_THREADS', str(max(1, threads // 2))))
+    limit = max(0, threads - reserved)
+    configured = os.getenv('EVENTS_MAX_CLIENTS')
+    if configured is None:
+        return limit
+    if int(configured) > limit:
+        print(f"⚠️ EVENTS_MAX_CLIENTS={configured} - 일반 요청용 스레드(EVENTS_RESERVED_THREADS)를 남기도록 {limit}(으)로 제한합니다")
+        return limit
+    return int(configured)
+
+event_hub = EventHub(
+    enabled=os.getenv('EVENTS_ENABLED', 'true').lower() == 'true',
+    channel=f"events:{os.getenv('DEVELOPER_TAG', 'hyunwoo')}",
+    max_clients=events_max_clients(),
+    queue_size=int(os.getenv('EVENTS_QUEUE_SIZE', '100'))
+)
+EVENTS_HEARTBEAT = float(os.getenv('EVENTS_HEARTBEAT', '15'))
+EVENTS_MAX_DURATION = float(os.getenv('EVENTS_MAX_DURATION', '300'))
+
+# API 통계 로깅 (요청 스레드는 큐에 넣기만 함)
+def async_log_api_stats(endpoint, method, status, user_id):
+    # 프로세스 안에서는 기존 형식의 dict로 다룸 (Redis 백업/SSE) - Kafka 전송 시 api_stats_codec으로 직렬화
+    log_data = {
+        'developer_tag': api_stats_codec.developer_tag,  # 개발자 구분 태그
+        'timestamp': datetime.now(korea_tz).isoformat(),
+        'endpoint': endpoint,
+        'method': method,
+        'status': status,
+        'user_id': user_id,
+        'message': api_stats_message(user_id, method, endpoint, status)
+    }
+    kafka_log_queue.put(kafka_log_queue.stats_topic, log_data)
+
+# Redis 세션 저장소 - session:{sid}에 세션 데이터, user_sessions:{user}에 사용자별 sid 목록
+# 프로세스 로컬 TTL 캐시로 인증 확인 대부분은 Redis 왕복 없이 처리 (폐기된 세션은 최대 local_ttl 동안만 유효)
+class RedisSessionStore:
+    """Redis 명령은 add_*()로 파이프라인에 추가하고 실행 후 cached/loaded/saved/refreshed/forget/revoked로 로컬 캐시에 반영
+    (app_async.py는 같은 메서드를 redis.asyncio 파이프라인과 함께 사용)"""
+
+    def __init__(self, ttl, local_ttl, refresh_interval, local_max):
+        self.ttl = ttl
+        self.local_ttl = local_ttl
+        self.refresh_interval = refresh_interval
+        self.local_max = local_max
+        self._local = {}  # sid -> (캐시 만료 시각, 데이터, 마지막 만료 연장 시각)
+        self._lock = threading.Lock()
+        self._counters = {'local_hits': 0, 'redis_loads': 0, 'refreshes': 0, 'revoked': 0, 'errors': 0}
+
+    def count(self, key, n=1):
+        with self._lock:
+            self._counters[key] += n
+
+    def session_key(self, sid):
+        return f"session:{sid}"
+
+    def user_key(self, user_id):
+        return f"user_sessions:{user_id}"
+
+    def _cache(self, sid, data, refreshed_at):
+        with self._lock:
+            if sid not in self._local and len(self._local) >= self.local_max:
+                self._local.pop(next(iter(self._local)))
+            self._local[sid] = (time.monotonic() + self.local_ttl, data, refreshed_at)
+
+    def forget(self, sids):
+        with self._lock:
+            for sid in sids:
+                self._local.pop(sid, None)
+
+    def cached(self, sid):
+        """(로컬 캐시의 세션 데이터 또는 None, 마지막 만료 연장 시각) - 데이터가 None이면 Redis에서 읽어 loaded()에 전달"""
+        now = time.monotonic()
+        with self._lock:
+            cached = self._local.get(sid)
+        if cached is not None and cached[0] > now:
+            self.count('local_hits')
+            return cached[1], cached[2]
+        return None, (cached[2] if cached is not None else now)
+
+    def loaded(self, sid, raw, refreshed_at):
+        """Redis에서 읽은 session:{sid} 값을 로컬 캐시에 반영하고 세션 데이터 반환 (없으면 None)"""
+        self.count('redis_loads')
+        if raw is None:
+            self.forget([sid])
+            return None
+        data = json.loads(raw)
+        self._cache(sid, data, refreshed_at)
+        return data
+
+    def load(self, sid):
+        """세션 데이터 반환 (없거나 만료/폐기되었으면 None, Redis 오류는 예외)"""
+        data, refreshed_at = self.cached(sid)
+        if data is not None:
+            return data
+        return self.loaded(sid, get_redis_connection().get(self.session_key(sid)), refreshed_at)
+
+    def add_save(self, pipe, sid, data):
+        user_id = data.get('user_id')
+        pipe.set(self.session_key(sid), json.dumps(data), ex=self.ttl)
+        if user_id:
+            pipe.sadd(self.user_key(user_id), sid)
+            pipe.expire(self.user_key(user_id), self.ttl)
+
+    def saved(self, sid, data):
+        self._cache(sid, data, time.monotonic())
+
+    def save(self, sid, data):
+        pipe = get_redis_connection().pipeline()
+        self.add_save(pipe, sid, data)
+        pipe.execute()
+        self.saved(sid, data)
+
+    def needs_refresh(self, sid):
+        """슬라이딩 만료 - refresh_interval마다 한 번만 TTL 연장"""
+        with self._lock:
+            cached = self._local.get(sid)
+        return cached is not None and time.monotonic() - cached[2] >= self.refresh_interval
+
+    def add_refresh(self, pipe, sid, data):
+        user_id = data.get('user_id')
+        pipe.expire(self.session_key(sid), self.ttl)
+        if user_id:
+            pipe.expire(self.user_key(user_id), self.ttl)
+
+    def refreshed(self, sid, data):
+        self._cache(sid, data, time.monotonic())
+        self.count('refreshes')
+
+    def touch(self, sid, data):
+        if not self.needs_refresh(sid):
+            return
+        pipe = get_redis_connection().pipeline()
+        self.add_refresh(pipe, sid, data)
+        pipe.execute()
+        self.refreshed(sid, data)
+
+    def add_delete(self, pipe, sid, user_id=None):
+        pipe.delete(self.session_key(sid))
+        if user_id:
+            pipe.srem(self.user_key(user_id), sid)
+
+    def delete(self, sid, user_id=None):
+        pipe = get_redis_connection().pipeline()
+        self.add_delete(pipe, sid, user_id)
+        pipe.execute()
+        self.forget([sid])
+
+    def add_revoke(self, pipe, user_id, sids):
+        for sid in sids:
+            pipe.delete(self.session_key(sid))
+        pipe.delete(self.user_key(user_id))
+
+    def revoked(self, sids):
+        """폐기한 세션을 로컬 캐시에서 지우고 폐기한 세션 수 반환"""
+        self.forget(sids)
+        self.count('revoked', len(sids))
+        return len(sids)
+
+    def revoke_user(self, user_id):
+        """사용자의 모든 세션 폐기, 폐기한 세션 수 반환"""
+        redis_client = get_redis_connection()
+        sids = list(redis_client.smembers(self.user_key(user_id)))
+        pipe = redis_client.pipeline()
+        self.add_revoke(pipe, user_id, sids)
+        pipe.execute()
+        return self.revoked(sids)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+            stats['local_cached'] = len(self._local)
+        stats['ttl'] = self.ttl
+        stats['local_ttl'] = self.local_ttl
+        return stats
+
+# 세션 객체 공통 속성 - 각 앱의 RedisSession이 프레임워크의 SecureCookieSession과 함께 상속
+class RedisSessionMixin:
+    def __init__(self, initial=None, sid=None):
+        super().__init__(initial)
+        self.sid = sid
+        self.owner = self.get('user_id')  # 로그아웃 시 user_sessions 정리용
+        self.store_error = False  # Redis 장애로 세션을 확인하지 못한 경우
+        self.rotate = False       # 로그인 시 세션 ID 재발급 (세션 고정 공격 방지)
+
+session_store = RedisSessionStore(
+    ttl=int(os.getenv('SESSION_TTL', '3600')),
+    local_ttl=float(os.getenv('SESSION_LOCAL_CACHE_TTL', '5')),
+    refresh_interval=float(os.getenv('SESSION_REFRESH_INTERVAL', '60')),
+    local_max=int(os.getenv('SESSION_LOCAL_CACHE_SIZE', '10000'))
+)
+
+# 공통 오류 응답 - (본문, 상태 코드, 헤더) 튜플은 Flask와 Quart 모두 JSON 응답으로 변환
+def error_response(message, status, retry_after=None):
+    headers = {'Retry-After': str(max(1, math.ceil(retry_after)))} if retry_after is not None else {}
+    return {"status": "error", "message": message}, status, headers
+
+# 세션 저장소 장애 응답
+def session_unavailable():
+    return error_response("세션 저장소에 연결할 수 없습니다", 503)
+
+def rate_limited(retry_after):
+    return error_response("요청이 너무 많습니다. 잠시 후 다시 시도해주세요", 429, retry_after)
+
+def concurrency_limited():
+    return error_response("요청이 많아 잠시 후 다시 시도해주세요", 503, 1)
+
+# 해시 풀 포화 응답
+def hasher_unavailable():
+    return error_response("요청이 많아 잠시 후 다시 시도해주세요", 503, 1)
+
+# 로그인/관리자 권한 데코레이터 - session은 각 앱의 세션 프록시, 동기 뷰와 async 뷰 모두 지원
+def session_required(session, admin=False):
+    def denied():
+        if getattr(session, 'store_error', False):
+            return session_unavailable()
+        if 'user_id' not in session:
+            return error_response("로그인이 필요합니다", 401)
+        if admin and session['user_id'] != 'admin':
+            return error_response("관리자 권한이 필요합니다", 403)
+        return None
+
+    def decorator(f):
+        if inspect.iscoroutinefunction(f):
+            @wraps(f)
+            async def decorated_function(*args, **kwargs):
+                response = denied()
+                return response if response is not None else await f(*args, **kwargs)
+        else:
+            @wraps(f)
+            def decorated_function(*args, **kwargs):
+                response = denied()
+                return response if response is not None else f(*args, **kwargs)
+        return decorated_function
+    return decorator
+
+# 로그인 사용자는 user_id, 비로그인 요청은 클라이언트 IP 기준 (프록시 뒤의 실제 IP - TRUSTED_PROXY_HOPS)
+def rate_limit_subject(session, remote_addr):
+    user_id = None if getattr(session, 'store_error', False) else session.get('user_id')
+    return f"user:{user_id}" if user_id else f"ip:{remote_addr}"
+
+# 사용자/엔드포인트별 요청 속도 제한 - Redis 토큰 버킷 (모든 레플리카가 같은 버킷을 공유)
+# RATE_LIMITS 형식: "엔드포인트=요청 수/초[:버스트],..." ('*'는 나머지 엔드포인트 기본값)
+def parse_rate_limits(spec):
+    """{엔드포인트: (초당 충전 토큰 수, 버스트)}"""
+    rules = {}
+    for item in spec.split(','):
+        item = item.strip()
+        if not item:
+            continue
+        endpoint, _, quota = item.rpartition('=')
+        rate, _, burst = quota.partition(':')
+        count, _, period = rate.partition('/')
+        rules[endpoint] = (float(count) / float(period or 1), int(burst) if burst else max(1, int(float(count))))
+    return rules
+
+class RateLimiter:
+    # 충전 + 토큰 차감을 원자적으로 처리. 최대 ARGV[3]개까지 한 번에 가져감 (로컬 lease)
+    # ARGV[4]는 이전 lease에서 쓰지 않고 만료된 토큰 수 - 버킷에 되돌린 뒤 차감
+    # 반환: {가져간 토큰 수, 0개면 다음 토큰까지 남은 ms}
+    TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local want = tonumber(ARGV[3])
+local refund = tonumber(ARGV[4]) or 0
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or burst
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate / 1000 + refund)
+local granted = math.min(want, math.floor(tokens))
+tokens = tokens - granted
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil((burst - tokens) * 1000 / rate) + 1000)
+if granted > 0 then
+    return {granted, 0}
+end
+return {0, math.ceil((1 - tokens) * 1000 / rate)}
+"""
+
+    def __init__(self, enabled, rules, lease, local_ttl, local_max):
+        self.enabled = enabled
+        self.rules = rules
+        self.lease = lease
+        self.local_ttl = local_ttl
+        self.local_max = local_max
+        self._script = None
+        # 버킷 키 -> [lease로 받아 둔 토큰 수, 만료 시각, 차단 여부] - 차단 중이면 만료 시각까지 Redis 조회 없이 429
+        # 허용 후에는 토큰이 남지 않아도 local_ttl 동안 항목을 남겨 최근 요청이 있었음을 표시 (lease 여부 판단)
+        self._local = {}
+        self._lock = threading.Lock()
+        self._counters = {'allowed': 0, 'limited': 0, 'local_hits': 0, 'redis_checks': 0, 'errors': 0, 'refunded': 0}
+
+    def _count(self, key, n=1):
+        with self._lock:
+            self._counters[key] += n
+
+    def rule_for(self, endpoint):
+        return self.rules.get(endpoint) or self.rules.get('*')
+
+    def bucket_key(self, endpoint, subject):
+        return f"ratelimit:{endpoint}:{subject}"
+
+    def lease_size(self, rule):
+        # 버스트의 1/4 이하만 한 레플리카가 미리 가져감
+        return max(1, min(self.lease, rule[1] // 4))
+
+    def script_args(self, key, rule):
+        """TOKEN_BUCKET_SCRIPT 인자 [rate, burst, 가져갈 토큰 수, 되돌릴 토큰 수].
+        local_ttl 안에 이 레플리카에서 같은 키로 허용된 요청이 있었을 때만 lease_size개를 가져가고, 아니면 1개만 가져감
+        (간격이 긴 요청이 쓰지 않을 토큰까지 가져가 실제 한도가 줄지 않도록). 만료된 lease의 남은 토큰은 버킷에 되돌림"""
+        now = time.monotonic()
+        want, refund = 1, 0
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is not None and not entry[2]:
+                if entry[1] > now:
+                    want = self.lease_size(rule)
+                else:
+                    refund = entry[0]
+                    del self._local[key]
+        return [rule[0], rule[1], want, refund]
+
+    def check_local(self, key):
+        """로컬 캐시만으로 판단되면 (허용 여부, retry_after 초), 아니면 None"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is None or entry[1] <= now:
+                return None
+            if entry[2]:
+                self._counters['local_hits'] += 1
+                self._counters['limited'] += 1
+                return False, entry[1] - now
+            if entry[0] > 0:
+                entry[0] -= 1
+                self._counters['local_hits'] += 1
+                self._counters['allowed'] += 1
+                return True, 0
+            return None
+
+    def apply(self, key, granted, retry_ms, refunded=0):
+        """Redis 스크립트 결과를 로컬 캐시에 반영하고 (허용 여부, retry_after 초) 반환"""
+        now = time.monotonic()
+        with self._lock:
+            self._counters['redis_checks'] += 1
+            self._counters['refunded'] += refunded
+            if key not in self._local and len(self._local) >= self.local_max:
+                self._local.pop(next(iter(self._local)))
+            if granted > 0:
+                self._counters['allowed'] += 1
+                self._local[key] = [granted - 1, now + self.local_ttl, False]
+                return True, 0
+            self._counters['limited'] += 1
+            self._local[key] = [0, now + retry_ms / 1000, True]
+            return False, retry_ms / 1000
+
+    def warm(self, pipe=None):
+        """기동 준비 - Script 객체를 만들어 둠. pipe가 주어지면 SCRIPT LOAD를 추가 (첫 호출의 NOSCRIPT 재시도 왕복 제거)"""
+        if self._script is None:
+            self._script = get_redis_connection().register_script(self.TOKEN_BUCKET_SCRIPT)
+        if pipe is not None:
+            pipe.script_load(self.TOKEN_BUCKET_SCRIPT)
+
+    def acquire(self, endpoint, subject):
+        """요청 1개 허용 여부와 retry_after(초). Redis 장애 시에는 허용 (fail-open)"""
+        rule = self.rule_for(endpoint)
+        if not self.enabled or rule is None:
+            return True, 0
+        key = self.bucket_key(endpoint, subject)
+        local = self.check_local(key)
+        if local is not None:
+            return local
+        args = self.script_args(key, rule)
+        try:
+            self.warm()
+            granted, retry_ms = self._script(keys=[key], args=args)
+        except Exception as e:
+            return self.fail_open(e)
+        return self.apply(key, int(granted), int(retry_ms), refunded=args[3])
+
+    def fail_open(self, error):
+        """Redis 스크립트 실패 시 오류를 기록하고 허용 결과 반환"""
+        print(f"Rate limiter error: {str(error)}")
+        self._count('errors')
+        return True, 0
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+            stats['local_entries'] = len(self._local)
+        stats['enabled'] = self.enabled
+        stats['rules'] = {endpoint: {'rate': rate, 'burst': burst} for endpoint, (rate, burst) in self.rules.items()}
+        return stats
+
+rate_limiter = RateLimiter(
+    enabled=os.getenv('RATE_LIMIT_ENABLED', 'true').lower() == 'true',
+    rules=parse_rate_limits(os.getenv('RATE_LIMITS', '*=20/1:40,/db/messages/search=5/1:10,/logs/kafka=2/1:5,/login=10/60,/register=5/60')),
+    lease=int(os.getenv('RATE_LIMIT_LEASE', '5')),
+    local_ttl=float(os.getenv('RATE_LIMIT_LOCAL_TTL', '1')),
+    local_max=int(os.getenv('RATE_LIMIT_LOCAL_CACHE_SIZE', '10000'))
+)
+
+# 느린 엔드포인트의 동시 처리 수 제한 (워커 프로세스별) - 한 엔드포인트가 모든 스레드를 점유하지 않도록
+# CONCURRENCY_LIMITS 형식: "엔드포인트=최대 동시 요청 수,..."
+class ConcurrencyLimiter:
+    def __init__(self, limits):
+        self.limits = limits
+        self._slots = {endpoint: threading.BoundedSemaphore(n) for endpoint, n in limits.items()}
+        self._in_use = dict.fromkeys(limits, 0)
+        self._lock = threading.Lock()
+        self._counters = {'acquired': 0, 'rejected': 0}
+
+    def try_acquire(self, endpoint):
+        """슬롯을 얻었으면 True (제한 없는 엔드포인트는 항상 True)"""
+        slots = self._slots.get(endpoint)
+        if slots is None:
+            return True
+        if not slots.acquire(blocking=False):
+            with self._lock:
+                self._counters['rejected'] += 1
+            return False
+        with self._lock:
+            self._in_use[endpoint] += 1
+            self._counters['acquired'] += 1
+        return True
+
+    def release(self, endpoint):
+        with self._lock:
+            self._in_use[endpoint] -= 1
+        self._slots[endpoint].release()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+            stats['endpoints'] = {endpoint: {'limit': limit, 'in_use': self._in_use[endpoint]}
+                                  for endpoint, limit in self.limits.items()}
+        return stats
+
+concurrency_limiter = ConcurrencyLimiter({
+    endpoint: int(limit)
+    for endpoint, _, limit in (item.strip().rpartition('=') for item in
+                               os.getenv('CONCURRENCY_LIMITS', '/db/messages/search=4,/logs/kafka=2').split(',') if item.strip())
+})
+
+# 제한 대상에서 제외 (모니터링)
+RATE_LIMIT_EXEMPT = {'/metrics', '/health/dependencies', '/healthz', '/readyz'}
+
+# 메시지 목록 페이지 크기 (기본값 / 최대값)
+MESSAGES_PAGE_SIZE = int(os.getenv('MESSAGES_PAGE_SIZE', '20'))
+MESSAGES_PAGE_MAX = int(os.getenv('MESSAGES_PAGE_MAX', '100'))
+
+# 다음 페이지 토큰 생성 - 마지막 행의 (created_at, id)를 불투명한 문자열로 인코딩
+def encode_page_cursor(row):
+    raw = json.dumps([row['created_at'].isoformat(sep=' '), row['id']])
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_page_cursor(token):
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except Exception:
+        raise ValueError("잘못된 cursor 값입니다")
+
+# 요청 파라미터에서 limit 추출 (MESSAGES_PAGE_MAX로 제한)
+def get_limit_arg(args):
+    try:
+        limit = int(args.get('limit', MESSAGES_PAGE_SIZE))
+    except ValueError:
+        raise ValueError("limit은 숫자여야 합니다")
+    return max(1, min(limit, MESSAGES_PAGE_MAX))
+
+# 요청 파라미터에서 limit, cursor 추출
+def get_page_args(args):
+    limit = get_limit_arg(args)
+    token = args.get('cursor')
+    return limit, (decode_page_cursor(token) if token else None)
+
+# 스트리밍 응답 (?stream=json|ndjson) - 페이지 크기 제한 없이 서버 측 커서로 끝까지 전송
+STREAM_FETCH_SIZE = int(os.getenv('STREAM_FETCH_SIZE', '500'))
+STREAM_FORMATS = {'json': 'application/json', 'ndjson': 'application/x-ndjson'}
+
+# 요청 파라미터에서 스트리밍 형식과 limit 추출 (limit 미지정 시 전체, MESSAGES_PAGE_MAX 제한 없음)
+def get_stream_args(args):
+    fmt = args.get('stream')
+    if fmt is None:
+        return None, None
+    if fmt not in STREAM_FORMATS:
+        raise ValueError("stream은 json 또는 ndjson이어야 합니다")
+    try:
+        limit = args.get('limit')
+        return fmt, (max(1, int(limit)) if limit else None)
+    except ValueError:
+        raise ValueError("limit은 숫자여야 합니다")
+
+# (created_at, id) 기준 키셋 페이지네이션 - (user_id, created_at, id) 인덱스 범위 스캔
+# 페이지 조회는 다음 페이지 확인용으로 1개 더(lookahead) 조회, limit이 None이면 전체 (스트리밍)
+def message_page_query(user_id, limit, after=None, lookahead=1):
+    sql = "SELECT * FROM messages WHERE user_id = %s"
+    params = [user_id]
+    if after is not None:
+        sql += " AND (created_at < %s OR (created_at = %s AND id < %s))"
+        params += [after[0], after[0], after[1]]
+    sql += " ORDER BY created_at DESC, id DESC"
+    if limit is not None:
+        sql += " LIMIT %s"
+        params.append(limit + lookahead)
+    return sql, tuple(params)
+
+# limit + 1개를 조회한 결과를 (현재 페이지, 다음 페이지 토큰)으로 분리
+def split_keyset_page(rows, limit):
+    next_cursor = encode_page_cursor(rows[limit - 1]) if len(rows) > limit else None
+    return rows[:limit], next_cursor
+
+def fetch_message_page(cursor, user_id, limit, after=None):
+    cursor.execute(*message_page_query(user_id, limit, after))
+    return split_keyset_page(cursor.fetchall(), limit)
+
+# 관리자 사용자 목록 - users + user_stats, (created_at, id) 키셋 페이지네이션
+def user_page_query(limit, after=None, lookahead=1):
+    sql = """
+        SELECT 
+            u.id,
+            u.username,
+            u.created_at,
+            COALESCE(s.message_count, 0) as message_count,
+            s.last_message_at
+        FROM users u
+        LEFT JOIN user_stats s ON s.username = u.username
+    """
+    params = []
+    if after is not None:
+        sql += " WHERE u.created_at < %s OR (u.created_at = %s AND u.id < %s)"
+        params += [after[0], after[0], after[1]]
+    sql += " ORDER BY u.created_at DESC, u.id DESC"
+    if limit is not None:
+        sql += " LIMIT %s"
+        params.append(limit + lookahead)
+    return sql, tuple(params)
+
+USER_STATS_SQL = "SELECT message_count, last_message_at FROM user_stats WHERE username = %s"
+
+# 사용자의 전체 메시지 수 (user_stats 요약 테이블, 없으면 0)
+def get_user_message_count(username):
+    db = db_pool.acquire()
+    cursor = db.cursor(dictionary=True)
+    try:
+        cursor.execute(USER_STATS_SQL, (username,))
+        rows = cursor.fetchall()
+    finally:
+        cursor.close()
+        db.close()
+    return rows[0]['message_count'] if rows else 0
+
+# 관리자 계정 정보 (하드코딩, 통계는 user_stats에서 조회)
+def admin_user_info(admin_stats):
+    admin_stats = admin_stats or {}
+    return {
+        'id': 0,
+        'username': 'admin',
+        'created_at': '2025-01-01 00:00:00',  # 고정 날짜
+        'message_count': admin_stats.get('message_count', 0),
+        'last_message_at': admin_stats.get('last_message_at')
+    }
+
+# 사용자별 메시지 목록 read-through 캐시 (Redis, TTL)
+# 메시지 저장 시 사용자 버전을 올려 이전 버전의 페이지 캐시는 더 이상 조회되지 않음
+class MessageCache:
+    # 버전 조회 + 페이지 조회를 1회 왕복으로 처리
+    LOOKUP_SCRIPT = """
+local version = redis.call('GET', KEYS[1]) or '0'
+return {version, redis.call('GET', ARGV[1] .. version .. ':' .. ARGV[2])}
+"""
+    VERSION_TTL = 86400
+
+    def __init__(self, enabled, ttl):
+        self.enabled = enabled
+        self.ttl = ttl
+        self._lookup = None
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'invalidations': 0, 'errors': 0}
+
+    def _count(self, key):
+        with self._lock:
+            self._counters[key] += 1
+
+    # 키/직렬화/카운터 규칙 - Redis 호출은 get/set/invalidate(동기) 또는 app_async.py(redis.asyncio)가 수행
+    def version_key(self, user_id):
+        return f"msgcache:ver:{user_id}"
+
+    def page_prefix(self, user_id):
+        return f"msgcache:{user_id}:v"
+
+    def page_cache_key(self, user_id, version, page_key):
+        return f"{self.page_prefix(user_id)}{version}:{page_key}"
+
+    def lookup_args(self, user_id, page_key):
+        """LOOKUP_SCRIPT의 (keys, args)"""
+        return [self.version_key(user_id)], [self.page_prefix(user_id), page_key]
+
+    def found(self, payload):
+        """LOOKUP_SCRIPT가 돌려준 페이지 값을 디코딩 (없으면 None) - 적중/실패 횟수 기록"""
+        if payload is None:
+            self._count('misses')
+            return None
+        self._count('hits')
+        return json.loads(payload)
+
+    def encode(self, page):
+        return json.dumps(page, default=json_default)
+
+    def add_invalidate(self, pipe, user_id):
+        pipe.incr(self.version_key(user_id))
+        pipe.expire(self.version_key(user_id), self.VERSION_TTL)
+
+    def invalidated(self):
+        self._count('invalidations')
+
+    def failed(self, action, error):
+        """캐시 오류는 기록만 하고 DB 조회로 계속 (action: read, write, invalidation)"""
+        print(f"Message cache {action} error: {str(error)}")
+        self._count('errors')
+
+    def warm(self, pipe=None):
+        """기동 준비 - Script 객체를 만들어 둠. pipe가 주어지면 SCRIPT LOAD를 추가"""
+        if self._lookup is None:
+            self._lookup = get_redis_connection().register_script(self.LOOKUP_SCRIPT)
+        if pipe is not None:
+            pipe.script_load(self.LOOKUP_SCRIPT)
+
+    def get(self, user_id, page_key):
+        """(버전, 캐시된 페이지 또는 None) 반환"""
+        if not self.enabled:
+            return None, None
+        try:
+            self.warm()
+            keys, args = self.lookup_args(user_id, page_key)
+            version, payload = self._lookup(keys=keys, args=args)
+        except Exception as e:
+            self.failed('read', e)
+            return None, None
+        return version, self.found(payload)
+
+    def set(self, user_id, version, page_key, page):
+        if not self.enabled or version is None:
+            return
+        try:
+            get_redis_connection().set(self.page_cache_key(user_id, version, page_key), self.encode(page), ex=self.ttl)
+        except Exception as e:
+            self.failed('write', e)
+
+    def invalidate(self, user_id):
+        if not self.enabled:
+            return
+        try:
+            pipe = get_redis_connection().pipeline()
+            self.add_invalidate(pipe, user_id)
+            pipe.execute()
+            self.invalidated()
+        except Exception as e:
+            self.failed('invalidation', e)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_ratio'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+        stats['enabled'] = self.enabled
+        stats['ttl'] = self.ttl
+        return stats
+
+message_cache = MessageCache(
+    enabled=os.getenv('MESSAGE_CACHE_ENABLED', 'true').lower() == 'true',
+    ttl=int(os.getenv('MESSAGE_CACHE_TTL', '60'))
+)
+
+# 사용자별 메시지 통계 증분 갱신 (messages INSERT와 같은 트랜잭션에서 실행)
+# 파라미터: (username, 추가된 메시지 수, 마지막 메시지 시각)
+UPSERT_USER_STATS_SQL = """
+    INSERT INTO user_stats (username, message_count, last_message_at)
+    VALUES (%s, %s, %s)
+    ON DUPLICATE KEY UPDATE
+        message_count = message_count + VALUES(message_count),
+        last_message_at = GREATEST(COALESCE(last_message_at, VALUES(last_message_at)), VALUES(last_message_at))
+"""
+
+USER_STATS_DDL = """
+    CREATE TABLE IF NOT EXISTS user_stats (
+        username VARCHAR(255) PRIMARY KEY,
+        message_count INT NOT NULL DEFAULT 0,
+        last_message_at DATETIME NULL
+    )
+"""
+
+# 기존 DB(PVC에 남은 스키마)를 db/init.sql과 맞추는 마이그레이션 - 모두 IF NOT EXISTS라 여러 번 실행해도 안전
+# 새 코드가 쓰기를 받기 전에 실행 (k8s는 backend 파드의 initContainer에서 flask --app app migrate-db)
+SCHEMA_MIGRATIONS = [
+    ('user_stats', USER_STATS_DDL),
+    ('users_keyset_index', "CREATE INDEX IF NOT EXISTS idx_created_id ON users (created_at, id)"),
+    ('messages_keyset_index', "CREATE INDEX IF NOT EXISTS idx_user_created_id ON messages (user_id, created_at, id)"),
+    # write-behind 저장의 중복 방지 키 - writer는 이미 저장된 pending_id를 건너뛰고, UNIQUE 키가 동시 재전송의 중복 INSERT를 막음
+    ('messages_pending_id', "ALTER TABLE messages ADD COLUMN IF NOT EXISTS pending_id CHAR(32) NULL AFTER message"),
+    ('messages_pending_id_unique', "CREATE UNIQUE INDEX IF NOT EXISTS uk_pending_id ON messages (pending_id)"),
+    # 메시지 검색용 FULLTEXT 인덱스 - 없으면 검색은 LIKE로 대체됨 (큰 테이블은 생성에 시간이 걸림)
+    ('messages_fulltext', "CREATE FULLTEXT INDEX IF NOT EXISTS ft_message ON messages (message)"),
+]
+
+def migrate_schema():
+    """SCHEMA_MIGRATIONS를 순서대로 적용하고 적용한 이름 목록 반환. user_stats를 새로 만들었으면 messages에서 채움"""
+    db = db_pool.acquire()
+    cursor = db.cursor()
+    try:
+        cursor.execute("SHOW TABLES LIKE 'user_stats'")
+        user_stats_missing = cursor.fetchone() is None
+        for name, sql in SCHEMA_MIGRATIONS:
+            cursor.execute(sql)
+        db.commit()
+    finally:
+        cursor.close()
+        db.close()
+    if user_stats_missing:
+        rebuild_user_stats()
+    return [name for name, _ in SCHEMA_MIGRATIONS]
+
+# user_stats 전체 재계산 (초기 적재 또는 불일치 복구용, 테이블이 없으면 생성)
+def rebuild_user_stats():
+    db = db_pool.acquire()
+    cursor = db.cursor()
+    try:
+        cursor.execute(USER_STATS_DDL)
+        cursor.execute("DELETE FROM user_stats")
+        cursor.execute("""
+            INSERT INTO user_stats (username, message_count, last_message_at)
+            SELECT user_id, COUNT(*), MAX(created_at)
+            FROM messages
+            GROUP BY user_id
+        """)
+        rebuilt = cursor.rowcount
+        db.commit()
+        return rebuilt
+    finally:
+        cursor.close()
+        db.close()
+
+# 메시지 write-behind 버퍼 - 요청은 Redis 스트림에 넣고 바로 응답, 백그라운드 writer가 그룹 커밋
+# 스트림 항목은 MariaDB 커밋 후에만 ACK/삭제하며, pending_id(UNIQUE)로 재전송 시에도 중복 저장하지 않음
+class MessageWriteBehind:
+    STREAM = 'messages:pending'
+    GROUP = 'message-writers'
+
+    def __init__(self, enabled, flush_ms, batch_size, claim_idle_ms, pending_ttl):
+        self.enabled = enabled
+        self.flush_ms = flush_ms
+        self.batch_size = batch_size
+        self.claim_idle_ms = claim_idle_ms
+        self.pending_ttl = pending_ttl
+        self.consumer = f"{socket.gethostname()}-{os.getpid()}"
+        self._lock = threading.Lock()
+        self._worker = None
+        self._stopping = False
+        self._counters = {'enqueued': 0, 'flushed': 0, 'duplicates': 0, 'batches': 0, 'claimed': 0, 'errors': 0}
+        self._last_flush_ms = 0.0
+
+    def _count(self, key, n=1):
+        with self._lock:
+            self._counters[key] += n
+
+    def pending_key(self, user_id):
+        return f"pending:{user_id}"
+
+    def idempotency_key(self, pending_id):
+        return f"idempotency:{pending_id}"
+
+    def pending_id_for(self, user_id, idempotency_key=None):
+        """Idempotency-Key가 있으면 (사용자, 키)마다 고정된 pending_id (재시도도 같은 id), 없으면 새 id"""
+        if idempotency_key:
+            return hashlib.sha256(f"{user_id}:{idempotency_key}".encode('utf-8')).hexdigest()[:32]
+        return uuid.uuid4().hex
+
+    def add_to_pipeline(self, pipe, user_id, message, pending_id, idempotent=False):
+        """스트림 추가 + 사용자별 대기 목록(read-your-writes용) + 재시도 확인 키를 MULTI 파이프라인에 추가하고 row 반환
+        재시도 확인 키를 스트림 추가와 같은 트랜잭션에 쓰므로, 키가 있으면 메시지는 항상 스트림에 들어가 있음"""
+        row = {
+            'pending_id': pending_id,
+            'user_id': user_id,
+            'message': message,
+            'created_at': datetime.now().isoformat(sep=' ')
+        }
+        pipe.xadd(self.STREAM, row)
+        pipe.hset(self.pending_key(user_id), pending_id, json.dumps(row))
+        pipe.expire(self.pending_key(user_id), self.pending_ttl)
+        if idempotent:
+            pipe.set(self.idempotency_key(pending_id), 1, ex=self.pending_ttl)
+        return row
+
+    def pending_event(self, row):
+        """실시간 이벤트로 보낼 대기 메시지 (id 없음, pending 표시)"""
+        return dict(row, id=None, pending=True, created_at=datetime.fromisoformat(row['created_at']))
+
+    def enqueue(self, user_id, message, idempotency_key=None):
+        """스트림에 메시지를 넣고 pending_id 반환 (같은 Idempotency-Key 재시도는 기존 pending_id 반환)"""
+        redis_client = get_redis_connection()
+        pending_id = self.pending_id_for(user_id, idempotency_key)
+        # 이미 스트림에 들어간 요청의 재시도 - 동시에 온 재시도가 둘 다 추가해도 writer가 pending_id로 중복 제거 (UNIQUE)
+        if idempotency_key and redis_client.exists(self.idempotency_key(pending_id)):
+            return pending_id
+        pipe = redis_client.pipeline()
+        row = self.add_to_pipeline(pipe, user_id, message, pending_id, idempotent=bool(idempotency_key))
+        event_hub.publish('message', self.pending_event(row), user_id=user_id, pipe=pipe)
+        pipe.execute()
+        self.enqueued()
+        return pending_id
+
+    def enqueued(self):
+        """add_to_pipeline() 파이프라인을 실행한 뒤 호출 - 카운트하고 writer 시작"""
+        self._count('enqueued')
+        self.ensure_worker()
+
+    @staticmethod
+    def parse_pending(values):
+        """대기 목록(HVALS) 값을 응답 형식의 행으로 변환 (최신순)"""
+        rows = []
+        for value in values:
+            row = json.loads(value)
+            rows.append({
+                'id': None,
+                'user_id': row['user_id'],
+                'message': row['message'],
+                'created_at': datetime.fromisoformat(row['created_at']),
+                'pending_id': row['pending_id'],
+                'pending': True
+            })
+        rows.sort(key=lambda row: row['created_at'], reverse=True)
+        return rows
+
+    def pending_rows(self, user_id):
+        """아직 DB에 저장되지 않은 사용자 메시지 (최신순)"""
+        return self.parse_pending(get_redis_connection().hvals(self.pending_key(user_id)))
+
+    def ensure_worker(self):
+        # fork 이후에도 안전하도록 첫 사용 시점에 writer 스레드 시작
+        if not self.enabled or self._stopping or (self._worker is not None and self._worker.is_alive()):
+            return
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = Thread(target=self._run, name='message-writer', daemon=True)
+                self._worker.start()
+
+    def _ensure_group(self, redis_client):
+        try:
+            redis_client.xgroup_create(self.STREAM, self.GROUP, id='0', mkstream=True)
+        except redis.exceptions.ResponseError as e:
+            if 'BUSYGROUP' not in str(e):
+                raise
+
+    def _read(self, redis_client, count, block_ms):
+        response = redis_client.xreadgroup(self.GROUP, self.consumer, {self.STREAM: '>'}, count=count, block=block_ms)
+        return [entry for _, entries in (response or []) for entry in entries]
+
+    def _claim_stale(self, redis_client):
+        # 종료된 다른 writer가 ACK하지 못한 항목을 가져와 다시 처리
+        result = redis_client.xautoclaim(self.STREAM, self.GROUP, self.consumer,
+                                         min_idle_time=self.claim_idle_ms, count=self.batch_size)
+        entries = [entry for entry in result[1] if entry[1]]
+        if entries:
+            self._count('claimed', len(entries))
+        return entries
+
+    def _run(self):
+        redis_client = get_redis_connection()
+        last_claim = 0.0
+        while not self._stopping:
+            try:
+                self._ensure_group(redis_client)
+                batch = []
+                if time.monotonic() - last_claim > self.claim_idle_ms / 1000:
+                    batch.extend(self._claim_stale(redis_client))
+                    last_claim = time.monotonic()
+                if not batch:
+                    batch = self._read(redis_client, self.batch_size, 1000)
+                    if not batch:
+                        continue
+                # 첫 항목 이후 flush_ms 동안 또는 batch_size개가 찰 때까지 모아서 한 번에 커밋
+                deadline = time.monotonic() + self.flush_ms / 1000
+                while len(batch) < self.batch_size:
+                    remaining_ms = int((deadline - time.monotonic()) * 1000)
+                    if remaining_ms <= 0:
+                        break
+                    batch.extend(self._read(redis_client, self.batch_size - len(batch), remaining_ms))
+                self._flush(redis_client, batch)
+            except Exception as e:
+                print(f"Write-behind flush error: {str(e)}")
+                self._count('errors')
+                time.sleep(1)
+
+    def _flush(self, redis_client, batch):
+        start = time.monotonic()
+        rows = {}
+        for entry_id, fields in batch:
+            if fields:
+                rows[fields['pending_id']] = fields
+        entry_ids = [entry_id for entry_id, _ in batch]
+
+        inserted = []
+        if rows:
+            db = db_pool.acquire()
+            cursor = db.cursor()
+            try:
+                pending_ids = list(rows)
+                cursor.execute(
+                    f"SELECT pending_id FROM messages WHERE pending_id IN ({', '.join(['%s'] * len(pending_ids))})",
+                    tuple(pending_ids))
+                existing = {row[0] for row in cursor.fetchall()}
+                inserted = [rows[pending_id] for pending_id in pending_ids if pending_id not in existing]
+                if inserted:
+                    cursor.executemany(
+                        "INSERT INTO messages (user_id, message, created_at, pending_id) VALUES (%s, %s, %s, %s)",
+                        [(row['user_id'], row['message'], row['created_at'], row['pending_id']) for row in inserted])
+                    per_user = {}
+                    for row in inserted:
+                        count, last = per_user.get(row['user_id'], (0, row['created_at']))
+                        per_user[row['user_id']] = (count + 1, max(last, row['created_at']))
+                    for user_id, (count, last) in per_user.items():
+                        cursor.execute(UPSERT_USER_STATS_SQL, (user_id, count, last))
+                db.commit()
+            finally:
+                cursor.close()
+                db.close()
+            self._count('duplicates', len(rows) - len(inserted))
+
+        # 커밋 이후: 캐시 무효화 → 스트림 ACK/삭제 → 대기 목록 정리 (읽는 쪽은 pending_id로 중복 제거)
+        for user_id in {row['user_id'] for row in inserted}:
+            message_cache.invalidate(user_id)
+        pipe = redis_client.pipeline()
+        pipe.xack(self.STREAM, self.GROUP, *entry_ids)
+        pipe.xdel(self.STREAM, *entry_ids)
+        for pending_id, row in rows.items():
+            pipe.hdel(self.pending_key(row['user_id']), pending_id)
+        pipe.execute()
+
+        with self._lock:
+            self._counters['flushed'] += len(inserted)
+            self._counters['batches'] += 1
+            self._last_flush_ms = round((time.monotonic() - start) * 1000, 3)
+
+    # 종료 시 writer 정지 (ACK되지 않은 항목은 스트림에 남아 다른 writer가 처리)
+    def shutdown(self, timeout=5):
+        self._stopping = True
+        worker = self._worker
+        if worker is not None and worker.is_alive():
+            worker.join(timeout)
+
+    def stats(self, stream_length=True):
+        """stream_length=False면 스트림 길이를 조회하지 않음 (app_async.py는 redis.asyncio로 직접 조회)"""
+        with self._lock:
+            stats = dict(self._counters)
+            stats['last_flush_ms'] = self._last_flush_ms
+        stats['enabled'] = self.enabled
+        stats['running'] = self._worker is not None and self._worker.is_alive()
+        if stream_length:
+            try:
+                stats['stream_length'] = get_redis_connection().xlen(self.STREAM)
+            except Exception:
+                stats['stream_length'] = None
+        return stats
+
+message_writer = MessageWriteBehind(
+    enabled=os.getenv('WRITE_BEHIND_ENABLED', 'false').lower() == 'true',
+    flush_ms=int(os.getenv('WRITE_BEHIND_FLUSH_MS', '200')),
+    batch_size=int(os.getenv('WRITE_BEHIND_BATCH_SIZE', '500')),
+    claim_idle_ms=int(os.getenv('WRITE_BEHIND_CLAIM_IDLE_MS', '60000')),
+    pending_ttl=int(os.getenv('WRITE_BEHIND_PENDING_TTL', '86400'))
+)
+atexit.register(message_writer.shutdown)
+
+# 첫 페이지에 아직 DB에 저장되지 않은 본인 메시지를 합침 (read-your-writes)
+def merge_pending_rows(pending, messages):
+    if not pending:
+        return messages
+    saved = {row.get('pending_id') for row in messages if row.get('pending_id')}
+    return [row for row in pending if row['pending_id'] not in saved] + messages
+
+def merge_pending_messages(user_id, messages):
+    return merge_pending_rows(message_writer.pending_rows(user_id), messages)
+
+# 검색 설정 - FULLTEXT 인덱스 최소 토큰 길이(innodb_ft_min_token_size)와 최대 검색 오프셋
+SEARCH_MIN_TOKEN_LEN = int(os.getenv('SEARCH_MIN_TOKEN_LEN', '3'))
+SEARCH_MAX_OFFSET = int(os.getenv('SEARCH_MAX_OFFSET', '1000'))
+FULLTEXT_OPERATORS = '+-<>()~*"@'
+
+# 검색어를 BOOLEAN MODE 질의로 변환 - 모든 단어 포함(+), 접두어 일치(*)로 한국어 조사 붙은 단어도 검색
+# 인덱스에 없는 짧은 단어가 섞여 있으면 None 반환 (LIKE 검색으로 대체)
+def build_fulltext_query(query):
+    terms = query.translate({ord(ch): ' ' for ch in FULLTEXT_OPERATORS}).split()
+    if not terms or any(len(term) < SEARCH_MIN_TOKEN_LEN for term in terms):
+        return None
+    return ' '.join(f"+{term}*" for term in terms)
+
+# limit이 None이면 offset 이후 전체 (스트리밍) - MariaDB는 LIMIT 없는 OFFSET을 지원하지 않아 최대값 사용
+SEARCH_NO_LIMIT = 18446744073709551615
+
+def search_query(user_id, query, limit, offset, lookahead=1, fulltext=True):
+    limit = SEARCH_NO_LIMIT if limit is None else limit + lookahead
+    fulltext_query = build_fulltext_query(query) if fulltext else None
+    if fulltext_query is not None:
+        # FULLTEXT 인덱스 + 관련도 순 정렬
+        sql = """
+            SELECT *, MATCH(message) AGAINST (%s IN BOOLEAN MODE) AS score
+            FROM messages
+            WHERE user_id = %s AND MATCH(message) AGAINST (%s IN BOOLEAN MODE)
+            ORDER BY score DESC, created_at DESC, id DESC
+            LIMIT %s OFFSET %s
+        """
+        params = (fulltext_query, user_id, fulltext_query, limit, offset)
+    else:
+        # 짧은 검색어(또는 FULLTEXT 인덱스가 없는 DB)는 기존 LIKE 검색 (결과 수 제한)
+        escaped = query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        sql = """
+            SELECT * FROM messages
+            WHERE user_id = %s AND message LIKE %s
+            ORDER BY created_at DESC, id DESC
+            LIMIT %s OFFSET %s
+        """
+        params = (user_id, f"%{escaped}%", limit, offset)
+    return sql, params
+
+# limit + 1개를 조회한 결과를 (현재 페이지, 다음 오프셋)으로 분리
+def split_offset_page(rows, limit, offset):
+    next_offset = offset + limit if len(rows) > limit and offset + limit <= SEARCH_MAX_OFFSET else None
+    return rows[:limit], next_offset
+
+def search_message_page(cursor, user_id, query, limit, offset, fulltext=True):
+    cursor.execute(*search_query(user_id, query, limit, offset, fulltext=fulltext))
+    return split_offset_page(cursor.fetchall(), limit, offset)
+
+# MATCH ... AGAINST를 FULLTEXT 인덱스가 없는 테이블에 실행하면 1191 (migrate-db 전의 기존 DB)
+ER_FT_MATCHING_KEY_NOT_FOUND = 1191
+
+def is_fulltext_index_missing(error):
+    """mysql-connector는 errno, aiomysql(PyMySQL)은 args[0]에 오류 코드"""
+    code = getattr(error, 'errno', None)
+    if code is None and error.args:
+        code = error.args[0]
+    return code == ER_FT_MATCHING_KEY_NOT_FOUND
+
+def run_search(search):
+    """search(fulltext)를 실행하고, FULLTEXT 인덱스가 없을 때만 LIKE 검색으로 다시 실행 (다른 오류는 그대로 전달)"""
+    try:
+        return search(True)
+    except Exception as e:
+        if not is_fulltext_index_missing(e):
+            raise
+        print("⚠️ ft_message FULLTEXT 인덱스가 없어 LIKE 검색으로 대체합니다 (flask --app app migrate-db)")
+        return search(False)
+
+# 대량 입력 설정 - 청크(트랜잭션) 크기와 요청당 최대 메시지 수
+BULK_INSERT_CHUNK_SIZE = int(os.getenv('BULK_INSERT_CHUNK_SIZE', '500'))
+BULK_MAX_ITEMS = int(os.getenv('BULK_MAX_ITEMS', '10000'))
+
+# 대량 입력 요청 본문 파싱 - JSON 배열({"messages": [...]} 포함) 또는 NDJSON(한 줄에 하나)
+# 항목은 문자열 또는 {"message": "..."} - (메시지 목록, 파싱 실패 항목 {index: 오류}) 반환 (app_async.py와 공유)
+def parse_bulk_messages(content_type, text):
+    if content_type in ('application/x-ndjson', 'application/jsonl', 'application/json-seq'):
+        items, errors = [], {}
+        lines = [line for line in text.splitlines() if line.strip()]
+        for index, line in enumerate(lines):
+            try:
+                items.append(json.loads(line))
+            except ValueError:
+                items.append(None)
+                errors[index] = "JSON 형식이 아닙니다"
+    else:
+        body = None
+        if content_type == 'application/json' or content_type.endswith('+json'):
+            try:
+                body = json.loads(text)
+            except ValueError:
+                pass
+        if isinstance(body, dict):
+            body = body.get('messages')
+        if not isinstance(body, list):
+            raise ValueError("메시지 배열 또는 NDJSON 본문이 필요합니다")
+        items, errors = body, {}
+
+    messages = []
+    for index, item in enumerate(items):
+        if index in errors:
+            messages.append(None)
+            continue
+        message = item.get('message') if isinstance(item, dict) else item
+        if not isinstance(message, str) or not message.strip():
+            errors[index] = "message는 비어 있지 않은 문자열이어야 합니다"
+            messages.append(None)
+        else:
+            messages.append(message)
+    return messages, errors
+
+# 비밀번호 해시 프로세스 풀 (PASSWORD_HASH_METHOD로 비용 조정, 대기열이 가득 차면 503)
+password_hasher = PasswordHasher(
+    method=os.getenv('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1'),
+    workers=int(os.getenv('PASSWORD_HASH_WORKERS', '2')),
+    max_pending=int(os.getenv('PASSWORD_HASH_MAX_PENDING', '32')),
+    timeout=float(os.getenv('PASSWORD_HASH_TIMEOUT', '10'))
+)
+atexit.register(password_hasher.shutdown)
+
+# 기동 준비 (warm-up) - 워커가 요청을 받기 전에 커넥션/프로세스/메타데이터를 미리 준비해 첫 요청이 느리지 않도록 함
+# gunicorn은 워커마다 post_worker_init에서 run()을 호출하고 끝난 뒤에 요청을 받음 (다른 실행 방식은 /readyz 첫 호출 시 백그라운드로 시작)
+# 단계는 병렬로 실행하고 timeout까지만 기다림 - 의존성 장애로 실패한 단계가 있어도 준비 완료로 보고 서킷 브레이커로 빠르게 실패
+class Warmup:
+    def __init__(self, enabled, timeout, steps):
+        self.enabled = enabled
+        self.timeout = timeout
+        self.steps = steps  # (이름, 함수) - 함수는 결과 요약을 반환, 실패하면 예외
+        self.import_seconds = None  # 앱 모듈 import에 걸린 시간 (app.py가 import 끝에서 설정)
+        self._lock = threading.Lock()
+        self._pid = None
+        self._started = None
+        self._seconds = None
+        self._done = False
+        self._results = {}
+        self._counters = {'runs': 0, 'failed_steps': 0, 'timed_out_steps': 0}
+
+    def _count(self, key, n=1):
+        with self._lock:
+            self._counters[key] += n
+
+    def record(self, name, seconds, error=None, result=None):
+        """단계 결과 기록 - 준비 단계 밖의 작업(gunicorn post_fork의 OTel Provider 초기화 등)도 같은 형식으로 기록"""
+        entry = {'ok': error is None, 'seconds': round(seconds, 4)}
+        if error is not None:
+            print(f"Warm-up {name} error: {str(error)}")
+            entry['error'] = str(error)
+        else:
+            entry['result'] = result
+        with self._lock:
+            self._results[name] = entry
+            if error is not None:
+                self._counters['failed_steps'] += 1
+
+    def record_timeouts(self, names):
+        """timeout 안에 끝나지 않은 단계 기록 (app_async.py처럼 단계를 직접 실행하는 쪽도 사용)"""
+        if names:
+            print(f"⚠️ 기동 준비 시간 초과 ({self.timeout}s): {', '.join(names)}")
+            self._count('timed_out_steps', len(names))
+
+    def _run_step(self, name, fn):
+        start = time.perf_counter()
+        try:
+            result = fn()
+        except Exception as e:
+            self.record(name, time.perf_counter() - start, error=e)
+            return
+        self.record(name, time.perf_counter() - start, result=result)
+
+    def run(self):
+        """현재 프로세스에서 한 번만 실행 (이미 시작했으면 바로 반환)"""
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._started = time.perf_counter()
+            self._done = False
+            self._counters['runs'] += 1
+        if self.enabled:
+            workers = [Thread(target=self._run_step, args=step, name=f"warmup-{step[0]}", daemon=True) for step in self.steps]
+            for worker in workers:
+                worker.start()
+            deadline = time.monotonic() + self.timeout
+            for worker in workers:
+                worker.join(max(0.0, deadline - time.monotonic()))
+            timed_out = [name for (name, _), worker in zip(self.steps, workers) if worker.is_alive()]
+            self.record_timeouts(timed_out)
+        with self._lock:
+            self._seconds = time.perf_counter() - self._started
+            self._done = True
+        print(f"🔥 기동 준비 완료 (pid {os.getpid()}, {self._seconds:.3f}s)")
+
+    def start(self):
+        """run()을 백그라운드 스레드에서 시작 (gunicorn 밖에서 실행할 때)"""
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+        Thread(target=self.run, name='warmup', daemon=True).start()
+
+    def is_ready(self):
+        with self._lock:
+            return self._done and self._pid == os.getpid()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+            stats['ready'] = self._done and self._pid == os.getpid()
+            stats['seconds'] = round(self._seconds, 4) if self._seconds is not None else None
+            stats['steps'] = {name: dict(result) for name, result in self._results.items()}
+        stats['enabled'] = self.enabled
+        stats['import_seconds'] = round(self.import_seconds, 4) if self.import_seconds is not None else None
+        return stats
+
+def warm_mariadb():
+    # 워커 스레드 수만큼 미리 연결 (첫 요청들이 동시에 연결을 만들며 기다리지 않도록)
+    return {'connections': db_pool.prefill(WARMUP_DB_CONNECTIONS)}
+
+def warm_redis():
+    # Lua 스크립트를 미리 로드하고 Script 객체를 만들어 둠 (첫 호출의 NOSCRIPT 재시도 왕복 제거) - 파이프라인 1회
+    redis_client = get_redis_connection()
+    pipe = redis_client.pipeline(transaction=False)
+    rate_limiter.warm(pipe)
+    message_cache.warm(pipe)
+    pipe.execute()
+    # 커넥션 풀에 연결을 미리 열어 둠
+    conns = []
+    try:
+        for _ in range(min(WARMUP_REDIS_CONNECTIONS, redis_pool.max_connections)):
+            conns.append(redis_pool.get_connection())
+    finally:
+        for conn in conns:
+            redis_pool.release(conn)
+    message_writer.ensure_worker()
+    return {'connections': len(conns)}
+
+def warm_kafka():
+    # Producer 생성 + api-logs-<tag> 토픽 메타데이터 조회 (첫 send()가 메타데이터를 기다리지 않도록), 로그 뷰 컨슈머 시작
+    kafka_log_view.warm()
+    return {'topic': kafka_log_queue.stats_topic, 'partitions': kafka_log_queue.warm()}
+
+def warm_password_hasher():
+    return {'workers': password_hasher.warm()}
+
+WARMUP_DB_CONNECTIONS = int(os.getenv('WARMUP_DB_CONNECTIONS', os.getenv('GUNICORN_THREADS', '8')))
+WARMUP_REDIS_CONNECTIONS = int(os.getenv('WARMUP_REDIS_CONNECTIONS', os.getenv('GUNICORN_THREADS', '8')))
+warmup = Warmup(
+    enabled=os.getenv('WARMUP_ENABLED', 'true').lower() == 'true',
+    timeout=float(os.getenv('WARMUP_TIMEOUT', '10')),
+    steps=[('mariadb', warm_mariadb), ('redis', warm_redis), ('kafka', warm_kafka),
+           ('password_hasher', warm_password_hasher)]
+)
+
+# 스크레이프 시점에 읽는 풀/큐 게이지와 컴포넌트별 누적 카운터
+BREAKER_STATE_VALUES = {'closed': 0, 'half_open': 1, 'open': 2}
+
+def pool_gauges():
+    stats = db_pool.stats()
+    return {(('state', state),): stats[state] for state in ('in_use', 'idle', 'waiting')}
+
+def redis_pool_gauges():
+    return {
+        (('state', 'in_use'),): len(redis_pool._in_use_connections),
+        (('state', 'idle'),): len(redis_pool._available_connections)
+    }
+
+def component_counters():
+    values = {}
+    for component, obj in (('kafka_log', kafka_log_queue), ('app_log', app_log), ('session', session_store), ('message_cache', message_cache),
+                           ('write_behind', message_writer), ('password_hasher', password_hasher),
+                           ('rate_limiter', rate_limiter), ('concurrency_limiter', concurrency_limiter),
+                           ('events', event_hub), ('fallback_cache', fallback_cache), ('warmup', warmup),
+                           *((f"breaker_{name}", breaker) for name, breaker in breakers.items())):
+        with obj._lock:
+            counters = dict(obj._counters)
+        for event, count in counters.items():
+            values[(('component', component), ('event', event))] = count
+    values[(('component', 'db_pool'), ('event', 'timeouts'))] = db_pool.stats()['timeouts']
+    return values
+
+app_metrics.gauge('backend_db_pool_connections', 'MariaDB 커넥션 풀 상태별 커넥션 수', pool_gauges)
+app_metrics.gauge('backend_redis_pool_connections', 'Redis 커넥션 풀 상태별 연결 수', redis_pool_gauges)
+app_metrics.gauge('backend_events_clients', '연결된 실시간 이벤트(SSE) 클라이언트 수',
+                  lambda: {(): event_hub.stats()['clients']})
+app_metrics.gauge('backend_circuit_breaker_state', '의존성별 서킷 브레이커 상태 (0 closed, 1 half_open, 2 open)',
+                  lambda: {(('dependency', name),): BREAKER_STATE_VALUES[breaker.state] for name, breaker in breakers.items()})
+app_metrics.gauge('backend_startup_seconds', '워커 기동 단계별 소요 시간 (phase: import, warmup)',
+                  lambda: {(('phase', phase),): value for phase, value in
+                           (('import', warmup.import_seconds), ('warmup', warmup.stats()['seconds'])) if value is not None})
+app_metrics.gauge('backend_kafka_log_queue_depth', 'Kafka 로깅 큐 대기 이벤트 수',
+                  lambda: {(): kafka_log_queue._queue.qsize()})
+app_metrics.counter('backend_component_events_total', '컴포넌트별 누적 이벤트 수 (component, event)', component_counters)
+
+# 조회 필터의 시간 값 파싱 (타임존이 없으면 한국 시간으로 간주)
+def parse_log_time(value):
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"잘못된 시간 형식입니다: {value}")
+    if parsed.tzinfo is None:
+        parsed = korea_tz.localize(parsed)
+    return parsed.timestamp()
@@ -0,0 +1,63 @@
+# 🚀 운영용 gunicorn 설정 (멀티 프로세스 + 워커당 멀티 스레드)
+# 실행: opentelemetry-instrument gunicorn -c gunicorn.conf.py app:app
+import os
+
+# OpenTelemetry Provider는 워커 fork 이후 워커별로 초기화 (app.py의 init_opentelemetry 참고)
+os.environ.setdefault('OTEL_PROVIDER_INIT', 'post_fork')
+# 워커별 메트릭 스냅샷 디렉터리 - /metrics는 어느 워커가 받더라도 전체 워커 합산 값을 응답
+os.environ.setdefault('METRICS_DIR', '/tmp/backend-metrics')
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.getenv('GUNICORN_WORKERS', '2'))
+threads = int(os.getenv('GUNICORN_THREADS', '8'))
+worker_class = 'gthread'
+
+# 마스터에서 앱을 미리 import 후 fork (커넥션/스레드는 모두 첫 사용 시 워커 안에서 생성됨)
+preload_app = os.getenv('GUNICORN_PRELOAD', 'true').lower() == 'true'
+
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '30'))
+# SIGTERM 이후 처리 중인 요청을 마무리할 시간 (k8s 기본 terminationGracePeriodSeconds 30초 이내)
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', '25'))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', '5'))
+
+accesslog = os.getenv('GUNICORN_ACCESSLOG') or None
+errorlog = '-'
+
+
+def on_starting(server):
+    # 이전 실행에서 남은 스냅샷 정리
+    metrics_dir = os.environ['METRICS_DIR']
+    if os.path.isdir(metrics_dir):
+        for filename in os.listdir(metrics_dir):
+            os.remove(os.path.join(metrics_dir, filename))
+
+
+def post_fork(server, worker):
+    import time
+    from app import init_tracer_provider, warmup
+    start = time.perf_counter()
+    try:
+        init_tracer_provider()
+        warmup.record('otel', time.perf_counter() - start)
+    except ImportError as e:
+        server.log.warning(f"⚠️ OpenTelemetry Provider 초기화 생략 (라이브러리 없음): {e}")
+    except Exception as e:
+        server.log.error(f"❌ OpenTelemetry Provider 초기화 오류: {e}")
+        warmup.record('otel', time.perf_counter() - start, e)
+
+
+def post_worker_init(worker):
+    # 요청을 받기 전에 커넥션/해시 프로세스/Kafka 메타데이터를 미리 준비 (WARMUP_TIMEOUT까지, /readyz 참고)
+    # WARMUP_TIMEOUT은 워커 하트비트 timeout보다 짧아야 함
+    from app import warmup
+    warmup.run()
+
+
+def worker_exit(server, worker):
+    # 처리 중인 요청이 끝난 뒤 write-behind writer를 멈추고 Kafka 로깅 큐를 비운 뒤 종료
+    from app import kafka_log_queue, message_writer, password_hasher, app_metrics, app_log
+    message_writer.shutdown(timeout=5)
+    password_hasher.shutdown()
+    app_log.shutdown(timeout=2)
+    app_metrics.remove_snapshot()
+    kafka_log_queue.shutdown(timeout=min(graceful_timeout, 10))
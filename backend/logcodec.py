@@ -0,0 +1,90 @@
+# API 통계 이벤트 Kafka 직렬화 - 키/헤더 + 버전 있는 스키마
+# key: user_id (같은 사용자의 이벤트는 같은 파티션에 순서대로), 헤더: schema, developer_tag
+# 컨슈머는 헤더만 보고 다른 개발자 태그의 레코드를 역직렬화 없이 건너뜀
+# 값 인코딩:
+#   json    - 기존과 같은 전체 JSON 객체 (헤더가 없는 예전 레코드도 JSON으로 처리)
+#   msgpack - api-stats.v1 스키마 배열 [ts_ms, endpoint, method, status, user_id]
+#             developer_tag(헤더)와 message(나머지 필드로 생성)는 보내지 않고 컨슈머에서 복원
+import json
+from datetime import datetime
+
+# msgpack은 선택 의존성 - 실제로 msgpack 인코딩/레코드를 다룰 때 처음 import (json만 쓰면 import하지 않음)
+_msgpack = None
+
+def load_msgpack():
+    """msgpack 모듈 또는 None (라이브러리 없음)"""
+    global _msgpack
+    if _msgpack is None:
+        try:
+            import msgpack
+        except ImportError:
+            _msgpack = False
+        else:
+            _msgpack = msgpack
+    return _msgpack or None
+
+SCHEMA_HEADER = 'schema'
+TAG_HEADER = 'developer_tag'
+API_STATS_SCHEMA = 'api-stats.v1'
+
+def api_stats_message(user_id, method, endpoint, status):
+    return f"{user_id}가 {method} {endpoint} 호출 ({status})"
+
+class ApiStatsCodec:
+    ENCODINGS = ('json', 'msgpack')
+
+    def __init__(self, encoding, developer_tag, tz):
+        if encoding not in self.ENCODINGS:
+            print(f"⚠️ 알 수 없는 KAFKA_LOG_ENCODING '{encoding}', 'json'으로 대체합니다")
+            encoding = 'json'
+        if encoding == 'msgpack' and load_msgpack() is None:
+            print("⚠️ msgpack 라이브러리가 없어 json 인코딩을 사용합니다")
+            encoding = 'json'
+        self.encoding = encoding
+        self.developer_tag = developer_tag
+        self.tz = tz
+        self._tag = developer_tag.encode('utf-8')
+        self.headers = [
+            (SCHEMA_HEADER, f"{API_STATS_SCHEMA}+{encoding}".encode('ascii')),
+            (TAG_HEADER, self._tag)
+        ]
+
+    def key(self, event):
+        return str(event['user_id']).encode('utf-8')
+
+    def encode(self, event):
+        if self.encoding == 'json':
+            return json.dumps(event).encode('utf-8')
+        ts_ms = int(datetime.fromisoformat(event['timestamp']).timestamp() * 1000)
+        return _msgpack.packb([ts_ms, event['endpoint'], event['method'], event['status'], event['user_id']])
+
+    def matches(self, headers):
+        """developer_tag 헤더가 다르면 False (헤더가 없는 예전 레코드는 값을 봐야 하므로 True)"""
+        for name, value in headers or ():
+            if name == TAG_HEADER:
+                return value == self._tag
+        return True
+
+    def decode(self, value, headers):
+        """기존 JSON 형식의 dict 반환, 알 수 없는 스키마 버전이면 ValueError"""
+        schema = None
+        for name, header_value in headers or ():
+            if name == SCHEMA_HEADER:
+                schema = header_value.decode('ascii')
+        if schema is None or schema == f"{API_STATS_SCHEMA}+json":
+            return json.loads(value.decode('utf-8'))
+        if schema == f"{API_STATS_SCHEMA}+msgpack":
+            msgpack = load_msgpack()
+            if msgpack is None:
+                raise ValueError("msgpack 라이브러리가 없어 레코드를 읽을 수 없습니다")
+            ts_ms, endpoint, method, status, user_id = msgpack.unpackb(value)
+            return {
+                'developer_tag': self.developer_tag,
+                'timestamp': datetime.fromtimestamp(ts_ms / 1000, self.tz).isoformat(),
+                'endpoint': endpoint,
+                'method': method,
+                'status': status,
+                'user_id': user_id,
+                'message': api_stats_message(user_id, method, endpoint, status)
+            }
+        raise ValueError(f"지원하지 않는 스키마입니다: {schema}")
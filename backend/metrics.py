@@ -0,0 +1,233 @@
+# 📊 경량 메트릭 레지스트리 (Prometheus 텍스트 형식 + 선택적 OTel 메트릭)
+# 요청 경로에서는 스레드별 집계 dict만 갱신하므로 락을 잡지 않고, 스크레이프 시점에 모든 스레드 값을 합산.
+# gunicorn처럼 워커 프로세스가 여러 개면 snapshot_dir에 워커별 스냅샷을 주기적으로 기록하고
+# /metrics 응답 시 합쳐서 파드 단위 값을 보여줌
+import bisect
+import json
+import os
+import threading
+import time
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in pairs) + '}'
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+class MetricsRegistry:
+    def __init__(self, buckets=DEFAULT_BUCKETS, snapshot_dir=None, snapshot_interval=5.0):
+        self.buckets = tuple(buckets)
+        self.snapshot_dir = snapshot_dir
+        self.snapshot_interval = snapshot_interval
+        self._local = threading.local()
+        self._shards = []  # 스레드별 (histograms, counters) - 등록할 때만 락 사용
+        self._lock = threading.Lock()
+        self._meta = {}  # name -> (type, help)
+        self._callbacks = []  # 스크레이프 시점에 값을 읽는 게이지/카운터 (name, fn)
+        self._otel_histograms = None
+        self._writer = None
+        self._pid = None
+
+    # --- 정의 ---
+    def histogram(self, name, help_text):
+        self._meta[name] = ('histogram', help_text)
+
+    def counter(self, name, help_text, callback=None):
+        self._meta[name] = ('counter', help_text)
+        if callback is not None:
+            self._callbacks.append((name, callback))
+
+    def gauge(self, name, help_text, callback=None):
+        """callback이 있으면 스크레이프 시 {labels 튜플: 값}을 반환, 없으면 add()로 증감"""
+        self._meta[name] = ('gauge', help_text)
+        if callback is not None:
+            self._callbacks.append((name, callback))
+
+    # --- 요청 경로 (락 없음) ---
+    def _shard(self):
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = ({}, {})
+            self._local.shard = shard
+            with self._lock:
+                self._shards.append(shard)
+        return shard
+
+    def observe(self, name, labels, value):
+        histograms = self._shard()[0]
+        key = (name, labels)
+        h = histograms.get(key)
+        if h is None:
+            # 구간별 개수(+Inf 포함) + 합계
+            h = histograms[key] = [0] * (len(self.buckets) + 2)
+        h[bisect.bisect_left(self.buckets, value)] += 1
+        h[-1] += value
+        if self._otel_histograms is not None:
+            self._record_otel(name, labels, value)
+
+    def add(self, name, labels, value=1):
+        counters = self._shard()[1]
+        key = (name, labels)
+        counters[key] = counters.get(key, 0) + value
+
+    def inc(self, name, labels):
+        self.add(name, labels, 1)
+
+    # --- 수집 ---
+    def snapshot(self):
+        """현재 프로세스의 값 (histograms, counters, 콜백 게이지)"""
+        with self._lock:
+            shards = list(self._shards)
+        histograms, counters = {}, {}
+        for shard_histograms, shard_counters in shards:
+            for key, h in shard_histograms.copy().items():
+                merged = histograms.get(key)
+                if merged is None:
+                    histograms[key] = list(h)
+                else:
+                    for i, v in enumerate(h):
+                        merged[i] += v
+            for key, v in shard_counters.copy().items():
+                counters[key] = counters.get(key, 0) + v
+        for name, callback in self._callbacks:
+            try:
+                for labels, v in callback().items():
+                    counters[(name, labels)] = counters.get((name, labels), 0) + v
+            except Exception as e:
+                print(f"Metrics callback error ({name}): {str(e)}")
+        return histograms, counters
+
+    def _snapshot_path(self, pid):
+        return os.path.join(self.snapshot_dir, f"{pid}.json")
+
+    def _write_snapshot(self):
+        histograms, counters = self.snapshot()
+        data = {
+            'histograms': [[name, [list(p) for p in labels], h] for (name, labels), h in histograms.items()],
+            'counters': [[name, [list(p) for p in labels], v] for (name, labels), v in counters.items()],
+        }
+        path = self._snapshot_path(os.getpid())
+        tmp = path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+
+    def _run_writer(self):
+        while True:
+            time.sleep(self.snapshot_interval)
+            try:
+                self._write_snapshot()
+            except Exception as e:
+                print(f"Metrics snapshot error: {str(e)}")
+
+    def ensure_writer(self):
+        # fork된 워커마다 스냅샷 기록 스레드 시작
+        if not self.snapshot_dir or (self._writer is not None and self._pid == os.getpid()):
+            return
+        with self._lock:
+            if self._writer is None or self._pid != os.getpid():
+                os.makedirs(self.snapshot_dir, exist_ok=True)
+                self._pid = os.getpid()
+                self._writer = threading.Thread(target=self._run_writer, name='metrics-writer', daemon=True)
+                self._writer.start()
+
+    def remove_snapshot(self):
+        if self.snapshot_dir:
+            try:
+                os.remove(self._snapshot_path(os.getpid()))
+            except OSError:
+                pass
+
+    def _load_peer_snapshots(self):
+        """다른 워커 프로세스가 기록한 스냅샷 (종료된 워커의 파일은 무시)"""
+        peers = []
+        if not self.snapshot_dir or not os.path.isdir(self.snapshot_dir):
+            return peers
+        for filename in os.listdir(self.snapshot_dir):
+            if not filename.endswith('.json'):
+                continue
+            try:
+                pid = int(filename[:-5])
+                if pid == os.getpid():
+                    continue
+                os.kill(pid, 0)
+                with open(os.path.join(self.snapshot_dir, filename)) as f:
+                    peers.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return peers
+
+    def collect(self):
+        histograms, counters = self.snapshot()
+        for peer in self._load_peer_snapshots():
+            for name, labels, h in peer['histograms']:
+                key = (name, tuple(tuple(p) for p in labels))
+                merged = histograms.setdefault(key, [0] * len(h))
+                for i, v in enumerate(h):
+                    merged[i] += v
+            for name, labels, v in peer['counters']:
+                key = (name, tuple(tuple(p) for p in labels))
+                counters[key] = counters.get(key, 0) + v
+        return histograms, counters
+
+    def render(self):
+        """Prometheus text exposition format 0.0.4"""
+        histograms, counters = self.collect()
+        by_name = {}
+        for (name, labels), value in list(histograms.items()) + list(counters.items()):
+            by_name.setdefault(name, []).append((labels, value))
+        lines = []
+        for name in sorted(by_name):
+            kind, help_text = self._meta.get(name, ('untyped', ''))
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in sorted(by_name[name]):
+                if kind != 'histogram':
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+                    continue
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float('inf'),), value[:-1]):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_format_labels(labels, [('le', _format_value(bound))])} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(value[-1])}")
+                lines.append(f"{name}_count{_format_labels(labels)} {cumulative}")
+        return '\n'.join(lines) + '\n'
+
+    # --- OpenTelemetry ---
+    def enable_otel(self, meter_name):
+        """같은 값을 OTel 메트릭으로도 내보냄 (MeterProvider는 opentelemetry-instrument가 설정)"""
+        from opentelemetry import metrics
+        from opentelemetry.metrics import Observation
+
+        meter = metrics.get_meter(meter_name)
+        self._otel_histograms = {}
+        for name, (kind, help_text) in self._meta.items():
+            if kind == 'histogram':
+                self._otel_histograms[name] = meter.create_histogram(name, unit='s', description=help_text)
+                continue
+
+            def observe(options, name=name):
+                _, counters = self.snapshot()
+                return [Observation(v, dict(labels)) for (n, labels), v in counters.items() if n == name]
+
+            if kind == 'counter':
+                meter.create_observable_counter(name, callbacks=[observe], description=help_text)
+            else:
+                meter.create_observable_up_down_counter(name, callbacks=[observe], description=help_text)
+
+    def _record_otel(self, name, labels, value):
+        instrument = self._otel_histograms.get(name)
+        if instrument is not None:
+            instrument.record(value, dict(labels))
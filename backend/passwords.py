@@ -0,0 +1,106 @@
+# 비밀번호 해시 전용 프로세스 풀
+# werkzeug 해시 함수는 의도적으로 CPU를 많이 쓰므로 요청 스레드(GIL)가 아닌 별도 프로세스에서 실행
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from werkzeug.security import generate_password_hash, check_password_hash
+
+class HasherBusyError(Exception):
+    """대기 중인 해시 작업이 한도를 넘은 경우 (호출 측에서 503 응답)"""
+
+def hash_method(pwhash):
+    """'scrypt:32768:8:1$salt$hash' 형식에서 방식/비용 부분 추출"""
+    return pwhash.split('$', 1)[0]
+
+# 요청/Kafka/메트릭 스레드가 도는 워커 프로세스를 그대로 fork하면 다른 스레드가 잡고 있던 락 때문에 자식이 멈출 수 있음
+# forkserver(단일 스레드 서버 프로세스)에서 해시 프로세스를 fork - 서버에는 이 모듈만 미리 import (앱 전체를 다시 import 하지 않음)
+_mp_context = multiprocessing.get_context('forkserver')
+_mp_context.set_forkserver_preload([__name__])
+
+def _hash(password, method):
+    return generate_password_hash(password, method=method)
+
+def _verify(pwhash, password, method):
+    """검증 결과와, 저장된 해시의 비용이 현재 설정과 다르면 새 해시를 함께 반환"""
+    if not check_password_hash(pwhash, password):
+        return False, None
+    if hash_method(pwhash) != method:
+        return True, generate_password_hash(password, method=method)
+    return True, None
+
+class PasswordHasher:
+    def __init__(self, method, workers, max_pending, timeout):
+        self.method = method
+        self.workers = workers
+        self.timeout = timeout
+        # 실행 중 + 대기 중 작업 수 제한 - 가득 차면 바로 거절
+        self._slots = threading.BoundedSemaphore(workers + max_pending)
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._counters = {'hashed': 0, 'verified': 0, 'rehashed': 0, 'rejected': 0}
+
+    def _count(self, key):
+        with self._lock:
+            self._counters[key] += 1
+
+    def _get_executor(self):
+        # gunicorn preload 후 fork된 워커마다 자기 풀을 생성
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=_mp_context)
+                self._pid = os.getpid()
+            return self._executor
+
+    def _submit(self, counter, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            self._count('rejected')
+            raise HasherBusyError("비밀번호 처리 대기열이 가득 찼습니다")
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        self._count(counter)
+        return future
+
+    def submit_hash(self, password):
+        return self._submit('hashed', _hash, password, self.method)
+
+    def submit_verify(self, pwhash, password):
+        """(일치 여부, 재해시 값 또는 None)을 돌려주는 future - 재해시 횟수는 결과가 나오면 기록"""
+        future = self._submit('verified', _verify, pwhash, password, self.method)
+        future.add_done_callback(self._count_rehash)
+        return future
+
+    def _count_rehash(self, future):
+        if not future.cancelled() and future.exception() is None and future.result()[1]:
+            self._count('rehashed')
+
+    def hash(self, password):
+        return self.submit_hash(password).result(timeout=self.timeout)
+
+    def verify(self, pwhash, password):
+        return self.submit_verify(pwhash, password).result(timeout=self.timeout)
+
+    def warm(self):
+        """해시 프로세스를 미리 띄워 둠 (첫 로그인이 프로세스 생성을 기다리지 않도록) - 띄운 프로세스 수 반환"""
+        executor = self._get_executor()
+        futures = [executor.submit(os.getpid) for _ in range(self.workers)]
+        return len({future.result(timeout=self.timeout) for future in futures})
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None and self._pid == os.getpid():
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+        stats['method'] = self.method
+        stats['workers'] = self.workers
+        return stats
@@ -0,0 +1,11 @@
+# 테스트 공통 설정 - core.py/app.py는 import 시점에 환경 변수를 읽으므로 어떤 테스트보다 먼저 지정
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.update({
+    'RATE_LIMIT_ENABLED': 'true',
+    'RATE_LIMITS': '/login=2/60',
+    'TRUSTED_PROXY_HOPS': '2',
+    'WARMUP_ENABLED': 'false',
+})
@@ -0,0 +1,55 @@
+# 실시간 이벤트(SSE) - 워커당 연결 수 상한이 일반 요청용 스레드를 남기는지, 이벤트가 받을 클라이언트에게만 가는지 확인
+# 실행: cd backend && python -m pytest tests
+import asyncio
+import queue
+
+import pytest
+
+import core
+
+
+def max_clients(monkeypatch, **env):
+    for name in ('GUNICORN_THREADS', 'EVENTS_RESERVED_THREADS', 'EVENTS_MAX_CLIENTS'):
+        monkeypatch.delenv(name, raising=False)
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    return core.events_max_clients()
+
+
+def test_default_reserves_half_of_the_threads(monkeypatch):
+    assert max_clients(monkeypatch) == 4
+    assert max_clients(monkeypatch, GUNICORN_THREADS='16') == 8
+    assert max_clients(monkeypatch, GUNICORN_THREADS='16', EVENTS_RESERVED_THREADS='4') == 12
+
+
+def test_configured_limit_cannot_take_reserved_threads(monkeypatch):
+    assert max_clients(monkeypatch, EVENTS_MAX_CLIENTS='2') == 2
+    assert max_clients(monkeypatch, EVENTS_MAX_CLIENTS='8') == 4
+    # 스레드가 1개면 SSE는 받지 않음 (프론트엔드는 폴링)
+    assert max_clients(monkeypatch, GUNICORN_THREADS='1') == 0
+
+
+# 이벤트 분배 - gunicorn 구독 스레드(queue.Queue)와 app_async.py(asyncio.Queue)가 같은 규칙을 사용
+@pytest.mark.parametrize('make_queue', [queue.Queue, asyncio.Queue])
+def test_events_reach_owner_and_admin_only(make_queue):
+    hub = core.EventHub(enabled=True, channel='events', max_clients=10, queue_size=10)
+    owner = (make_queue(maxsize=10), 'demo', False)
+    other = (make_queue(maxsize=10), 'other', False)
+    admin = (make_queue(maxsize=10), 'admin', True)
+    hub.deliver({'type': 'message', 'user_id': 'demo', 'data': {}}, [owner, other, admin])
+    hub.deliver({'type': 'app_logs', 'user_id': None, 'data': []}, [owner, other, admin])
+    assert [client[0].qsize() for client in (owner, other, admin)] == [2, 1, 2]
+    stats = hub.stats()
+    assert (stats['received'], stats['delivered'], stats['resyncs']) == (2, 5, 0)
+
+
+@pytest.mark.parametrize('make_queue', [queue.Queue, asyncio.Queue])
+def test_slow_client_gets_resync(make_queue):
+    hub = core.EventHub(enabled=True, channel='events', max_clients=10, queue_size=2)
+    client = (make_queue(maxsize=2), 'demo', False)
+    for i in range(3):
+        hub.deliver({'type': 'message', 'user_id': 'demo', 'data': i}, [client])
+    # 밀린 이벤트는 버리고 목록을 다시 조회하라는 resync 하나만 남김
+    assert client[0].get_nowait() == {'type': 'resync', 'data': None}
+    assert client[0].empty()
+    assert hub.stats()['resyncs'] == 1
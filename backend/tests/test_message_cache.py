@@ -0,0 +1,47 @@
+# 메시지 목록 캐시 - 사용자 버전을 올리면 이전 버전의 페이지 캐시가 더 이상 조회되지 않는지 확인
+# Redis는 fakeredis(Lua 지원에 lupa 필요)로 대체
+# 실행: cd backend && python -m pytest tests
+import fakeredis
+import pytest
+import redis
+from redis.backoff import NoBackoff
+from redis.retry import Retry
+
+import core
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    monkeypatch.setattr(core, 'redis_client_shared', fakeredis.FakeRedis(decode_responses=True))
+    return core.MessageCache(enabled=True, ttl=60)
+
+
+def test_cached_page_is_served_until_invalidated(cache):
+    page = {'messages': [{'id': 1, 'message': '안녕하세요'}], 'next_cursor': None}
+    version, cached = cache.get('demo', '20:')
+    assert (version, cached) == ('0', None)
+    cache.set('demo', version, '20:', page)
+    assert cache.get('demo', '20:') == ('0', page)
+
+    # 메시지 저장 → 버전 증가, 이전 버전 페이지는 남아 있어도 조회되지 않음
+    cache.invalidate('demo')
+    assert cache.get('demo', '20:') == ('1', None)
+    assert core.redis_client_shared.exists(cache.page_cache_key('demo', '0', '20:'))
+    assert core.redis_client_shared.ttl(cache.version_key('demo')) > 0
+
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['invalidations'], stats['errors']) == (1, 2, 1, 0)
+
+
+def test_versions_are_per_user(cache):
+    cache.set('demo', '0', '20:', {'messages': [], 'next_cursor': None})
+    cache.invalidate('other')
+    assert cache.get('demo', '20:') == ('0', {'messages': [], 'next_cursor': None})
+
+
+def test_redis_errors_fall_through_to_db(cache, monkeypatch):
+    # 연결할 수 없는 Redis - 캐시 오류는 기록만 하고 DB 조회로 계속
+    monkeypatch.setattr(core, 'redis_client_shared', redis.Redis(port=1, socket_connect_timeout=0.1, retry=Retry(NoBackoff(), 0)))
+    assert cache.get('demo', '20:') == (None, None)
+    cache.invalidate('demo')
+    assert cache.stats()['errors'] == 2
@@ -0,0 +1,31 @@
+# 키셋 페이지네이션 - cursor 토큰 인코딩/디코딩과 잘못된 토큰 처리 확인
+# 실행: cd backend && python -m pytest tests
+from datetime import datetime
+
+import pytest
+
+import core
+
+
+def test_cursor_round_trip():
+    row = {'id': 42, 'created_at': datetime(2025, 3, 1, 12, 30, 5, 123456)}
+    token = core.encode_page_cursor(row)
+    # URL에 그대로 넣을 수 있도록 패딩 없는 urlsafe base64
+    assert '=' not in token and '+' not in token and '/' not in token
+    assert core.decode_page_cursor(token) == (row['created_at'], 42)
+
+
+@pytest.mark.parametrize('token', ['', 'not-a-cursor', 'WyIyMDI1Il0'])
+def test_invalid_cursor_is_rejected(token):
+    with pytest.raises(ValueError):
+        core.decode_page_cursor(token)
+
+
+def test_page_args():
+    token = core.encode_page_cursor({'id': 7, 'created_at': datetime(2025, 1, 1)})
+    assert core.get_page_args({'limit': '5', 'cursor': token}) == (5, (datetime(2025, 1, 1), 7))
+    # limit은 1~MESSAGES_PAGE_MAX 범위로 제한, cursor가 없으면 첫 페이지
+    assert core.get_page_args({'limit': '0'}) == (1, None)
+    assert core.get_page_args({'limit': '100000'}) == (core.MESSAGES_PAGE_MAX, None)
+    with pytest.raises(ValueError):
+        core.get_page_args({'limit': 'many'})
@@ -0,0 +1,75 @@
+# 요청 속도 제한 - 프록시(ingress → frontend nginx) 뒤의 비로그인 클라이언트를 IP별 버킷으로 구분하는지 확인
+# Redis는 fakeredis(Lua 지원에 lupa 필요)로 대체, MariaDB/Kafka는 사용하지 않음
+# 실행: cd backend && python -m pytest tests
+# (RATE_LIMITS=/login=2/60, TRUSTED_PROXY_HOPS=2는 conftest.py에서 지정)
+import time
+
+import fakeredis
+import pytest
+
+import app as backend
+import core
+
+NGINX = '10.0.0.2'  # frontend nginx 파드 (모든 요청의 remote_addr)
+INGRESS = '10.0.0.1'  # ingress 컨트롤러가 X-Forwarded-For에 클라이언트 IP를 넣고 nginx가 ingress IP를 덧붙임
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(core, 'redis_client_shared', fakeredis.FakeRedis())
+    monkeypatch.setattr(core.rate_limiter, '_script', None)
+    core.rate_limiter._local.clear()
+    return backend.app.test_client()
+
+
+def login(client, client_ip):
+    # 빈 본문 - 속도 제한을 통과하면 400, 넘으면 429 (DB를 호출하지 않음)
+    return client.post('/login', json={}, environ_base={'REMOTE_ADDR': NGINX},
+                       headers={'X-Forwarded-For': f"{client_ip}, {INGRESS}"}).status_code
+
+
+def test_forwarded_clients_get_separate_buckets(client):
+    assert [login(client, '203.0.113.7') for _ in range(3)] == [400, 400, 429]
+    # 같은 nginx를 거쳐도 다른 클라이언트는 자기 버킷을 사용
+    assert login(client, '198.51.100.9') == 400
+
+
+def test_untrusted_forwarded_prefix_is_ignored(client):
+    # 클라이언트가 보낸 X-Forwarded-For 값은 프록시가 붙인 값 앞에 오므로 버킷 키에 영향을 주지 않음
+    assert [login(client, f"192.0.2.{i}, 203.0.113.7") for i in range(3)] == [400, 400, 429]
+
+
+# lease 계산 - 충전이 거의 없는 버킷(버스트 8, lease 2)에서 로컬 TTL을 짧게 두고 확인
+LOCAL_TTL = 0.05
+
+
+@pytest.fixture
+def limiter(client):
+    return core.RateLimiter(enabled=True, rules={'/x': (1 / 3600, 8)}, lease=5, local_ttl=LOCAL_TTL, local_max=100)
+
+
+def acquire_spaced(limiter, count):
+    results = []
+    for _ in range(count):
+        results.append(limiter.acquire('/x', 'ip:203.0.113.7')[0])
+        time.sleep(LOCAL_TTL * 2)
+    return results
+
+
+def test_spaced_requests_spend_the_full_burst(limiter):
+    # 로컬 TTL보다 간격이 긴 요청은 1개씩만 가져가므로 버스트 전체를 사용
+    assert acquire_spaced(limiter, 9) == [True] * 8 + [False]
+    assert limiter.stats()['local_hits'] == 0
+
+
+def test_unspent_lease_is_refunded(limiter):
+    # 연속 요청이면 lease(2개)를 가져가고, 쓰지 않고 만료된 토큰은 다음 Redis 조회 때 되돌림
+    assert [limiter.acquire('/x', 'ip:203.0.113.7')[0] for _ in range(2)] == [True, True]
+    time.sleep(LOCAL_TTL * 2)
+    assert acquire_spaced(limiter, 7) == [True] * 6 + [False]
+    assert limiter.stats()['refunded'] == 1
+
+
+def test_burst_uses_local_lease(limiter):
+    assert [limiter.acquire('/x', 'ip:203.0.113.7')[0] for _ in range(9)] == [True] * 8 + [False]
+    assert limiter.stats()['local_hits'] > 0
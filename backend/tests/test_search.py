@@ -0,0 +1,53 @@
+# 메시지 검색 - FULLTEXT 질의 변환과 인덱스가 없는 DB에서의 LIKE 대체 확인 (MariaDB 없이 가짜 커서 사용)
+import mysql.connector
+import pytest
+
+import core
+
+
+class FakeCursor:
+    def __init__(self, error=None):
+        self.error = error
+        self.executed = []
+
+    def execute(self, sql, params):
+        self.executed.append(sql)
+        if self.error is not None and 'MATCH' in sql:
+            raise self.error
+
+    def fetchall(self):
+        return [{'id': 1, 'message': '안녕하세요'}]
+
+
+def test_build_fulltext_query():
+    assert core.build_fulltext_query('쿠버네티스 배포판') == '+쿠버네티스* +배포판*'
+    # 연산자는 공백으로 바꿔 사용자가 BOOLEAN MODE 문법을 넣을 수 없음
+    assert core.build_fulltext_query('"배포판" -(테스트)') == '+배포판* +테스트*'
+
+
+def test_short_terms_use_like():
+    assert core.build_fulltext_query('a') is None
+    assert core.build_fulltext_query('   ') is None
+    sql, params = core.search_query('demo', '%_', 20, 0)
+    assert 'LIKE' in sql and params[1] == '%\\%\\_%'
+
+
+def test_missing_fulltext_index_falls_back_to_like():
+    cursor = FakeCursor(mysql.connector.errors.ProgrammingError(
+        msg="Can't find FULLTEXT index matching the column list", errno=1191))
+    rows, _ = core.run_search(lambda fulltext: core.search_message_page(cursor, 'demo', '안녕하세요', 20, 0, fulltext))
+    assert rows == [{'id': 1, 'message': '안녕하세요'}]
+    assert ['MATCH' in sql for sql in cursor.executed] == [True, False]
+
+
+def test_other_errors_are_not_hidden():
+    cursor = FakeCursor(mysql.connector.errors.ProgrammingError(msg="Unknown column", errno=1054))
+    with pytest.raises(mysql.connector.errors.ProgrammingError):
+        core.run_search(lambda fulltext: core.search_message_page(cursor, 'demo', '안녕하세요', 20, 0, fulltext))
+    assert len(cursor.executed) == 1
+
+
+def test_pymysql_error_code_is_recognised():
+    # aiomysql(PyMySQL)은 (코드, 메시지)를 args로 전달
+    assert core.is_fulltext_index_missing(Exception(1191, "Can't find FULLTEXT index"))
+    assert not core.is_fulltext_index_missing(Exception(1054, "Unknown column"))
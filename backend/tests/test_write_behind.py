@@ -0,0 +1,100 @@
+# write-behind - 같은 pending_id가 다시 전달되어도(재시도/다른 writer의 재처리) 한 번만 INSERT되는지 확인
+# Redis는 fakeredis, MariaDB는 pending_id 목록을 기억하는 가짜 커넥션으로 대체
+# 실행: cd backend && python -m pytest tests
+import fakeredis
+import pytest
+
+import core
+
+
+class FakeCursor:
+    def __init__(self, db):
+        self.db = db
+        self.result = []
+
+    def execute(self, sql, params):
+        self.db.executed.append(sql)
+        if sql.startswith('SELECT pending_id'):
+            self.result = [(pending_id,) for pending_id in params if pending_id in self.db.pending_ids]
+
+    def executemany(self, sql, rows):
+        self.db.inserted.extend(rows)
+
+    def fetchall(self):
+        return self.result
+
+    def close(self):
+        pass
+
+
+class FakeDB:
+    def __init__(self, pending_ids=()):
+        self.pending_ids = set(pending_ids)
+        self.executed = []
+        self.inserted = []
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.pending_ids.update(row[3] for row in self.inserted)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def redis_client(monkeypatch):
+    client = fakeredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(core, 'redis_client_shared', client)
+    return client
+
+
+@pytest.fixture
+def writer():
+    return core.MessageWriteBehind(enabled=False, flush_ms=0, batch_size=100, claim_idle_ms=60000, pending_ttl=60)
+
+
+def enqueue(redis_client, writer, user_id, message, pending_id):
+    pipe = redis_client.pipeline()
+    writer.add_to_pipeline(pipe, user_id, message, pending_id, idempotent=True)
+    pipe.execute()
+
+
+def read_batch(redis_client, writer):
+    writer._ensure_group(redis_client)
+    return writer._read(redis_client, writer.batch_size, None)
+
+
+def test_duplicate_pending_id_is_inserted_once(redis_client, writer, monkeypatch):
+    db = FakeDB()
+    monkeypatch.setattr(core.db_pool, 'acquire', lambda: db)
+    # 동시에 온 재시도 두 개가 모두 스트림에 들어간 경우
+    enqueue(redis_client, writer, 'demo', '안녕하세요', 'p1')
+    enqueue(redis_client, writer, 'demo', '안녕하세요', 'p1')
+    enqueue(redis_client, writer, 'demo', '두 번째', 'p2')
+
+    writer._flush(redis_client, read_batch(redis_client, writer))
+    assert sorted(row[3] for row in db.inserted) == ['p1', 'p2']
+    assert redis_client.xlen(writer.STREAM) == 0
+    assert redis_client.hlen(writer.pending_key('demo')) == 0
+    assert writer.stats(stream_length=False)['flushed'] == 2
+
+
+def test_replayed_entry_already_in_db_is_acked_without_insert(redis_client, writer, monkeypatch):
+    # 커밋 후 ACK 전에 writer가 종료되어 다른 writer가 같은 항목을 다시 처리하는 경우
+    db = FakeDB(pending_ids=['p1'])
+    monkeypatch.setattr(core.db_pool, 'acquire', lambda: db)
+    enqueue(redis_client, writer, 'demo', '안녕하세요', 'p1')
+    version = redis_client.get(core.message_cache.version_key('demo'))
+
+    writer._flush(redis_client, read_batch(redis_client, writer))
+    assert db.inserted == []
+    assert not any('user_stats' in sql for sql in db.executed)
+    assert redis_client.xlen(writer.STREAM) == 0
+    assert redis_client.xpending(writer.STREAM, writer.GROUP)['pending'] == 0
+    assert redis_client.hlen(writer.pending_key('demo')) == 0
+    # 새로 저장된 메시지가 없으므로 캐시 버전도 그대로
+    assert redis_client.get(core.message_cache.version_key('demo')) == version
+    stats = writer.stats(stream_length=False)
+    assert (stats['flushed'], stats['duplicates']) == (0, 1)
@@ -0,0 +1,135 @@
+# ⚖️ 동기(app.py) vs 비동기(app_async.py) 백엔드 비교 벤치마크
+# 두 서버에 같은 부하(동시 사용자 수, 시간, 요청 구성)를 걸고 처리량/지연 시간을 나란히 출력합니다.
+# 모든 요청이 한 클라이언트 IP에서 나가므로 두 서버 모두 요청 속도 제한을 끄고 실행합니다 (켜져 있으면 시작 전에 중단).
+#
+# 예시:
+#   (backend) RATE_LIMIT_ENABLED=false gunicorn -c gunicorn.conf.py app:app --bind 0.0.0.0:5000
+#   (backend) RATE_LIMIT_ENABLED=false hypercorn app_async:app --bind 0.0.0.0:5001
+#   python bench/compare_sync_async.py --sync http://localhost:5000 --async http://localhost:5001 -c 200 -d 30
+import argparse
+import asyncio
+import random
+import time
+
+import aiohttp
+
+# (가중치, 메서드, 경로) - 프론트엔드 사용 패턴과 비슷한 구성
+DEFAULT_MIX = [
+    (50, 'GET', '/db/messages'),
+    (20, 'POST', '/db/message'),
+    (15, 'GET', '/db/messages/search?q=테스트'),
+    (10, 'GET', '/logs/redis'),
+    (5, 'GET', '/logs/kafka'),
+]
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(p / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def check_rate_limit(base_url):
+    # 요청 속도 제한이 켜져 있으면 429가 처리량/오류 수에 섞이므로 시작 전에 중단
+    async with aiohttp.ClientSession() as session:
+        async with session.get(f"{base_url}/ratelimit/stats") as resp:
+            if resp.status == 200 and (await resp.json()).get('enabled'):
+                raise SystemExit(f"{base_url}: 요청 속도 제한이 켜져 있습니다 - RATE_LIMIT_ENABLED=false로 실행하세요 "
+                                 f"(그대로 측정하려면 --allow-rate-limit)")
+
+
+async def login(base_url, username, password, timeout):
+    """계정당 1회 로그인 - 세션 쿠키가 담긴 CookieJar (같은 계정의 가상 사용자들이 공유)"""
+    jar = aiohttp.CookieJar(unsafe=True)
+    async with aiohttp.ClientSession(timeout=timeout, cookie_jar=jar) as session:
+        # 사용자가 없으면 먼저 가입 (이미 있으면 400 - 무시)
+        async with session.post(f"{base_url}/register", json={'username': username, 'password': password}) as resp:
+            await resp.read()
+        async with session.post(f"{base_url}/login", json={'username': username, 'password': password}) as resp:
+            if resp.status != 200:
+                raise SystemExit(f"{base_url} 로그인 실패 ({username}): {resp.status} {await resp.text()}")
+    return jar
+
+
+async def run_user(base_url, mix, deadline, latencies, errors, args, cookie_jar):
+    timeout = aiohttp.ClientTimeout(total=args.timeout)
+    async with aiohttp.ClientSession(timeout=timeout, cookie_jar=cookie_jar) as session:
+        weights = [weight for weight, _, _ in mix]
+        while time.monotonic() < deadline:
+            _, method, path = random.choices(mix, weights=weights)[0]
+            body = {'message': f"bench {random.random()}"} if method == 'POST' else None
+            start = time.monotonic()
+            try:
+                async with session.request(method, base_url + path, json=body) as resp:
+                    await resp.read()
+                    if resp.status >= 400:
+                        errors[path] = errors.get(path, 0) + 1
+            except Exception:
+                errors[path] = errors.get(path, 0) + 1
+            latencies.setdefault(path, []).append(time.monotonic() - start)
+
+
+async def run_target(name, base_url, args):
+    if not args.allow_rate_limit:
+        await check_rate_limit(base_url)
+    timeout = aiohttp.ClientTimeout(total=args.timeout)
+    jars = [await login(base_url, f"{args.user_prefix}{i}", args.password, timeout)
+            for i in range(min(args.users, args.concurrency))]
+    latencies, errors = {}, {}
+    deadline = time.monotonic() + args.duration
+    started = time.monotonic()
+    await asyncio.gather(*[
+        run_user(base_url, DEFAULT_MIX, deadline, latencies, errors, args, jars[i % len(jars)]) for i in range(args.concurrency)
+    ])
+    elapsed = time.monotonic() - started
+    all_latencies = sorted(value for values in latencies.values() for value in values)
+    return {
+        'name': name,
+        'requests': len(all_latencies),
+        'errors': sum(errors.values()),
+        'rps': len(all_latencies) / elapsed if elapsed else 0.0,
+        'p50': percentile(all_latencies, 50) * 1000,
+        'p95': percentile(all_latencies, 95) * 1000,
+        'p99': percentile(all_latencies, 99) * 1000,
+        'per_path': {path: percentile(sorted(values), 95) * 1000 for path, values in latencies.items()},
+    }
+
+
+def print_report(results):
+    print(f"\n{'':<8}{'requests':>10}{'errors':>8}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for r in results:
+        print(f"{r['name']:<8}{r['requests']:>10}{r['errors']:>8}{r['rps']:>10.1f}{r['p50']:>10.1f}{r['p95']:>10.1f}{r['p99']:>10.1f}")
+    print("\n경로별 p95 (ms)")
+    paths = sorted({path for r in results for path in r['per_path']})
+    for path in paths:
+        cells = ''.join(f"{r['per_path'].get(path, 0.0):>12.1f}" for r in results)
+        print(f"  {path:<36}{cells}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='동기/비동기 백엔드 비교 벤치마크')
+    parser.add_argument('--sync', dest='sync_url', help='동기 앱 주소 (예: http://localhost:5000)')
+    parser.add_argument('--async', dest='async_url', help='비동기 앱 주소 (예: http://localhost:5001)')
+    parser.add_argument('-c', '--concurrency', type=int, default=100, help='동시 가상 사용자 수')
+    parser.add_argument('-d', '--duration', type=float, default=30, help='대상별 부하 시간(초)')
+    parser.add_argument('--users', type=int, default=20, help='로그인에 사용할 계정 수')
+    parser.add_argument('--user-prefix', default='bench')
+    parser.add_argument('--password', default='bench-password')
+    parser.add_argument('--timeout', type=float, default=30, help='요청 타임아웃(초)')
+    parser.add_argument('--allow-rate-limit', action='store_true', help='요청 속도 제한이 켜진 서버도 측정 (429는 오류로 집계)')
+    args = parser.parse_args()
+
+    targets = [(name, url) for name, url in (('sync', args.sync_url), ('async', args.async_url)) if url]
+    if not targets:
+        parser.error('--sync 또는 --async 중 하나 이상을 지정하세요')
+
+    results = []
+    for name, url in targets:
+        print(f"▶ {name} ({url}) - 동시 {args.concurrency}명, {args.duration:.0f}초")
+        results.append(await run_target(name, url.rstrip('/'), args))
+    print_report(results)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
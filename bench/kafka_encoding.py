@@ -0,0 +1,81 @@
+# 📦 API 통계 이벤트 Kafka 인코딩 비교
+# json / msgpack(api-stats.v1) 인코딩별 이벤트당 크기, 배치 압축 후 크기, 인코딩/디코딩 시간을 측정합니다.
+# Kafka 없이 backend/logcodec.py만으로 실행됩니다 (msgpack 미설치 시 json만 측정).
+#
+# 예시:
+#   python bench/kafka_encoding.py -n 50000
+import argparse
+import gzip
+import os
+import sys
+import time
+from datetime import datetime
+
+import pytz
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+from logcodec import ApiStatsCodec, api_stats_message, load_msgpack  # noqa: E402
+
+ENDPOINTS = [('/db/messages', 'GET'), ('/db/message', 'POST'), ('/db/messages/search', 'GET'), ('/logs/kafka', 'GET')]
+
+
+def sample_events(n, tz):
+    events = []
+    for i in range(n):
+        endpoint, method = ENDPOINTS[i % len(ENDPOINTS)]
+        user_id = f"user{i % 500}"
+        status = 'error' if i % 50 == 0 else 'success'
+        events.append({
+            'developer_tag': 'hyunwoo',
+            'timestamp': datetime.now(tz).isoformat(),
+            'endpoint': endpoint,
+            'method': method,
+            'status': status,
+            'user_id': user_id,
+            'message': api_stats_message(user_id, method, endpoint, status)
+        })
+    return events
+
+
+def run(encoding, events, batch_size, tz):
+    codec = ApiStatsCodec(encoding, 'hyunwoo', tz)
+    start = time.perf_counter()
+    values = [codec.encode(event) for event in events]
+    encode_us = (time.perf_counter() - start) / len(events) * 1e6
+
+    start = time.perf_counter()
+    for value in values:
+        if codec.matches(codec.headers):
+            codec.decode(value, codec.headers)
+    decode_us = (time.perf_counter() - start) / len(events) * 1e6
+
+    raw = sum(len(value) for value in values)
+    # Producer는 배치(파티션별 레코드 묶음) 단위로 압축 - 레코드를 이어 붙인 배치로 근사
+    compressed = sum(len(gzip.compress(b''.join(values[i:i + batch_size])))
+                     for i in range(0, len(values), batch_size))
+    return {
+        'encoding': codec.encoding,
+        'bytes': raw / len(events),
+        'gzip': compressed / len(events),
+        'encode_us': encode_us,
+        'decode_us': decode_us,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='API 통계 이벤트 Kafka 인코딩 비교')
+    parser.add_argument('-n', '--events', type=int, default=20000, help='측정할 이벤트 수')
+    parser.add_argument('-b', '--batch-size', type=int, default=100, help='압축 배치당 레코드 수 (KAFKA_BATCH_SIZE 근사)')
+    args = parser.parse_args()
+
+    tz = pytz.timezone('Asia/Seoul')
+    events = sample_events(args.events, tz)
+    encodings = ['json'] + (['msgpack'] if load_msgpack() is not None else [])
+    print(f"{'encoding':<10}{'bytes/event':>13}{'gzip/event':>12}{'encode us':>11}{'decode us':>11}")
+    for encoding in encodings:
+        r = run(encoding, events, args.batch_size, tz)
+        print(f"{r['encoding']:<10}{r['bytes']:>13.1f}{r['gzip']:>12.1f}{r['encode_us']:>11.2f}{r['decode_us']:>11.2f}")
+
+
+if __name__ == '__main__':
+    main()
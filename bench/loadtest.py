@@ -0,0 +1,395 @@
+# 📈 백엔드 부하 테스트 (고정 RPS, 로컬 대체 의존성, git 리비전 비교)
+# 리비전마다 backend/와 db/를 임시 디렉터리에 꺼내 bench/standins.py로 실행하고(Redis=fakeredis, Kafka=가짜 브로커),
+# 같은 시나리오를 고정 RPS(open-loop)로 재생해 처리량, p50/p95/p99, 요청당 DB/Redis 호출 수를 비교합니다.
+# 지연 시간은 예정된 전송 시각부터 측정하므로 서버가 밀리면 대기 시간까지 포함됩니다 (coordinated omission 보정).
+#
+# 예시:
+#   python bench/loadtest.py --mariadb docker --rps 200 -d 30                       # 현재 작업 트리
+#   python bench/loadtest.py --mariadb docker --rev HEAD~5 --rev HEAD --rps 200      # 리비전 비교
+#   python bench/loadtest.py --mysql-host 127.0.0.1 --scenario write-heavy -o result.json
+#   python bench/loadtest.py --compare before.json after.json
+import argparse
+import asyncio
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+
+import aiohttp
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORKTREE = 'WORKTREE'
+
+# 시나리오 항목: (이름, 가중치, 메서드, 경로, 본문, 세션 종류 user/admin/login)
+# 경로/본문의 {user}, {n}은 요청마다 치환
+SCENARIOS = {
+    'default': [
+        ('list', 40, 'GET', '/db/messages', None, 'user'),
+        ('post', 20, 'POST', '/db/message', {'message': 'load test {n}'}, 'user'),
+        ('search', 15, 'GET', '/db/messages/search?q=load', None, 'user'),
+        ('login', 5, 'POST', '/login', None, 'login'),
+        ('admin_users', 5, 'GET', '/admin/users', None, 'admin'),
+        ('admin_user_messages', 5, 'GET', '/admin/users/{user}/messages', None, 'admin'),
+        ('redis_logs', 5, 'GET', '/logs/redis', None, 'user'),
+        ('kafka_logs', 5, 'GET', '/logs/kafka', None, 'user'),
+    ],
+    'read-heavy': [
+        ('list', 70, 'GET', '/db/messages', None, 'user'),
+        ('search', 20, 'GET', '/db/messages/search?q=load', None, 'user'),
+        ('post', 5, 'POST', '/db/message', {'message': 'load test {n}'}, 'user'),
+        ('admin_users', 5, 'GET', '/admin/users', None, 'admin'),
+    ],
+    'write-heavy': [
+        ('post', 70, 'POST', '/db/message', {'message': 'load test {n}'}, 'user'),
+        ('list', 25, 'GET', '/db/messages', None, 'user'),
+        ('login', 5, 'POST', '/login', None, 'login'),
+    ],
+}
+
+
+def load_scenario_file(path):
+    """JSONL 시나리오 - 한 줄에 {"name", "weight", "method", "path", "body", "session"}"""
+    mix = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            mix.append((item['name'], item.get('weight', 1), item.get('method', 'GET'), item['path'],
+                        item.get('body'), item.get('session', 'user')))
+    return mix
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(p / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize(latencies):
+    values = sorted(latencies)
+    return {
+        'count': len(values),
+        'p50': percentile(values, 50) * 1000,
+        'p95': percentile(values, 95) * 1000,
+        'p99': percentile(values, 99) * 1000,
+    }
+
+
+# --- 리비전 준비 / MariaDB ---
+def export_revision(rev, workdir):
+    """rev의 backend/, db/를 workdir에 풀고 (app 디렉터리, init.sql 경로) 반환 - 실행기(standins.py)는 현재 트리 것을 사용"""
+    if rev == WORKTREE:
+        return os.path.join(REPO_ROOT, 'backend'), os.path.join(REPO_ROOT, 'db', 'init.sql')
+    target = os.path.join(workdir, rev.replace('/', '_'))
+    os.makedirs(target, exist_ok=True)
+    archive = subprocess.run(['git', 'archive', '--format=tar', rev, 'backend', 'db'],
+                             cwd=REPO_ROOT, check=True, capture_output=True).stdout
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        tar.extractall(target)
+    return os.path.join(target, 'backend'), os.path.join(target, 'db', 'init.sql')
+
+
+def start_mariadb_container(args):
+    name = f"loadtest-mariadb-{os.getpid()}"
+    subprocess.run([
+        'docker', 'run', '-d', '--rm', '--name', name, '-p', f"{args.mysql_port}:3306",
+        '-e', 'MARIADB_ROOT_PASSWORD=bench', '-e', 'MARIADB_DATABASE=testdb',
+        '-e', f"MARIADB_USER={args.mysql_user}", '-e', f"MARIADB_PASSWORD={args.mysql_password}",
+        args.mariadb_image
+    ], check=True, capture_output=True)
+    args.mysql_host = '127.0.0.1'
+    deadline = time.monotonic() + 120
+    while time.monotonic() < deadline:
+        try:
+            connect_db(args).close()
+            return name
+        except Exception:
+            time.sleep(1)
+    raise RuntimeError('MariaDB 컨테이너가 120초 안에 준비되지 않았습니다')
+
+
+def connect_db(args):
+    import mysql.connector
+    return mysql.connector.connect(host=args.mysql_host, port=args.mysql_port, user=args.mysql_user,
+                                   password=args.mysql_password, database='testdb')
+
+
+def reset_database(args, init_sql):
+    """리비전의 db/init.sql로 스키마를 다시 만들어 리비전마다 같은 상태에서 시작"""
+    with open(init_sql, encoding='utf-8') as f:
+        sql = '\n'.join(line for line in f if not line.strip().startswith('--'))
+    conn = connect_db(args)
+    try:
+        cursor = conn.cursor()
+        for statement in sql.split(';'):
+            if statement.strip():
+                cursor.execute(statement)
+        conn.commit()
+        cursor.close()
+    finally:
+        conn.close()
+
+
+# --- 서버 실행 ---
+def start_server(app_dir, args):
+    env = dict(os.environ)
+    env.update({
+        'MYSQL_HOST': args.mysql_host,
+        'MYSQL_USER': args.mysql_user,
+        'MYSQL_PASSWORD': args.mysql_password,
+        'ADMIN_USERNAME': 'admin',
+        'ADMIN_PASSWORD': args.admin_password,
+        'PYTHONUNBUFFERED': '1',
+        'RATE_LIMIT_ENABLED': 'false',  # 처리량 측정이 목적 - 필요하면 --env RATE_LIMIT_ENABLED=true
+    })
+    for item in args.env:
+        key, _, value = item.partition('=')
+        env[key] = value
+    return subprocess.Popen(
+        [sys.executable, os.path.join(REPO_ROOT, 'bench', 'standins.py'), '--app-dir', app_dir,
+         '--port', str(args.port), '--redis', args.redis],
+        env=env
+    )
+
+
+async def wait_ready(session, base_url, server, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"서버가 종료되었습니다 (exit {server.returncode})")
+        try:
+            async with session.get(f"{base_url}/__standins__") as resp:
+                if resp.status == 200:
+                    return
+        except aiohttp.ClientError:
+            pass
+        await asyncio.sleep(0.5)
+    raise RuntimeError('서버가 준비되지 않았습니다')
+
+
+# --- 부하 생성 ---
+async def login_session(base_url, username, password, timeout):
+    session = aiohttp.ClientSession(timeout=timeout, cookie_jar=aiohttp.CookieJar(unsafe=True))
+    await session.post(f"{base_url}/register", json={'username': username, 'password': password})
+    async with session.post(f"{base_url}/login", json={'username': username, 'password': password}) as resp:
+        if resp.status != 200:
+            await session.close()
+            raise RuntimeError(f"{username} 로그인 실패: {resp.status}")
+    return session
+
+
+def render(template, username, n):
+    if template is None:
+        return None
+    if isinstance(template, dict):
+        return {key: render(value, username, n) for key, value in template.items()}
+    if isinstance(template, str):
+        return template.replace('{user}', username).replace('{n}', str(n))
+    return template
+
+
+async def run_load(base_url, mix, args):
+    timeout = aiohttp.ClientTimeout(total=args.timeout)
+    usernames = [f"{args.user_prefix}{i}" for i in range(args.users)]
+    users = [(name, await login_session(base_url, name, args.password, timeout)) for name in usernames]
+    admin = await login_session(base_url, 'admin', args.admin_password, timeout)
+    anonymous = aiohttp.ClientSession(timeout=timeout, cookie_jar=aiohttp.DummyCookieJar())
+
+    # 목록/검색이 빈 결과만 돌려주지 않도록 사용자마다 메시지 몇 개를 미리 저장
+    for name, session in users:
+        for i in range(args.seed_messages):
+            await session.post(f"{base_url}/db/message", json={'message': f"load seed {name} {i}"})
+
+    latencies, errors = {}, {}
+    weights = [item[1] for item in mix]
+    inflight = asyncio.Semaphore(args.max_inflight)
+    skipped = 0
+
+    async def one(item, scheduled, n):
+        name, _, method, path, body, kind = item
+        username, session = users[n % len(users)]
+        if kind == 'admin':
+            session = admin
+        elif kind == 'login':
+            session = anonymous
+            body = {'username': username, 'password': args.password}
+        try:
+            async with session.request(method, base_url + render(path, username, n),
+                                       json=render(body, username, n)) as resp:
+                await resp.read()
+                if resp.status >= 400:
+                    errors[name] = errors.get(name, 0) + 1
+        except Exception:
+            errors[name] = errors.get(name, 0) + 1
+        finally:
+            inflight.release()
+        latencies.setdefault(name, []).append(time.monotonic() - scheduled)
+
+    async with aiohttp.ClientSession() as control:
+        await control.post(f"{base_url}/__standins__")  # 준비 단계 호출 수 초기화
+
+    tasks = []
+    total = int(args.rps * args.duration)
+    started = time.monotonic()
+    for n in range(total):
+        scheduled = started + n / args.rps
+        delay = scheduled - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if inflight.locked():
+            skipped += 1  # 클라이언트 동시 요청 한도 초과 - 서버가 따라오지 못하는 상태
+            continue
+        await inflight.acquire()
+        item = random.choices(mix, weights=weights)[0]
+        tasks.append(asyncio.create_task(one(item, scheduled, n)))
+    await asyncio.gather(*tasks)
+    elapsed = time.monotonic() - started
+
+    async with aiohttp.ClientSession() as control:
+        async with control.get(f"{base_url}/__standins__") as resp:
+            calls = await resp.json()
+
+    for _, session in users:
+        await session.close()
+    await admin.close()
+    await anonymous.close()
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    completed = len(all_latencies)
+    result = {
+        'target_rps': args.rps,
+        'duration': round(elapsed, 2),
+        'requests': completed,
+        'errors': sum(errors.values()),
+        'skipped': skipped,
+        'rps': completed / elapsed if elapsed else 0.0,
+        'db_calls_per_request': calls['db'] / completed if completed else 0.0,
+        'redis_calls_per_request': calls['redis'] / completed if completed else 0.0,
+        'kafka_sends_per_request': calls['kafka'] / completed if completed else 0.0,
+        'per_op': {},
+    }
+    result.update(summarize(all_latencies))
+    for name, values in latencies.items():
+        result['per_op'][name] = summarize(values)
+        result['per_op'][name]['errors'] = errors.get(name, 0)
+    return result
+
+
+async def run_revision(rev, mix, args, workdir):
+    app_dir, init_sql = export_revision(rev, workdir)
+    reset_database(args, init_sql)
+    server = start_server(app_dir, args)
+    base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        async with aiohttp.ClientSession() as session:
+            await wait_ready(session, base_url, server)
+        print(f"▶ {rev}: {args.rps} rps x {args.duration:.0f}s ({args.scenario})", flush=True)
+        result = await run_load(base_url, mix, args)
+        result['rev'] = rev
+        if rev != WORKTREE:
+            result['commit'] = subprocess.run(['git', 'rev-parse', '--short', rev], cwd=REPO_ROOT,
+                                              capture_output=True, text=True).stdout.strip()
+        return result
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+
+# --- 보고서 ---
+def print_report(results):
+    print(f"\n{'rev':<14}{'requests':>9}{'errors':>8}{'skipped':>8}{'rps':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+          f"{'db/req':>8}{'redis/req':>10}")
+    for r in results:
+        print(f"{r['rev'][:13]:<14}{r['requests']:>9}{r['errors']:>8}{r['skipped']:>8}{r['rps']:>9.1f}"
+              f"{r['p50']:>9.1f}{r['p95']:>9.1f}{r['p99']:>9.1f}"
+              f"{r['db_calls_per_request']:>8.2f}{r['redis_calls_per_request']:>10.2f}")
+
+    print("\n작업별 p95 ms (오류 수)")
+    ops = sorted({op for r in results for op in r['per_op']})
+    for op in ops:
+        cells = ''
+        for r in results:
+            stats = r['per_op'].get(op)
+            cells += f"{stats['p95']:>10.1f} ({stats['errors']:>3})" if stats else f"{'-':>16}"
+        print(f"  {op:<22}{cells}")
+
+    if len(results) >= 2:
+        base, last = results[0], results[-1]
+        print(f"\n{base['rev']} → {last['rev']}")
+        for key, label in (('rps', 'rps'), ('p50', 'p50 ms'), ('p95', 'p95 ms'), ('p99', 'p99 ms'),
+                           ('db_calls_per_request', 'db/req'), ('redis_calls_per_request', 'redis/req')):
+            before, after = base[key], last[key]
+            change = f"{(after - before) / before * 100:+.1f}%" if before else 'n/a'
+            print(f"  {label:<10}{before:>10.2f} → {after:>10.2f}  {change}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='백엔드 부하 테스트 (로컬 대체 의존성, 리비전 비교)')
+    parser.add_argument('--rev', action='append', dest='revs',
+                        help=f'측정할 git 리비전 (여러 번 지정 가능, 기본: 현재 작업 트리 {WORKTREE})')
+    parser.add_argument('--scenario', default='default', choices=sorted(SCENARIOS))
+    parser.add_argument('--scenario-file', help='JSONL 시나리오 파일 (--scenario 대신 사용)')
+    parser.add_argument('--rps', type=float, default=100, help='고정 요청률 (초당 요청 수)')
+    parser.add_argument('-d', '--duration', type=float, default=30, help='리비전별 부하 시간(초)')
+    parser.add_argument('--max-inflight', type=int, default=500, help='클라이언트 동시 요청 한도 (초과분은 skipped)')
+    parser.add_argument('--users', type=int, default=20, help='가상 사용자 계정 수')
+    parser.add_argument('--seed-messages', type=int, default=5, help='사용자별로 미리 저장할 메시지 수')
+    parser.add_argument('--user-prefix', default='load')
+    parser.add_argument('--password', default='load-password')
+    parser.add_argument('--admin-password', default='load-admin')
+    parser.add_argument('--timeout', type=float, default=30, help='요청 타임아웃(초)')
+    parser.add_argument('--port', type=int, default=5055, help='테스트 서버 포트')
+    parser.add_argument('--redis', choices=('fake', 'local'), default='fake',
+                        help='fake: fakeredis, local: REDIS_HOST 환경변수의 Redis')
+    parser.add_argument('--mariadb', choices=('docker', 'external'), default='external',
+                        help='docker: 임시 MariaDB 컨테이너 실행, external: --mysql-host 사용')
+    parser.add_argument('--mariadb-image', default='mariadb:10.11')
+    parser.add_argument('--mysql-host', default='127.0.0.1')
+    parser.add_argument('--mysql-port', type=int, default=3306, help='app.py는 기본 포트(3306)로만 접속')
+    parser.add_argument('--mysql-user', default='bench')
+    parser.add_argument('--mysql-password', default='bench')
+    parser.add_argument('--env', action='append', default=[], help='서버 환경변수 KEY=VALUE (여러 번 지정 가능)')
+    parser.add_argument('-o', '--output', help='결과 JSON 저장 경로')
+    parser.add_argument('--compare', nargs='+', metavar='RESULT_JSON', help='저장된 결과 파일만 비교하고 종료')
+    args = parser.parse_args()
+
+    if args.compare:
+        results = []
+        for path in args.compare:
+            with open(path, encoding='utf-8') as f:
+                results.extend(json.load(f))
+        print_report(results)
+        return
+
+    mix = load_scenario_file(args.scenario_file) if args.scenario_file else SCENARIOS[args.scenario]
+    if args.scenario_file:
+        args.scenario = os.path.basename(args.scenario_file)
+
+    container = start_mariadb_container(args) if args.mariadb == 'docker' else None
+    results = []
+    try:
+        with tempfile.TemporaryDirectory(prefix='loadtest-') as workdir:
+            for rev in args.revs or [WORKTREE]:
+                results.append(await run_revision(rev, mix, args, workdir))
+    finally:
+        if container:
+            subprocess.run(['docker', 'stop', container], capture_output=True)
+
+    print_report(results)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
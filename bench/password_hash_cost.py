@@ -0,0 +1,75 @@
+# 🔐 비밀번호 해시 비용별 처리량 벤치마크
+# PASSWORD_HASH_METHOD 후보마다 코어 1개당 초당 로그인(해시 검증) 수와 검증 1회 지연 시간을 측정합니다.
+# 백엔드 서버 없이 werkzeug만으로 실행됩니다.
+#
+# 예시:
+#   python bench/password_hash_cost.py -d 5
+#   python bench/password_hash_cost.py -m scrypt:16384:8:1 -m scrypt:32768:8:1 -m pbkdf2:sha256:600000 -p 4
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from werkzeug.security import generate_password_hash, check_password_hash
+
+DEFAULT_METHODS = [
+    'scrypt:16384:8:1',
+    'scrypt:32768:8:1',
+    'pbkdf2:sha256:260000',
+    'pbkdf2:sha256:600000',
+    'pbkdf2:sha256:1000000',
+]
+
+
+def verify_loop(pwhash, password, duration):
+    """duration초 동안 검증을 반복하고 검증별 지연 시간 목록 반환"""
+    latencies = []
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        start = time.monotonic()
+        check_password_hash(pwhash, password)
+        latencies.append(time.monotonic() - start)
+    return latencies
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(p / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run_method(method, args):
+    pwhash = generate_password_hash(args.password, method=method)
+    with ProcessPoolExecutor(max_workers=args.processes) as executor:
+        futures = [executor.submit(verify_loop, pwhash, args.password, args.duration) for _ in range(args.processes)]
+        latencies = sorted(value for future in futures for value in future.result())
+    total_rps = len(latencies) / args.duration
+    return {
+        'method': method,
+        'logins': len(latencies),
+        'rps': total_rps,
+        'rps_per_core': total_rps / args.processes,
+        'p50': percentile(latencies, 50) * 1000,
+        'p99': percentile(latencies, 99) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='비밀번호 해시 비용별 로그인 처리량 벤치마크')
+    parser.add_argument('-m', '--method', action='append', dest='methods',
+                        help='측정할 해시 방식 (여러 번 지정 가능, 기본: 대표 scrypt/pbkdf2 설정)')
+    parser.add_argument('-p', '--processes', type=int, default=1,
+                        help=f'동시에 검증할 프로세스 수 (기본 1, 이 머신의 코어 수 {os.cpu_count()})')
+    parser.add_argument('-d', '--duration', type=float, default=3, help='방식별 측정 시간(초)')
+    parser.add_argument('--password', default='bench-password')
+    args = parser.parse_args()
+
+    print(f"{'method':<26}{'logins':>8}{'rps':>10}{'rps/core':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    for method in args.methods or DEFAULT_METHODS:
+        r = run_method(method, args)
+        print(f"{r['method']:<26}{r['logins']:>8}{r['rps']:>10.1f}{r['rps_per_core']:>10.1f}{r['p50']:>10.1f}{r['p99']:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
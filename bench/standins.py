@@ -0,0 +1,285 @@
+# 🧪 부하 테스트용 백엔드 실행기 (로컬 대체 의존성)
+# backend/app.py를 그대로 import 하되 Redis는 fakeredis(또는 로컬 Redis), Kafka는 프로세스 내 가짜 브로커로 바꿔 실행합니다.
+# MariaDB는 FULLTEXT/ON DUPLICATE KEY 등 MariaDB 문법을 쓰므로 실제 서버(로컬 컨테이너)를 사용합니다.
+# /__standins__ 경로로 요청 처리 중 발생한 DB/Redis 호출 수를 조회/초기화할 수 있습니다.
+#
+# 보통 bench/loadtest.py가 실행하며, 직접 실행할 때는:
+#   MYSQL_HOST=127.0.0.1 MYSQL_USER=bench MYSQL_PASSWORD=bench python bench/standins.py --app-dir backend --port 5055
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import namedtuple
+
+import redis
+import redis.connection
+import mysql.connector
+import kafka
+
+counters = {'db': 0, 'redis': 0, 'kafka': 0}
+counters_lock = threading.Lock()
+
+
+def count(key, n=1):
+    with counters_lock:
+        counters[key] += n
+
+
+# --- Redis: 왕복(명령 1개 또는 파이프라인 1개)마다 카운트 ---
+_send_packed_command = redis.connection.AbstractConnection.send_packed_command
+
+
+def counting_send_packed_command(self, command, check_health=True):
+    count('redis')
+    return _send_packed_command(self, command, check_health)
+
+
+def install_fake_redis():
+    import fakeredis
+
+    server = fakeredis.FakeServer()
+
+    class StandinConnectionPool(redis.ConnectionPool):
+        def __init__(self, *args, **kwargs):
+            for key in ('host', 'port', 'password', 'db', 'socket_timeout', 'socket_connect_timeout'):
+                kwargs.pop(key, None)
+            kwargs.pop('connection_class', None)
+            super().__init__(connection_class=fakeredis.FakeRedisConnection, server=server, **kwargs)
+
+    class StandinRedis(redis.Redis):
+        # 풀 없이 만든 클라이언트도 (요청마다 새 클라이언트를 만드는 예전 코드 포함) 같은 가짜 서버에 연결
+        def __init__(self, *args, connection_pool=None, **kwargs):
+            if connection_pool is None:
+                connection_pool = StandinConnectionPool(decode_responses=kwargs.get('decode_responses', False))
+            super().__init__(connection_pool=connection_pool)
+
+    redis.ConnectionPool = StandinConnectionPool
+    redis.Redis = StandinRedis
+    redis.StrictRedis = StandinRedis
+
+
+# --- MariaDB: execute/executemany/commit 호출마다 카운트 ---
+class CountingCursor:
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def execute(self, *args, **kwargs):
+        count('db')
+        return self._cursor.execute(*args, **kwargs)
+
+    def executemany(self, *args, **kwargs):
+        count('db')
+        return self._cursor.executemany(*args, **kwargs)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._cursor.close()
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class CountingConnection:
+    def __init__(self, conn):
+        self._conn = conn
+
+    def cursor(self, *args, **kwargs):
+        return CountingCursor(self._conn.cursor(*args, **kwargs))
+
+    def commit(self):
+        count('db')
+        return self._conn.commit()
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+_mysql_connect = mysql.connector.connect
+
+
+def counting_connect(*args, **kwargs):
+    return CountingConnection(_mysql_connect(*args, **kwargs))
+
+
+# --- Kafka: 프로세스 내 가짜 브로커 (토픽당 파티션 1개) ---
+ConsumerRecord = namedtuple('ConsumerRecord', 'topic partition offset timestamp key value headers')
+FakeRecordMetadata = namedtuple('FakeRecordMetadata', 'topic partition offset')
+
+
+class FakeBroker:
+    def __init__(self):
+        self.topics = {}
+        self.cond = threading.Condition()
+
+    def append(self, topic, key, value, headers):
+        with self.cond:
+            log = self.topics.setdefault(topic, [])
+            log.append((int(time.time() * 1000), key, value, headers or []))
+            self.cond.notify_all()
+            return len(log) - 1
+
+
+broker = FakeBroker()
+
+
+class FakeFuture:
+    def __init__(self, metadata):
+        self.metadata = metadata
+
+    def add_callback(self, fn, *args, **kwargs):
+        fn(*args, self.metadata, **kwargs)
+        return self
+
+    def add_errback(self, fn, *args, **kwargs):
+        return self
+
+    def get(self, timeout=None):
+        return self.metadata
+
+
+class FakeKafkaProducer:
+    def __init__(self, **configs):
+        self.value_serializer = configs.get('value_serializer')
+        self.key_serializer = configs.get('key_serializer')
+
+    def send(self, topic, value=None, key=None, headers=None, partition=None, timestamp_ms=None):
+        count('kafka')
+        if self.value_serializer is not None:
+            value = self.value_serializer(value)
+        if key is not None and self.key_serializer is not None:
+            key = self.key_serializer(key)
+        offset = broker.append(topic, key, value, headers)
+        return FakeFuture(FakeRecordMetadata(topic, 0, offset))
+
+    def partitions_for(self, topic):
+        return {0}
+
+    def flush(self, timeout=None):
+        pass
+
+    def close(self, timeout=None):
+        pass
+
+
+class FakeKafkaConsumer:
+    def __init__(self, *topics, **configs):
+        self.value_deserializer = configs.get('value_deserializer')
+        self.key_deserializer = configs.get('key_deserializer')
+        self.consumer_timeout_ms = configs.get('consumer_timeout_ms', float('inf'))
+        self.positions = {kafka.TopicPartition(topic, 0): 0 for topic in topics}
+
+    def partitions_for_topic(self, topic):
+        return {0}
+
+    def assign(self, partitions):
+        self.positions = {tp: 0 for tp in partitions}
+
+    def subscribe(self, topics=(), pattern=None, listener=None):
+        self.positions = {kafka.TopicPartition(topic, 0): 0 for topic in topics}
+
+    def beginning_offsets(self, partitions):
+        return {tp: 0 for tp in partitions}
+
+    def end_offsets(self, partitions):
+        with broker.cond:
+            return {tp: len(broker.topics.get(tp.topic, [])) for tp in partitions}
+
+    def seek(self, partition, offset):
+        self.positions[partition] = offset
+
+    def _record(self, tp, offset, entry):
+        timestamp, key, value, headers = entry
+        if key is not None and self.key_deserializer is not None:
+            key = self.key_deserializer(key)
+        if self.value_deserializer is not None:
+            value = self.value_deserializer(value)
+        return ConsumerRecord(tp.topic, tp.partition, offset, timestamp, key, value, headers)
+
+    def poll(self, timeout_ms=0, max_records=500, **kwargs):
+        deadline = time.monotonic() + timeout_ms / 1000
+        with broker.cond:
+            while True:
+                result = {}
+                for tp, position in self.positions.items():
+                    log = broker.topics.get(tp.topic, [])
+                    entries = log[position:position + max_records]
+                    if entries:
+                        result[tp] = [self._record(tp, position + i, entry) for i, entry in enumerate(entries)]
+                        self.positions[tp] = position + len(entries)
+                remaining = deadline - time.monotonic()
+                if result or remaining <= 0:
+                    return result
+                broker.cond.wait(remaining)
+
+    def __iter__(self):
+        while True:
+            batch = self.poll(timeout_ms=min(self.consumer_timeout_ms, 1000))
+            if not batch:
+                return
+            for records in batch.values():
+                yield from records
+
+    def close(self, *args, **kwargs):
+        pass
+
+
+def install_fake_kafka():
+    kafka.KafkaProducer = FakeKafkaProducer
+    kafka.KafkaConsumer = FakeKafkaConsumer
+
+
+# --- /__standins__: 호출 수 조회(GET)/초기화(POST) ---
+def with_counters_endpoint(wsgi_app):
+    def application(environ, start_response):
+        if environ.get('PATH_INFO') != '/__standins__':
+            return wsgi_app(environ, start_response)
+        with counters_lock:
+            body = json.dumps(counters).encode()
+            if environ.get('REQUEST_METHOD') == 'POST':
+                for key in counters:
+                    counters[key] = 0
+        start_response('200 OK', [('Content-Type', 'application/json'), ('Content-Length', str(len(body)))])
+        return [body]
+    return application
+
+
+def main():
+    parser = argparse.ArgumentParser(description='로컬 대체 의존성으로 backend/app.py 실행')
+    parser.add_argument('--app-dir', required=True, help='app.py가 있는 디렉터리')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5055)
+    parser.add_argument('--redis', choices=('fake', 'local'), default='fake',
+                        help='fake: 프로세스 내 fakeredis, local: REDIS_HOST의 실제 Redis')
+    args = parser.parse_args()
+
+    redis.connection.AbstractConnection.send_packed_command = counting_send_packed_command
+    if args.redis == 'fake':
+        install_fake_redis()
+    mysql.connector.connect = counting_connect
+    install_fake_kafka()
+
+    app_dir = os.path.abspath(args.app_dir)
+    sys.path.insert(0, app_dir)
+    os.chdir(app_dir)
+    import app as backend
+    # gunicorn의 post_worker_init처럼 요청을 받기 전에 기동 준비 (예전 리비전에는 없음)
+    if hasattr(backend, 'warmup'):
+        backend.warmup.run()
+
+    from werkzeug.serving import make_server
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)  # 요청별 액세스 로그 생략
+    server = make_server(args.host, args.port, with_counters_endpoint(backend.app), threaded=True)
+    print(f"standins: serving {app_dir}/app.py on http://{args.host}:{args.port} (redis={args.redis})", flush=True)
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+# 🚦 기동 시간 측정 - 프로세스 시작부터 첫 "빠른" 응답까지
+# bench/standins.py로 백엔드를 띄우고(Redis=fakeredis, Kafka=가짜 브로커, MariaDB는 실제 서버) 다음을 측정합니다.
+#   listen      : 프로세스 시작 → /healthz 첫 200 (standins/gunicorn은 기동 준비가 끝난 뒤에 요청을 받음)
+#   ready       : 프로세스 시작 → /readyz 첫 200
+#   first_fast  : 프로세스 시작 → 요청 묶음(PROBES)이 모두 기준(--fast-ms × 요청별 배수) 안에 응답한 첫 라운드가 끝난 시각
+#   cold_ms     : 준비 직후 첫 라운드의 요청별 지연 시간 (첫 연결 생성, 해시 프로세스 생성 등이 여기에 나타남)
+# WARMUP_ENABLED=true/false를 번갈아 실행해 기동 준비 효과를 비교합니다.
+#
+# 예시:
+#   MYSQL_HOST=127.0.0.1 MYSQL_USER=bench MYSQL_PASSWORD=bench python bench/startup.py --runs 5
+#   python bench/startup.py --mode warm --env WARMUP_DB_CONNECTIONS=4
+import argparse
+import http.cookiejar
+import json
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (이름, 메서드, 경로, 본문, --fast-ms 배수) - 관리자 로그인(Redis 세션) 후 프론트엔드 첫 화면에서 부르는 요청들 + 회원가입(해시/DB)
+# 회원가입은 비밀번호 해시 자체가 수십 ms라 기준을 4배로 둠
+PROBES = [
+    ('login', 'POST', '/login', {'username': 'admin', 'password': '{admin_password}'}, 1),
+    ('messages', 'GET', '/db/messages', None, 1),
+    ('redis_logs', 'GET', '/logs/redis', None, 1),
+    ('kafka_logs', 'GET', '/logs/kafka', None, 1),
+    ('register', 'POST', '/register', {'username': 'startup-{run}-{round}', 'password': 'startup-password'}, 4),
+]
+
+
+def request(opener, base_url, method, path, body, timeout):
+    """(상태 코드, 지연 시간 초) - 연결 실패면 상태 코드 None"""
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(base_url + path, data=data, method=method,
+                                 headers={'Content-Type': 'application/json'} if data else {})
+    start = time.perf_counter()
+    try:
+        with opener.open(req, timeout=timeout) as resp:
+            resp.read()
+            status = resp.status
+    except urllib.error.HTTPError as e:
+        e.read()
+        status = e.code
+    except (urllib.error.URLError, ConnectionError, TimeoutError):
+        status = None
+    return status, time.perf_counter() - start
+
+
+def wait_for(opener, base_url, path, server, started, deadline):
+    """path가 200을 응답한 시각(프로세스 시작 기준 초)"""
+    while time.perf_counter() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"서버가 종료되었습니다 (exit {server.returncode})")
+        status, _ = request(opener, base_url, 'GET', path, None, timeout=1)
+        if status == 200:
+            return time.perf_counter() - started
+        time.sleep(0.005)
+    raise RuntimeError(f"{path}가 응답하지 않습니다")
+
+
+def run_once(args, warmup_enabled, run):
+    env = dict(os.environ)
+    env.update({
+        'ADMIN_USERNAME': 'admin',
+        'ADMIN_PASSWORD': args.admin_password,
+        'PYTHONUNBUFFERED': '1',
+        'RATE_LIMIT_ENABLED': 'false',
+        'WARMUP_ENABLED': 'true' if warmup_enabled else 'false',
+    })
+    for item in args.env:
+        key, _, value = item.partition('=')
+        env[key] = value
+    base_url = f"http://127.0.0.1:{args.port}"
+    opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()))
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, os.path.join(REPO_ROOT, 'bench', 'standins.py'), '--app-dir', args.app_dir,
+         '--port', str(args.port), '--redis', args.redis],
+        env=env, stdout=subprocess.DEVNULL, stderr=None if args.verbose else subprocess.DEVNULL,
+        start_new_session=True  # 해시 프로세스 풀 등 자식 프로세스까지 한 번에 종료 (남으면 다음 실행이 포트를 못 씀)
+    )
+    try:
+        deadline = started + args.timeout
+        result = {
+            'listen': wait_for(opener, base_url, '/healthz', server, started, deadline),
+            'ready': wait_for(opener, base_url, '/readyz', server, started, deadline),
+        }
+        round_no = 0
+        while time.perf_counter() < deadline:
+            latencies, fast = {}, True
+            for name, method, path, body, budget in PROBES:
+                if body is not None:
+                    body = {k: v.format(admin_password=args.admin_password, run=run, round=round_no) for k, v in body.items()}
+                status, elapsed = request(opener, base_url, method, path, body,
+                                          timeout=max(0.1, min(10.0, deadline - time.perf_counter())))
+                latencies[name] = elapsed
+                fast = fast and elapsed * 1000 <= args.fast_ms * budget
+            if round_no == 0:
+                result['cold_ms'] = {name: elapsed * 1000 for name, elapsed in latencies.items()}
+            if fast:
+                result['first_fast'] = time.perf_counter() - started
+                break
+            round_no += 1
+        return result
+    finally:
+        os.killpg(server.pid, signal.SIGTERM)
+        try:
+            server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            os.killpg(server.pid, signal.SIGKILL)
+            server.wait()
+
+
+def summarize(label, results):
+    def median(values):
+        return statistics.median(values) if values else float('nan')
+
+    print(f"\n[{label}] {len(results)} runs (median)")
+    for key in ('listen', 'ready', 'first_fast'):
+        values = [r[key] for r in results if key in r]
+        print(f"  {key:<12} {median(values) * 1000:9.1f} ms" + ('' if len(values) == len(results) else f"  ({len(values)}/{len(results)} runs)"))
+    print("  cold_ms:")
+    for name, _, _, _, _ in PROBES:
+        print(f"    {name:<12} {median([r['cold_ms'][name] for r in results if 'cold_ms' in r]):9.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='백엔드 기동 → 첫 빠른 응답까지의 시간 측정')
+    parser.add_argument('--app-dir', default=os.path.join(REPO_ROOT, 'backend'))
+    parser.add_argument('--mode', choices=('both', 'warm', 'cold'), default='both',
+                        help='warm: WARMUP_ENABLED=true, cold: false, both: 번갈아 실행')
+    parser.add_argument('--runs', type=int, default=3, help='모드별 실행 횟수')
+    parser.add_argument('--fast-ms', type=float, default=50, help='"빠른" 응답 기준 (요청별 지연 시간, ms - PROBES의 배수를 곱함)')
+    parser.add_argument('--timeout', type=float, default=60, help='실행당 최대 시간(초)')
+    parser.add_argument('--port', type=int, default=5056)
+    parser.add_argument('--redis', choices=('fake', 'local'), default='fake')
+    parser.add_argument('--admin-password', default='startup-admin')
+    parser.add_argument('--env', action='append', default=[], help='서버 환경변수 KEY=VALUE (여러 번 지정 가능)')
+    parser.add_argument('-o', '--output', help='결과 JSON 저장 경로')
+    parser.add_argument('-v', '--verbose', action='store_true', help='서버 오류 출력 표시')
+    args = parser.parse_args()
+
+    modes = {'both': (True, False), 'warm': (True,), 'cold': (False,)}[args.mode]
+    results = {mode: [] for mode in modes}
+    for run in range(args.runs):
+        for mode in modes:
+            results[mode].append(run_once(args, mode, run))
+    for mode in modes:
+        summarize('warm-up' if mode else 'no warm-up', results[mode])
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({('warm' if mode else 'cold'): runs for mode, runs in results.items()}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
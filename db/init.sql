@@ -1,5 +1,6 @@
 -- AKS Demo Database Schema
 -- 기존 테이블이 있다면 삭제
+DROP TABLE IF EXISTS user_stats;
 DROP TABLE IF EXISTS messages;
 DROP TABLE IF EXISTS users;
 
@@ -9,7 +10,8 @@ CREATE TABLE users (
     username VARCHAR(255) UNIQUE NOT NULL,
     password VARCHAR(255) NOT NULL,
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    INDEX idx_created_id (created_at, id)  -- 관리자 사용자 목록 키셋 페이지네이션
 );
 
 -- 메시지 테이블 생성 (사용자별 메시지 저장)
@@ -17,10 +19,21 @@ CREATE TABLE messages (
     id INT AUTO_INCREMENT PRIMARY KEY,
     user_id VARCHAR(255) NOT NULL,
     message TEXT NOT NULL,
+    pending_id CHAR(32) NULL,  -- write-behind 저장 시 중복 방지 키 (즉시 저장은 NULL)
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
     updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-    INDEX idx_user_id (user_id),
-    INDEX idx_created_at (created_at)
+    UNIQUE KEY uk_pending_id (pending_id),
+    INDEX idx_user_created_id (user_id, created_at, id),  -- 사용자별 키셋 페이지네이션 (user_id 단독 조회도 커버)
+    INDEX idx_created_at (created_at),
+    -- 메시지 검색용 FULLTEXT 인덱스 (MariaDB는 ngram 파서가 없어 기본 파서 + 접두어 검색 사용)
+    FULLTEXT INDEX ft_message (message)
+);
+
+-- 사용자별 메시지 통계 요약 테이블 (메시지 저장 시 증분 갱신, 관리자 사용자 목록에서 조회)
+CREATE TABLE user_stats (
+    username VARCHAR(255) PRIMARY KEY,
+    message_count INT NOT NULL DEFAULT 0,
+    last_message_at DATETIME NULL
 );
 
 -- 샘플 데이터 삽입
@@ -32,4 +45,8 @@ INSERT INTO messages (user_id, message) VALUES
 ('admin', '관리자 테스트 메시지입니다.'),
 ('admin', 'AKS 데모 애플리케이션이 정상 작동중입니다.'),
 ('demo', '데모 사용자의 첫 번째 메시지입니다.'),
-('demo', 'Kubernetes에서 실행되는 마이크로서비스 테스트중입니다.'); 
\ No newline at end of file
+('demo', 'Kubernetes에서 실행되는 마이크로서비스 테스트중입니다.'); 
+
+-- 샘플 메시지 기준으로 통계 초기 적재 (운영 DB는 flask --app app rebuild-user-stats)
+INSERT INTO user_stats (username, message_count, last_message_at)
+SELECT user_id, COUNT(*), MAX(created_at) FROM messages GROUP BY user_id;
@@ -72,6 +72,8 @@ kubectl apply -f k8s/backend-secret.yaml -n $NAMESPACE
 # 12. Backend 배포
 echo "🔧 Backend 배포 중..."
 kubectl apply -f k8s/backend-deployment.yaml -n $NAMESPACE
+# 실시간 이벤트(SSE) 전용 backend - frontend nginx가 /api/events를 보내므로 frontend보다 먼저 배포
+kubectl apply -f k8s/backend-events-deployment.yaml -n $NAMESPACE
 
 # 13. Frontend 배포
 echo "🎨 Frontend 배포 중..."